@@ -0,0 +1,38 @@
+"""Add pgvector embedding columns with HNSW indexes and backfill from JSONB."""
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "0003_embedding_vectors"
+down_revision = "0002_drop_group_name_unique"
+branch_labels = None
+depends_on = None
+
+EMBEDDING_DIM = 1024
+TABLES = ("users", "notion_users", "groups")
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS vector")
+    for table in TABLES:
+        op.execute(
+            f"ALTER TABLE {table} "
+            f"ADD COLUMN IF NOT EXISTS embedding_vec vector({EMBEDDING_DIM})"
+        )
+        op.execute(
+            f"UPDATE {table} "
+            "SET embedding_vec = CAST(embedding::text AS vector) "
+            "WHERE embedding_vec IS NULL "
+            "  AND jsonb_typeof(embedding) = 'array' "
+            f"  AND jsonb_array_length(embedding) = {EMBEDDING_DIM}"
+        )
+        op.execute(
+            f"CREATE INDEX IF NOT EXISTS ix_{table}_embedding_vec_hnsw "
+            f"ON {table} USING hnsw (embedding_vec vector_cosine_ops)"
+        )
+
+
+def downgrade() -> None:
+    for table in TABLES:
+        op.execute(f"DROP INDEX IF EXISTS ix_{table}_embedding_vec_hnsw")
+        op.execute(f"ALTER TABLE {table} DROP COLUMN IF EXISTS embedding_vec")
@@ -0,0 +1,42 @@
+"""Add shared group map layout cache table."""
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = "0004_group_map_layouts"
+down_revision = "0003_embedding_vectors"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "group_map_layouts",
+        sa.Column("cache_key", sa.String(length=128), primary_key=True),
+        sa.Column("group_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("positions", postgresql.JSONB(), nullable=False),
+        sa.Column(
+            "created_at",
+            sa.TIMESTAMP(timezone=True),
+            server_default=sa.func.now(),
+            nullable=False,
+        ),
+        sa.Column(
+            "last_used_at",
+            sa.TIMESTAMP(timezone=True),
+            server_default=sa.func.now(),
+            nullable=False,
+        ),
+    )
+    op.create_index(
+        "ix_group_map_layouts_last_used",
+        "group_map_layouts",
+        ["last_used_at"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_group_map_layouts_last_used", table_name="group_map_layouts")
+    op.drop_table("group_map_layouts")
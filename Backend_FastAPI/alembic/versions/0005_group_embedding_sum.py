@@ -0,0 +1,27 @@
+"""Add running embedding sum/count columns to groups."""
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = "0005_group_embedding_sum"
+down_revision = "0004_group_map_layouts"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "groups",
+        sa.Column("embedding_sum", postgresql.JSONB(), nullable=True),
+    )
+    op.add_column(
+        "groups",
+        sa.Column("embedding_count", sa.Integer(), nullable=False, server_default="0"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("groups", "embedding_count")
+    op.drop_column("groups", "embedding_sum")
@@ -0,0 +1,44 @@
+"""Add content-addressed embedding cache table."""
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = "0006_embedding_cache"
+down_revision = "0005_group_embedding_sum"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "embedding_cache",
+        sa.Column("model_name", sa.String(length=128), primary_key=True),
+        sa.Column("dimensions", sa.Integer(), primary_key=True),
+        sa.Column("source_hash", sa.String(length=64), primary_key=True),
+        sa.Column("embedding", postgresql.JSONB(), nullable=False),
+        sa.Column("model_version", sa.String(length=64), nullable=True),
+        sa.Column(
+            "created_at",
+            sa.TIMESTAMP(timezone=True),
+            server_default=sa.func.now(),
+            nullable=False,
+        ),
+        sa.Column(
+            "last_used_at",
+            sa.TIMESTAMP(timezone=True),
+            server_default=sa.func.now(),
+            nullable=False,
+        ),
+    )
+    op.create_index(
+        "ix_embedding_cache_last_used",
+        "embedding_cache",
+        ["last_used_at"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_embedding_cache_last_used", table_name="embedding_cache")
+    op.drop_table("embedding_cache")
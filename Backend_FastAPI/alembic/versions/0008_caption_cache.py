@@ -0,0 +1,45 @@
+"""Add caption cache keyed by image content hash."""
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = "0008_caption_cache"
+down_revision = "0007_caption_jobs"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "caption_cache",
+        sa.Column("content_hash", sa.String(length=64), primary_key=True),
+        sa.Column("caption_model", sa.String(length=80), primary_key=True),
+        sa.Column("translation_model", sa.String(length=80), primary_key=True),
+        sa.Column("caption_raw_en", sa.Text(), nullable=False),
+        sa.Column("caption_ko", sa.Text(), nullable=False),
+        sa.Column(
+            "interest_tags",
+            postgresql.JSONB(),
+            nullable=False,
+            server_default=sa.text("'[]'::jsonb"),
+        ),
+        sa.Column("model_version", sa.String(length=40), nullable=True),
+        sa.Column(
+            "created_at",
+            sa.TIMESTAMP(timezone=True),
+            server_default=sa.func.now(),
+            nullable=False,
+        ),
+        sa.Column(
+            "last_used_at",
+            sa.TIMESTAMP(timezone=True),
+            server_default=sa.func.now(),
+            nullable=False,
+        ),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("caption_cache")
@@ -0,0 +1,65 @@
+"""Add trigger-maintained member_count to groups."""
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "0009_group_member_count"
+down_revision = "0008_caption_cache"
+branch_labels = None
+depends_on = None
+
+MEMBERSHIP_TABLES = ("group_members", "notion_group_members")
+
+
+def upgrade() -> None:
+    op.add_column(
+        "groups",
+        sa.Column("member_count", sa.Integer(), nullable=False, server_default="0"),
+    )
+    op.execute(
+        """
+        UPDATE groups g
+        SET member_count = counts.total
+        FROM (
+            SELECT group_id, count(*) AS total
+            FROM (
+                SELECT group_id FROM group_members
+                UNION ALL
+                SELECT group_id FROM notion_group_members
+            ) all_members
+            GROUP BY group_id
+        ) counts
+        WHERE counts.group_id = g.id
+        """
+    )
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION groups_member_count_sync() RETURNS trigger AS $$
+        BEGIN
+            IF TG_OP = 'INSERT' THEN
+                UPDATE groups SET member_count = member_count + 1 WHERE id = NEW.group_id;
+            ELSIF TG_OP = 'DELETE' THEN
+                UPDATE groups SET member_count = member_count - 1 WHERE id = OLD.group_id;
+            ELSIF NEW.group_id IS DISTINCT FROM OLD.group_id THEN
+                UPDATE groups SET member_count = member_count - 1 WHERE id = OLD.group_id;
+                UPDATE groups SET member_count = member_count + 1 WHERE id = NEW.group_id;
+            END IF;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+        """
+    )
+    for table in MEMBERSHIP_TABLES:
+        op.execute(
+            f"CREATE TRIGGER {table}_member_count_sync "
+            f"AFTER INSERT OR DELETE OR UPDATE OF group_id ON {table} "
+            "FOR EACH ROW EXECUTE FUNCTION groups_member_count_sync()"
+        )
+
+
+def downgrade() -> None:
+    for table in MEMBERSHIP_TABLES:
+        op.execute(f"DROP TRIGGER IF EXISTS {table}_member_count_sync ON {table}")
+    op.execute("DROP FUNCTION IF EXISTS groups_member_count_sync()")
+    op.drop_column("groups", "member_count")
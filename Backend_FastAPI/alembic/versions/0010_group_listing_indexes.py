@@ -0,0 +1,35 @@
+"""Add indexes for filtered, keyset-paginated group listing."""
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "0010_group_listing_indexes"
+down_revision = "0009_group_member_count"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS ix_groups_profile_gin "
+        "ON groups USING GIN (group_profile jsonb_path_ops)"
+    )
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS ix_groups_profile_region "
+        "ON groups ((group_profile ->> 'region'))"
+    )
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS ix_groups_profile_is_public "
+        "ON groups ((COALESCE((group_profile ->> 'is_public')::boolean, true)))"
+    )
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS ix_groups_listing_created "
+        "ON groups (created_at, id) WHERE is_subgroup = false"
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS ix_groups_listing_created")
+    op.execute("DROP INDEX IF EXISTS ix_groups_profile_is_public")
+    op.execute("DROP INDEX IF EXISTS ix_groups_profile_region")
+    op.execute("DROP INDEX IF EXISTS ix_groups_profile_gin")
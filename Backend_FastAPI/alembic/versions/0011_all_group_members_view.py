@@ -0,0 +1,52 @@
+"""Add all_group_members view over user and notion memberships."""
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "0011_all_group_members_view"
+down_revision = "0010_group_listing_indexes"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute(
+        """
+        CREATE OR REPLACE VIEW all_group_members AS
+        SELECT
+            gm.group_id,
+            gm.user_id AS member_id,
+            'user'::text AS kind,
+            gm.role,
+            gm.joined_at,
+            u.embedding,
+            u.embedding_updated_at,
+            u.nickname,
+            u.profile_image_url,
+            (
+                SELECT up.url FROM user_photos up
+                WHERE up.user_id = u.id AND up.is_primary
+                LIMIT 1
+            ) AS photo
+        FROM group_members gm
+        JOIN users u ON u.id = gm.user_id
+        UNION ALL
+        SELECT
+            ngm.group_id,
+            ngm.notion_user_id AS member_id,
+            'notion'::text AS kind,
+            ngm.role,
+            ngm.joined_at,
+            nu.embedding,
+            nu.embedding_updated_at,
+            nu.nickname,
+            nu.profile_image_url,
+            nu.profile_image_url AS photo
+        FROM notion_group_members ngm
+        JOIN notion_users nu ON nu.id = ngm.notion_user_id
+        """
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP VIEW IF EXISTS all_group_members")
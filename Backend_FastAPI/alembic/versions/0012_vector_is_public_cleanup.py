@@ -0,0 +1,52 @@
+"""Drop unused pgvector column/indexes and guard the is_public index cast."""
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "0012_vector_is_public_cleanup"
+down_revision = "0011_all_group_members_view"
+branch_labels = None
+depends_on = None
+
+EMBEDDING_DIM = 1024
+
+
+def upgrade() -> None:
+    # users 는 id 로만 읽고, notion_users 의 vector 컬럼은 앱이 채우지 않는다.
+    op.execute("DROP INDEX IF EXISTS ix_users_embedding_vec_hnsw")
+    op.execute("DROP INDEX IF EXISTS ix_notion_users_embedding_vec_hnsw")
+    op.execute("ALTER TABLE notion_users DROP COLUMN IF EXISTS embedding_vec")
+    # ::boolean 캐스트는 문자열 값 하나로 실패하므로 jsonb_typeof 로 가드한 식으로 바꾼다.
+    op.execute("DROP INDEX IF EXISTS ix_groups_profile_is_public")
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS ix_groups_profile_visibility "
+        "ON groups ((CASE WHEN jsonb_typeof(group_profile -> 'is_public') = 'boolean' "
+        "THEN (group_profile ->> 'is_public')::boolean ELSE true END))"
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS ix_groups_profile_visibility")
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS ix_groups_profile_is_public "
+        "ON groups ((COALESCE((group_profile ->> 'is_public')::boolean, true)))"
+    )
+    op.execute(
+        "ALTER TABLE notion_users "
+        f"ADD COLUMN IF NOT EXISTS embedding_vec vector({EMBEDDING_DIM})"
+    )
+    op.execute(
+        "UPDATE notion_users "
+        "SET embedding_vec = CAST(embedding::text AS vector) "
+        "WHERE embedding_vec IS NULL "
+        "  AND jsonb_typeof(embedding) = 'array' "
+        f"  AND jsonb_array_length(embedding) = {EMBEDDING_DIM}"
+    )
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS ix_notion_users_embedding_vec_hnsw "
+        "ON notion_users USING hnsw (embedding_vec vector_cosine_ops)"
+    )
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS ix_users_embedding_vec_hnsw "
+        "ON users USING hnsw (embedding_vec vector_cosine_ops)"
+    )
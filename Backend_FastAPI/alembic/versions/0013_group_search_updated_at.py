@@ -0,0 +1,44 @@
+"""Add trigger-maintained groups.search_updated_at for in-memory index sync."""
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "0013_group_search_updated_at"
+down_revision = "0012_vector_is_public_cleanup"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "groups",
+        sa.Column("search_updated_at", sa.TIMESTAMP(timezone=True), nullable=True),
+    )
+    op.execute("CREATE INDEX IF NOT EXISTS ix_groups_search_updated_at ON groups (search_updated_at)")
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION groups_search_updated_at() RETURNS trigger AS $$
+        BEGIN
+            IF TG_OP = 'INSERT'
+                OR NEW.group_profile IS DISTINCT FROM OLD.group_profile
+                OR NEW.embedding IS DISTINCT FROM OLD.embedding
+                OR NEW.is_subgroup IS DISTINCT FROM OLD.is_subgroup THEN
+                NEW.search_updated_at = clock_timestamp();
+            END IF;
+            RETURN NEW;
+        END;
+        $$ LANGUAGE plpgsql
+        """
+    )
+    op.execute(
+        "CREATE TRIGGER groups_search_updated_at BEFORE INSERT OR UPDATE ON groups "
+        "FOR EACH ROW EXECUTE FUNCTION groups_search_updated_at()"
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP TRIGGER IF EXISTS groups_search_updated_at ON groups")
+    op.execute("DROP FUNCTION IF EXISTS groups_search_updated_at()")
+    op.execute("DROP INDEX IF EXISTS ix_groups_search_updated_at")
+    op.drop_column("groups", "search_updated_at")
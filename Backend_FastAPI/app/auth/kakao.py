@@ -1,6 +1,7 @@
 import httpx
 
 from app.core.config import settings
+from app.core.http import http_clients
 
 KAKAO_AUTH_URL = "https://kauth.kakao.com/oauth/authorize"
 KAKAO_TOKEN_URL = "https://kauth.kakao.com/oauth/token"
@@ -25,15 +26,13 @@ async def exchange_code_for_token(code: str) -> dict:
         "redirect_uri": settings.KAKAO_REDIRECT_URI,
         "code": code,
     }
-    async with httpx.AsyncClient(timeout=10.0) as client:
-        resp = await client.post(KAKAO_TOKEN_URL, data=data)
-        resp.raise_for_status()
-        return resp.json()
+    resp = await http_clients.get("kakao").post(KAKAO_TOKEN_URL, data=data)
+    resp.raise_for_status()
+    return resp.json()
 
 
 async def fetch_kakao_user(access_token: str) -> dict:
     headers = {"Authorization": f"Bearer {access_token}"}
-    async with httpx.AsyncClient(timeout=10.0) as client:
-        resp = await client.get(KAKAO_USER_URL, headers=headers)
-        resp.raise_for_status()
-        return resp.json()
+    resp = await http_clients.get("kakao").get(KAKAO_USER_URL, headers=headers)
+    resp.raise_for_status()
+    return resp.json()
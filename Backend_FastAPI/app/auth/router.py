@@ -9,8 +9,8 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from app.auth.kakao import build_kakao_login_url, exchange_code_for_token, fetch_kakao_user
 from app.core.config import settings
 from app.core.security import create_access_token
+from app.core.user_cache import get_primary_photo_url, invalidate_user
 from app.db.session import get_db
-from app.models.photo import UserPhoto
 from app.models.user import User
 from app.schemas import AuthResponse, AuthUser, KakaoAuthRequest
 
@@ -25,13 +25,7 @@ def _error_json(code: str, message: str, status_code: int, details: dict | None
 
 
 async def _get_primary_photo_url(db: AsyncSession, user_id) -> str | None:
-    result = await db.execute(
-        select(UserPhoto.url).where(
-            UserPhoto.user_id == user_id,
-            UserPhoto.is_primary == True,  # noqa: E712
-        )
-    )
-    return result.scalar_one_or_none()
+    return await get_primary_photo_url(db, user_id)
 
 
 async def _upsert_kakao_user(db: AsyncSession, kakao_user: dict) -> User:
@@ -80,6 +74,7 @@ async def _upsert_kakao_user(db: AsyncSession, kakao_user: dict) -> User:
         db.add(user)
 
     await db.commit()
+    invalidate_user(user.id)
     await db.refresh(user)
     return user
 
@@ -31,6 +31,67 @@ class Settings(BaseSettings):
     OPENAI_TRANSLATION_MODEL: str = "gpt-4o-mini"
     OPENAI_EMBED_MODEL: str = "text-embedding-3-small"
     OPENAI_EMBED_MODEL_VERSION: str | None = None
+    # 동시 embed_text 호출을 모아 보내는 배치 크기/대기 시간
+    EMBED_BATCH_MAX_SIZE: int = 64
+    EMBED_BATCH_WAIT_MS: int = 20
+    # final_text 해시 기준 임베딩 캐시 (embedding_cache 테이블)
+    EMBEDDING_CACHE_ENABLED: bool = True
+    EMBEDDING_CACHE_MAX_ROWS: int = 50000
+
+    # Embedding storage: "jsonb" (기본) | "pgvector" (vector(1024) 컬럼 + HNSW 인덱스)
+    EMBEDDING_STORAGE: str = "jsonb"
+    # 인메모리 그룹 임베딩 인덱스 전체 재적재 주기 (다른 워커에서 삭제된 그룹 정리용)
+    GROUP_INDEX_REFRESH_SECONDS: int = 300
+    # 요청마다 groups.search_updated_at 워터마크 이후 변경을 읽을 때, 늦게 커밋된 트랜잭션을
+    # 놓치지 않도록 워터마크보다 이만큼 앞에서부터 다시 읽는다.
+    GROUP_INDEX_SYNC_OVERLAP_SECONDS: int = 60
+
+    # Group map layout cache: "memory" (워커별 LRU) | "postgres" (LRU + 공유 테이블)
+    GROUP_MAP_CACHE_BACKEND: str = "memory"
+    GROUP_MAP_CACHE_MAX_ITEMS: int = 128
+    GROUP_MAP_CACHE_MAX_ROWS: int = 5000
+    # 멤버십/임베딩 변경 시 레이아웃 선계산 (그룹별 debounce)
+    LAYOUT_PRECOMPUTE_ENABLED: bool = True
+    LAYOUT_PRECOMPUTE_DEBOUNCE_SECONDS: float = 2.0
+    # 그룹 임베딩 합계 드리프트 보정 주기 (0이면 비활성)
+    GROUP_EMBEDDING_RECONCILE_SECONDS: int = 3600
+
+    # 캡셔닝 작업 큐 (caption_jobs). CAPTION_WORKERS=0 이면 API 프로세스에서는 처리하지 않고
+    # `python -m app.workers.captioning` 별도 워커에 맡긴다.
+    CAPTION_WORKERS: int = 2
+    CAPTION_JOB_MAX_ATTEMPTS: int = 3
+    CAPTION_JOB_BACKOFF_SECONDS: float = 10.0
+    CAPTION_JOB_POLL_SECONDS: float = 5.0
+    # running 작업은 lease 의 1/3 주기로 locked_at 을 갱신한다. 갱신이 끊긴 채 lease 가 지나면
+    # (워커 크래시/재배포) 워커 풀의 sweep 이 다시 pending 으로, 시도 한도에 닿았으면 failed 로 돌린다.
+    CAPTION_JOB_LEASE_SECONDS: int = 120
+    # 여러 사진/사용자의 BLIP 캡셔닝을 한 번의 배치 forward 로 묶는 크기/대기 시간
+    CAPTION_BATCH_MAX_SIZE: int = 16
+    CAPTION_BATCH_WAIT_MS: int = 50
+    # 캡셔닝 실행기: "thread" (기본, to_thread) | "process" (BLIP 을 올린 전용 워커 프로세스 풀)
+    CAPTION_EXECUTOR: str = "thread"
+    CAPTION_PROCESS_WORKERS: int = 1
+    # torch intra-op 스레드 수 제한 (0이면 torch 기본값)
+    CAPTION_TORCH_THREADS: int = 2
+    # BLIP CPU 백엔드: "torch" (fp32) | "torch_int8" (dynamic 양자화) | "onnx" (ONNX Runtime vision encoder)
+    CAPTION_BACKEND: str = "torch"
+    # startup 에서 BLIP 을 미리 올리고 더미 추론 실행 (/ready 는 끝날 때까지 503).
+    # 캡셔닝을 하지 않는 프로세스까지 모델을 올리지 않도록 기본은 끔 — 캡션 워커에서만 켠다.
+    CAPTION_WARMUP_ON_STARTUP: bool = False
+    # 번역+취미 추정을 묶은 JSON 모드 호출 한 번에 넣을 캡션 수
+    CAPTION_ENRICH_BATCH_SIZE: int = 8
+    # 캡셔닝 -> 번역/취미 추정 -> 저장 단계 사이 큐 크기와 단계별 동시 실행 수
+    CAPTION_PIPELINE_QUEUE_SIZE: int = 32
+    CAPTION_PIPELINE_CAPTION_CONCURRENCY: int = 16
+    CAPTION_PIPELINE_ENRICH_CONCURRENCY: int = 4
+    # user_embeddings/*.jsonl 임베딩 입출력 로그: 파일당 최대 크기, 보관할 회전 파일 수, writer 큐 크기
+    EMBEDDING_LOG_MAX_BYTES: int = 10 * 1024 * 1024
+    EMBEDDING_LOG_BACKUP_COUNT: int = 5
+    EMBEDDING_LOG_QUEUE_SIZE: int = 1000
+    # 인증 경로 캐시: JWT 디코드 결과/subject 별 user_id/대표 사진 (0이면 비활성)
+    USER_CACHE_TTL_SECONDS: float = 30.0
+    USER_CACHE_MAX_ENTRIES: int = 10000
+    TOKEN_CACHE_MAX_ENTRIES: int = 10000
 
     # Admin / Master users (comma-separated UUIDs)
     MASTER_USER_IDS: str | None = None
@@ -4,7 +4,7 @@ from fastapi import Depends, Header, HTTPException
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.security import decode_access_token
+from app.core.user_cache import decode_token, get_cached_user, remember_user
 from app.db.session import get_db
 from app.models.user import User
 
@@ -27,7 +27,7 @@ async def get_current_user(
 
     token = authorization.split(" ", 1)[1].strip()
     try:
-        payload = decode_access_token(token)
+        payload = decode_token(token)
     except ValueError:
         raise HTTPException(status_code=401, detail="Invalid token")
 
@@ -35,6 +35,11 @@ async def get_current_user(
     if not subject:
         raise HTTPException(status_code=401, detail="Invalid token")
 
+    # 캐시 hit 이면 provider 조회 대신 PK 로 현재 행을 읽는다.
+    user = await get_cached_user(db, subject)
+    if user is not None:
+        return user
+
     provider_subject = _parse_subject(subject)
     if provider_subject:
         provider, provider_user_id = provider_subject
@@ -56,4 +61,5 @@ async def get_current_user(
     if not user:
         raise HTTPException(status_code=401, detail="User not found")
 
+    remember_user(subject, user)
     return user
@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+import importlib.util
+
+import httpx
+
+# h2 패키지가 설치된 경우에만 HTTP/2 를 켠다.
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+
+@dataclass(frozen=True)
+class UpstreamProfile:
+    timeout: float
+    connect_timeout: float = 5.0
+    max_connections: int = 20
+    max_keepalive_connections: int = 10
+    keepalive_expiry: float = 30.0
+
+
+# 업스트림별 타임아웃/커넥션 풀 설정
+UPSTREAM_PROFILES: dict[str, UpstreamProfile] = {
+    "openai": UpstreamProfile(timeout=30.0, max_connections=20, max_keepalive_connections=10),
+    "kakao": UpstreamProfile(timeout=10.0, max_connections=10, max_keepalive_connections=5),
+}
+
+
+class HttpClientRegistry:
+    """업스트림별로 하나의 httpx.AsyncClient 를 공유해 TCP/TLS 연결을 재사용한다.
+
+    앱 startup 에서 만들고 shutdown 에서 닫는다. 스크립트처럼 startup 없이
+    호출되면 처음 get() 할 때 만든다.
+    """
+
+    def __init__(self, profiles: dict[str, UpstreamProfile]) -> None:
+        self._profiles = profiles
+        self._clients: dict[str, httpx.AsyncClient] = {}
+
+    def _build(self, name: str) -> httpx.AsyncClient:
+        profile = self._profiles[name]
+        return httpx.AsyncClient(
+            http2=HTTP2_AVAILABLE,
+            timeout=httpx.Timeout(profile.timeout, connect=profile.connect_timeout),
+            limits=httpx.Limits(
+                max_connections=profile.max_connections,
+                max_keepalive_connections=profile.max_keepalive_connections,
+                keepalive_expiry=profile.keepalive_expiry,
+            ),
+        )
+
+    def get(self, name: str) -> httpx.AsyncClient:
+        client = self._clients.get(name)
+        if client is None or client.is_closed:
+            client = self._build(name)
+            self._clients[name] = client
+        return client
+
+    def start(self) -> None:
+        for name in self._profiles:
+            self.get(name)
+
+    async def aclose(self) -> None:
+        clients = list(self._clients.values())
+        self._clients.clear()
+        for client in clients:
+            await client.aclose()
+
+
+http_clients = HttpClientRegistry(UPSTREAM_PROFILES)
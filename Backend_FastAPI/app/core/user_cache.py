@@ -0,0 +1,158 @@
+"""인증 경로용 프로세스 로컬 캐시.
+
+- 토큰: 디코드한 JWT payload 를 토큰 문자열 기준으로 exp 전까지 기억한다.
+- 사용자: JWT subject → user_id 만 기억한다. User 행은 요청마다 PK 로 다시 읽으므로
+  다른 프로세스(캡셔닝 워커 등)가 쓴 값을 덮어쓰는 오래된 스냅샷이 생기지 않는다.
+- 대표 사진: user_id 기준으로 대표 사진 URL(없으면 None)을 기억한다 (표시용, 읽기 전용).
+
+사진을 바꾸는 코드는 커밋 뒤 invalidate_user() 를 부른다. 다른 프로세스에서 바꾼 대표 사진은
+TTL(USER_CACHE_TTL_SECONDS)이 지나면 반영된다.
+"""
+
+from __future__ import annotations
+
+from collections import OrderedDict
+import time
+from typing import Any
+import uuid
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.security import decode_access_token
+from app.models.photo import UserPhoto
+from app.models.user import User
+
+
+class TTLCache:
+    """크기 제한(LRU) + 항목별 만료 시각을 가진 작은 dict 캐시."""
+
+    def __init__(self, max_entries: int, ttl_seconds: float) -> None:
+        self._max_entries = max(1, max_entries)
+        self._ttl_seconds = max(0.0, ttl_seconds)
+        self._entries: OrderedDict[Any, tuple[float, Any]] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Any, default: Any = None) -> Any:
+        entry = self._entries.get(key)
+        if entry is None or entry[0] <= time.monotonic():
+            if entry is not None:
+                del self._entries[key]
+            self.misses += 1
+            return default
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[1]
+
+    def set(self, key: Any, value: Any, expires_at: float | None = None) -> None:
+        if self._ttl_seconds <= 0:
+            return
+        deadline = time.monotonic() + self._ttl_seconds
+        if expires_at is not None:
+            deadline = min(deadline, expires_at)
+        self._entries[key] = (deadline, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+
+    def pop(self, key: Any) -> None:
+        self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def stats(self) -> dict[str, int]:
+        return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses}
+
+
+_MISSING = object()
+
+token_cache = TTLCache(settings.TOKEN_CACHE_MAX_ENTRIES, settings.USER_CACHE_TTL_SECONDS)
+user_id_cache = TTLCache(settings.USER_CACHE_MAX_ENTRIES, settings.USER_CACHE_TTL_SECONDS)
+primary_photo_cache = TTLCache(settings.USER_CACHE_MAX_ENTRIES, settings.USER_CACHE_TTL_SECONDS)
+
+
+def decode_token(token: str) -> dict:
+    """decode_access_token 결과를 토큰의 exp 까지 재사용한다. 잘못된 토큰은 ValueError."""
+    payload = token_cache.get(token)
+    if payload is not None:
+        return payload
+    payload = decode_access_token(token)
+    expires_at = None
+    exp = payload.get("exp")
+    if isinstance(exp, (int, float)):
+        expires_at = time.monotonic() + (exp - time.time())
+    token_cache.set(token, payload, expires_at=expires_at)
+    return payload
+
+
+def remember_user(subject: str, user: User) -> None:
+    user_id_cache.set(subject, user.id)
+
+
+async def get_cached_user(db: AsyncSession, subject: str) -> User | None:
+    """subject 에 해당하는 User 를 PK 로 읽는다 (provider 조회 생략). 캐시에 없거나 지워진 사용자면 None."""
+    user_id = user_id_cache.get(subject)
+    if user_id is None:
+        return None
+    user = await db.get(User, user_id)
+    if user is None:
+        user_id_cache.pop(subject)
+    return user
+
+
+def invalidate_user(user_id: uuid.UUID | str) -> None:
+    if not isinstance(user_id, uuid.UUID):
+        try:
+            user_id = uuid.UUID(str(user_id))
+        except ValueError:
+            return
+    primary_photo_cache.pop(user_id)
+
+
+async def get_primary_photo_url(db: AsyncSession, user_id: uuid.UUID) -> str | None:
+    cached = primary_photo_cache.get(user_id, _MISSING)
+    if cached is not _MISSING:
+        return cached
+    result = await db.execute(
+        select(UserPhoto.url).where(
+            UserPhoto.user_id == user_id,
+            UserPhoto.is_primary == True,  # noqa: E712
+        )
+    )
+    url = result.scalar_one_or_none()
+    primary_photo_cache.set(user_id, url)
+    return url
+
+
+async def get_primary_photo_map(db: AsyncSession, user_ids: list[uuid.UUID]) -> dict[uuid.UUID, str]:
+    photo_map: dict[uuid.UUID, str] = {}
+    missing: list[uuid.UUID] = []
+    for user_id in user_ids:
+        cached = primary_photo_cache.get(user_id, _MISSING)
+        if cached is _MISSING:
+            missing.append(user_id)
+        elif cached is not None:
+            photo_map[user_id] = cached
+    if missing:
+        result = await db.execute(
+            select(UserPhoto.user_id, UserPhoto.url).where(
+                UserPhoto.user_id.in_(missing),
+                UserPhoto.is_primary == True,  # noqa: E712
+            )
+        )
+        fetched = {row[0]: row[1] for row in result.all()}
+        for user_id in missing:
+            primary_photo_cache.set(user_id, fetched.get(user_id))
+        photo_map.update(fetched)
+    return photo_map
+
+
+def user_cache_stats() -> dict[str, dict[str, int]]:
+    return {
+        "tokens": token_cache.stats(),
+        "users": user_id_cache.stats(),
+        "primary_photos": primary_photo_cache.stats(),
+    }
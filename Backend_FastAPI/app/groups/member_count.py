@@ -0,0 +1,99 @@
+"""groups.member_count 비정규화 컬럼.
+
+group_members / notion_group_members 의 INSERT, DELETE, group_id UPDATE 마다 트리거가
+같은 트랜잭션 안에서 groups.member_count 를 +1/-1 한다. 앱 코드 어디에서 멤버십을 바꾸든
+(ORM, bulk delete, 마이그레이션 스크립트) 카운트가 같이 움직이므로 읽는 쪽은 count() 없이
+컬럼만 쓰면 된다. find_member_count_drift / fix_member_count_drift 는 검증용이다.
+"""
+
+from __future__ import annotations
+
+import uuid
+
+from sqlalchemy import func, select, text, update
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncSession
+
+from app.groups.membership import all_group_members
+from app.models.group import Group
+
+MEMBERSHIP_TABLES = ("group_members", "notion_group_members")
+
+MEMBER_COUNT_FUNCTION_SQL = """
+CREATE OR REPLACE FUNCTION groups_member_count_sync() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        UPDATE groups SET member_count = member_count + 1 WHERE id = NEW.group_id;
+    ELSIF TG_OP = 'DELETE' THEN
+        UPDATE groups SET member_count = member_count - 1 WHERE id = OLD.group_id;
+    ELSIF NEW.group_id IS DISTINCT FROM OLD.group_id THEN
+        UPDATE groups SET member_count = member_count - 1 WHERE id = OLD.group_id;
+        UPDATE groups SET member_count = member_count + 1 WHERE id = NEW.group_id;
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql
+"""
+
+
+def member_count_trigger_sql(table: str) -> list[str]:
+    trigger = f"{table}_member_count_sync"
+    return [
+        f"DROP TRIGGER IF EXISTS {trigger} ON {table}",
+        f"CREATE TRIGGER {trigger} "
+        f"AFTER INSERT OR DELETE OR UPDATE OF group_id ON {table} "
+        "FOR EACH ROW EXECUTE FUNCTION groups_member_count_sync()",
+    ]
+
+
+def _actual_counts():
+    members = all_group_members.c
+    return (
+        select(members.group_id, func.count().label("actual"))
+        .group_by(members.group_id)
+        .subquery("actual_counts")
+    )
+
+
+def _drift_query():
+    actual = _actual_counts()
+    actual_count = func.coalesce(actual.c.actual, 0)
+    return (
+        select(Group.id, Group.member_count, actual_count.label("actual"))
+        .outerjoin(actual, actual.c.group_id == Group.id)
+        .where(Group.member_count != actual_count)
+    )
+
+
+async def find_member_count_drift(db: AsyncSession | AsyncConnection) -> list[tuple[uuid.UUID, int, int]]:
+    """(group_id, 저장된 member_count, 실제 멤버 수) 가 다른 그룹 목록."""
+    result = await db.execute(_drift_query())
+    return [(row[0], row[1], row[2]) for row in result.all()]
+
+
+def member_count_resync_statement():
+    """어긋난 member_count 를 실제 멤버 수로 맞추는 UPDATE."""
+    drift = _drift_query().subquery("drift")
+    return (
+        update(Group)
+        .where(Group.id == drift.c.id)
+        .values(member_count=drift.c.actual)
+        .execution_options(synchronize_session=False)
+    )
+
+
+async def fix_member_count_drift(db: AsyncSession | AsyncConnection) -> int:
+    """어긋난 member_count 를 실제 멤버 수로 맞추고 고친 그룹 수를 돌려준다. 커밋은 호출자가 한다."""
+    result = await db.execute(member_count_resync_statement())
+    return result.rowcount or 0
+
+
+async def ensure_member_count_triggers(conn: AsyncConnection) -> int:
+    """컬럼/트리거를 (재)생성하고, 트리거가 없던 동안 생긴 드리프트를 맞춘다."""
+    await conn.execute(
+        text("ALTER TABLE groups ADD COLUMN IF NOT EXISTS member_count INTEGER NOT NULL DEFAULT 0")
+    )
+    await conn.execute(text(MEMBER_COUNT_FUNCTION_SQL))
+    for table in MEMBERSHIP_TABLES:
+        for statement in member_count_trigger_sql(table):
+            await conn.execute(text(statement))
+    return await fix_member_count_drift(conn)
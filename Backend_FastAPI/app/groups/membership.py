@@ -0,0 +1,145 @@
+"""그룹 멤버십 조회 (앱 사용자 + Notion 사용자).
+
+all_group_members 뷰가 group_members / notion_group_members 를 각 사용자 테이블과 조인해
+한 모양으로 합쳐 두므로, 엔드포인트는 멤버 종류와 상관없이 group_id 로 한 번만 조회한다.
+
+View: all_group_members
+- group_id (UUID)
+- member_id (UUID)  # users.id 또는 notion_users.id
+- kind (TEXT)  # "user" | "notion"
+- role (VARCHAR(20))
+- joined_at (timestamptz)
+- embedding (JSONB, NULL)
+- embedding_updated_at (timestamptz, NULL)
+- nickname (VARCHAR(64), NULL)
+- profile_image_url (VARCHAR(512), NULL)
+- photo (VARCHAR, NULL)  # 앱 사용자는 대표 사진, Notion 사용자는 profile_image_url
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import datetime
+import uuid
+
+from sqlalchemy import DateTime, String, column, select, table, text
+from sqlalchemy.dialects.postgresql import JSONB, UUID
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncSession
+
+MEMBER_KIND_USER = "user"
+MEMBER_KIND_NOTION = "notion"
+
+ALL_GROUP_MEMBERS_VIEW_SQL = """
+CREATE OR REPLACE VIEW all_group_members AS
+SELECT
+    gm.group_id,
+    gm.user_id AS member_id,
+    'user'::text AS kind,
+    gm.role,
+    gm.joined_at,
+    u.embedding,
+    u.embedding_updated_at,
+    u.nickname,
+    u.profile_image_url,
+    (
+        SELECT up.url FROM user_photos up
+        WHERE up.user_id = u.id AND up.is_primary
+        LIMIT 1
+    ) AS photo
+FROM group_members gm
+JOIN users u ON u.id = gm.user_id
+UNION ALL
+SELECT
+    ngm.group_id,
+    ngm.notion_user_id AS member_id,
+    'notion'::text AS kind,
+    ngm.role,
+    ngm.joined_at,
+    nu.embedding,
+    nu.embedding_updated_at,
+    nu.nickname,
+    nu.profile_image_url,
+    nu.profile_image_url AS photo
+FROM notion_group_members ngm
+JOIN notion_users nu ON nu.id = ngm.notion_user_id
+"""
+
+all_group_members = table(
+    "all_group_members",
+    column("group_id", UUID(as_uuid=True)),
+    column("member_id", UUID(as_uuid=True)),
+    column("kind", String),
+    column("role", String),
+    column("joined_at", DateTime(timezone=True)),
+    column("embedding", JSONB),
+    column("embedding_updated_at", DateTime(timezone=True)),
+    column("nickname", String),
+    column("profile_image_url", String),
+    column("photo", String),
+)
+
+
+@dataclass(frozen=True)
+class GroupMemberRow:
+    member_id: uuid.UUID
+    kind: str
+    embedding: list[float] | None
+    embedding_updated_at: datetime | None
+    nickname: str | None
+    profile_image_url: str | None
+    photo: str | None
+
+    @property
+    def is_notion(self) -> bool:
+        return self.kind == MEMBER_KIND_NOTION
+
+    @property
+    def has_embedding(self) -> bool:
+        return bool(self.embedding)
+
+
+async def ensure_all_group_members_view(conn: AsyncConnection) -> None:
+    await conn.execute(text(ALL_GROUP_MEMBERS_VIEW_SQL))
+
+
+def _ordered(stmt):
+    # 기존 응답 순서: 앱 사용자 먼저, 그다음 Notion 사용자
+    view = all_group_members.c
+    return stmt.order_by(view.kind.desc(), view.joined_at, view.member_id)
+
+
+async def list_group_members(db: AsyncSession, group_id: uuid.UUID) -> list[GroupMemberRow]:
+    view = all_group_members.c
+    result = await db.execute(
+        _ordered(
+            select(
+                view.member_id,
+                view.kind,
+                view.embedding,
+                view.embedding_updated_at,
+                view.nickname,
+                view.profile_image_url,
+                view.photo,
+            ).where(view.group_id == group_id)
+        )
+    )
+    return [GroupMemberRow(*row) for row in result.all()]
+
+
+async def list_group_member_ids(db: AsyncSession, group_id: uuid.UUID) -> list[uuid.UUID]:
+    view = all_group_members.c
+    result = await db.execute(_ordered(select(view.member_id).where(view.group_id == group_id)))
+    return [row[0] for row in result.all()]
+
+
+async def list_member_group_ids(db: AsyncSession, member_id: uuid.UUID) -> set[uuid.UUID]:
+    """앱 사용자 또는 Notion 사용자가 속한 그룹 id."""
+    view = all_group_members.c
+    result = await db.execute(select(view.group_id).where(view.member_id == member_id))
+    return {row[0] for row in result.all()}
+
+
+async def list_group_member_embeddings(db: AsyncSession, group_id: uuid.UUID) -> list[list[float] | None]:
+    view = all_group_members.c
+    result = await db.execute(select(view.embedding).where(view.group_id == group_id))
+    return list(result.scalars().all())
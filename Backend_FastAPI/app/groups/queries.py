@@ -0,0 +1,283 @@
+"""그룹 목록 조회 쿼리.
+
+그룹마다 멤버 ID 를 따로 조회하지 않고, all_group_members 뷰(앱 + Notion 멤버)를
+group_id 별로 array_agg 해 한 번에 가져온다.
+인원수는 트리거가 유지하는 groups.member_count 를 그대로 쓴다.
+
+목록은 (created_at, id) keyset 커서로 페이지를 나누고, tags/region/is_public 필터는
+GROUP_LISTING_INDEXES 의 GIN/표현식 인덱스를 타도록 group_profile 에 직접 건다.
+"""
+
+from __future__ import annotations
+
+import base64
+import binascii
+from dataclasses import dataclass, field
+from datetime import datetime
+import json
+import uuid
+
+from sqlalchemy import (
+    Boolean,
+    Select,
+    String,
+    and_,
+    bindparam,
+    func,
+    literal_column,
+    or_,
+    select,
+    tuple_,
+)
+from sqlalchemy.dialects.postgresql import aggregate_order_by
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.groups.membership import all_group_members
+from app.models.group import Group, GroupMember
+
+
+def is_public_sql(profile_column: str = "groups.group_profile") -> str:
+    """is_public 이 JSON boolean 일 때만 캐스트하고 나머지(없음/null/문자열)는 공개로 본다.
+
+    `(... ->> 'is_public')::boolean` 을 그대로 쓰면 'yes!' 같은 문자열 하나로 쿼리와
+    인덱스 생성이 실패한다. 파이썬 쪽 규칙은 is_public_profile 이다.
+    """
+    return (
+        f"(CASE WHEN jsonb_typeof({profile_column} -> 'is_public') = 'boolean' "
+        f"THEN ({profile_column} ->> 'is_public')::boolean ELSE true END)"
+    )
+
+
+def is_public_profile(profile: dict | None) -> bool:
+    value = (profile or {}).get("is_public")
+    return value if isinstance(value, bool) else True
+
+
+GROUP_LISTING_INDEXES = [
+    "CREATE INDEX IF NOT EXISTS ix_groups_profile_gin "
+    "ON groups USING GIN (group_profile jsonb_path_ops)",
+    "CREATE INDEX IF NOT EXISTS ix_groups_profile_region "
+    "ON groups ((group_profile ->> 'region'))",
+    # 예전 ::boolean 캐스트 인덱스는 문자열 값에서 실패하므로 가드한 식으로 바꾼다.
+    "DROP INDEX IF EXISTS ix_groups_profile_is_public",
+    "CREATE INDEX IF NOT EXISTS ix_groups_profile_visibility "
+    f"ON groups ({is_public_sql('group_profile')})",
+    "CREATE INDEX IF NOT EXISTS ix_groups_listing_created "
+    "ON groups (created_at, id) WHERE is_subgroup = false",
+]
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+@dataclass(frozen=True)
+class GroupFilters:
+    tags: list[str] = field(default_factory=list)
+    region: str | None = None
+    is_public: bool | None = None
+
+
+@dataclass(frozen=True)
+class GroupListRow:
+    group: Group
+    member_ids: list[uuid.UUID]
+    member_count: int
+    is_member: bool = False
+
+
+@dataclass(frozen=True)
+class GroupPage:
+    rows: list[GroupListRow]
+    next_cursor: str | None = None
+
+
+def encode_cursor(payload: dict) -> str:
+    raw = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> dict:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+    except (binascii.Error, UnicodeError, ValueError) as exc:
+        raise InvalidCursor("invalid cursor") from exc
+    if not isinstance(payload, dict):
+        raise InvalidCursor("invalid cursor")
+    return payload
+
+
+def _decode_created_cursor(cursor: str) -> tuple[datetime, uuid.UUID]:
+    payload = decode_cursor(cursor)
+    try:
+        return datetime.fromisoformat(payload["c"]), uuid.UUID(payload["i"])
+    except (KeyError, TypeError, ValueError) as exc:
+        raise InvalidCursor("invalid cursor") from exc
+
+
+def _created_cursor(group: Group) -> str:
+    return encode_cursor({"c": group.created_at.isoformat(), "i": str(group.id)})
+
+
+def encode_score_cursor(score: float | None, group_id: uuid.UUID) -> str:
+    """검색 커서. score 가 None 이면 임베딩이 없어 점수 순위 뒤에 붙는 그룹 구간이다."""
+    return encode_cursor({"s": score, "i": str(group_id)})
+
+
+def decode_score_cursor(cursor: str) -> tuple[float | None, uuid.UUID]:
+    payload = decode_cursor(cursor)
+    try:
+        score = payload["s"]
+        if score is not None:
+            score = float(score)
+        return score, uuid.UUID(payload["i"])
+    except (KeyError, TypeError, ValueError) as exc:
+        raise InvalidCursor("invalid cursor") from exc
+
+
+# 키를 bind 파라미터로 넘기면 표현식 인덱스와 매칭되지 않으므로 인덱스와 같은 SQL 을 그대로 쓴다.
+_REGION_EXPRESSION = "(groups.group_profile ->> 'region')"
+_IS_PUBLIC_EXPRESSION = is_public_sql()
+
+
+def is_public_expression():
+    return literal_column(_IS_PUBLIC_EXPRESSION, Boolean)
+
+
+def group_filter_clauses(filters: GroupFilters | None) -> list:
+    if filters is None:
+        return []
+    clauses = []
+    tags = [tag for tag in filters.tags if tag]
+    if tags:
+        # _group_response 처럼 tags 가 없으면 interests 를 태그로 본다.
+        clauses.append(
+            or_(
+                Group.group_profile.contains({"tags": tags}),
+                Group.group_profile.contains({"interests": tags}),
+            )
+        )
+    if filters.region:
+        clauses.append(
+            literal_column(_REGION_EXPRESSION, String)
+            == bindparam("group_region", filters.region, type_=String)
+        )
+    if filters.is_public is not None:
+        clauses.append(is_public_expression() == filters.is_public)
+    return clauses
+
+
+def _paginate(stmt: Select, after: str | None, limit: int | None) -> Select:
+    if after:
+        created_at, group_id = _decode_created_cursor(after)
+        stmt = stmt.where(tuple_(Group.created_at, Group.id) > tuple_(created_at, group_id))
+    stmt = stmt.order_by(Group.created_at, Group.id)
+    if limit is not None:
+        # 다음 페이지 유무를 알기 위해 한 건 더 읽는다.
+        stmt = stmt.limit(limit + 1)
+    return stmt
+
+
+def _page(rows: list[GroupListRow], limit: int | None) -> GroupPage:
+    if limit is None or len(rows) <= limit:
+        return GroupPage(rows=rows)
+    rows = rows[:limit]
+    return GroupPage(rows=rows, next_cursor=_created_cursor(rows[-1].group))
+
+
+async def _member_ids_by_group(
+    db: AsyncSession,
+    group_ids: list[uuid.UUID],
+) -> dict[uuid.UUID, list[uuid.UUID]]:
+    if not group_ids:
+        return {}
+    members = all_group_members.c
+    # list_group_members 와 같은 순서: 앱 사용자 먼저, 그다음 Notion 사용자
+    result = await db.execute(
+        select(
+            members.group_id,
+            func.array_agg(
+                aggregate_order_by(
+                    members.member_id,
+                    members.kind.desc(),
+                    members.joined_at,
+                    members.member_id,
+                )
+            ),
+        )
+        .where(members.group_id.in_(group_ids))
+        .group_by(members.group_id)
+    )
+    return {group_id: list(member_ids or []) for group_id, member_ids in result.all()}
+
+
+async def list_groups_with_members(
+    db: AsyncSession,
+    member_user_id: uuid.UUID | None = None,
+    include_subgroups: bool = False,
+    filters: GroupFilters | None = None,
+    after: str | None = None,
+    limit: int | None = None,
+) -> GroupPage:
+    """그룹 한 페이지와 그 그룹들의 전체 멤버 ID(앱 + Notion)를 두 번의 쿼리로 가져온다.
+
+    member_user_id 가 있으면 그 사용자가 속한 그룹만, limit 이 없으면 전체를 돌려준다.
+    """
+    stmt = select(Group).where(*group_filter_clauses(filters))
+    if not include_subgroups:
+        stmt = stmt.where(Group.is_subgroup == False)  # noqa: E712
+    if member_user_id is not None:
+        stmt = stmt.where(
+            Group.id.in_(
+                select(GroupMember.group_id).where(GroupMember.user_id == member_user_id)
+            )
+        )
+    result = await db.execute(_paginate(stmt, after, limit))
+    groups = list(result.scalars().all())
+    member_ids = await _member_ids_by_group(db, [group.id for group in groups])
+    rows = [
+        GroupListRow(
+            group=group,
+            member_ids=member_ids.get(group.id, []),
+            member_count=group.member_count,
+        )
+        for group in groups
+    ]
+    return _page(rows, limit)
+
+
+async def list_groups_with_member_counts(
+    db: AsyncSession,
+    viewer_id: uuid.UUID,
+    include_subgroups: bool = False,
+    filters: GroupFilters | None = None,
+    after: str | None = None,
+    limit: int | None = None,
+) -> GroupPage:
+    """그룹별 인원수(groups.member_count)와 viewer 가입 여부를 한 번의 쿼리로 가져온다 (멤버 ID 는 비워 둔다)."""
+    viewer_membership = GroupMember.__table__.alias("viewer_membership")
+    stmt = (
+        select(Group, viewer_membership.c.user_id.is_not(None))
+        .outerjoin(
+            viewer_membership,
+            and_(
+                viewer_membership.c.group_id == Group.id,
+                viewer_membership.c.user_id == viewer_id,
+            ),
+        )
+        .where(*group_filter_clauses(filters))
+    )
+    if not include_subgroups:
+        stmt = stmt.where(Group.is_subgroup == False)  # noqa: E712
+    result = await db.execute(_paginate(stmt, after, limit))
+    rows = [
+        GroupListRow(
+            group=group,
+            member_ids=[],
+            member_count=group.member_count,
+            is_member=bool(is_member),
+        )
+        for group, is_member in result.all()
+    ]
+    return _page(rows, limit)
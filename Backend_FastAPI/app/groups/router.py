@@ -7,17 +7,20 @@ from urllib.parse import urlparse
 import logging
 
 from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy import and_, delete, func, select
+from sqlalchemy import and_, delete, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.deps import get_current_user
+from app.core.user_cache import get_primary_photo_map
 from app.db.session import get_db
+from app.groups import membership
+from app.groups.queries import GroupFilters, InvalidCursor, list_groups_with_member_counts
 from app.models.group import Group, GroupMember
-from app.models.notion_group_member import NotionGroupMember
 from app.models.message import GroupMessage
 from app.models.photo import UserPhoto
 from app.models.user import User
-from app.models.notion_user import NotionUser
+from app.services.embedding.layout_scheduler import layout_scheduler
+from app.services.embedding.repo import update_group_embedding
 from app.schemas import (
     GroupCreateRequest,
     GroupListItem,
@@ -109,15 +112,7 @@ def _coords_from_uuid(user_id: uuid.UUID) -> tuple[float, float]:
 
 
 async def _get_primary_photo_map(db: AsyncSession, user_ids: list[uuid.UUID]):
-    if not user_ids:
-        return {}
-    result = await db.execute(
-        select(UserPhoto.user_id, UserPhoto.url).where(
-            UserPhoto.user_id.in_(user_ids),
-            UserPhoto.is_primary == True,  # noqa: E712
-        )
-    )
-    return {row[0]: row[1] for row in result.all()}
+    return await get_primary_photo_map(db, user_ids)
 
 
 async def _ensure_group(db: AsyncSession, group_id: uuid.UUID) -> Group:
@@ -135,29 +130,34 @@ async def _ensure_member(db: AsyncSession, group_id: uuid.UUID, user_id: uuid.UU
 
 @router.get("", response_model=GroupListResponse)
 async def list_groups(
+    tags: list[str] = Query([]),
+    region: str | None = Query(None),
+    is_public: bool | None = Query(None),
+    after: str | None = Query(None),
+    limit: int | None = Query(None, ge=1, le=200),
     current_user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
 ):
-    membership_result = await db.execute(
-        select(GroupMember.group_id).where(GroupMember.user_id == current_user.id)
+    filters = GroupFilters(
+        tags=[tag.strip() for tag in tags if tag.strip()],
+        region=region or None,
+        is_public=is_public,
     )
-    member_group_ids = {row[0] for row in membership_result.all()}
-
-    result = await db.execute(select(Group).where(Group.is_subgroup == False))  # noqa: E712
-    groups = result.scalars().all()
+    try:
+        page = await list_groups_with_member_counts(
+            db,
+            viewer_id=current_user.id,
+            filters=filters,
+            after=after,
+            limit=limit,
+        )
+    except InvalidCursor as exc:
+        raise HTTPException(status_code=400, detail="Invalid cursor") from exc
+    rows = page.rows
 
     items = []
-    for group in groups:
-        member_count_result = await db.execute(
-            select(func.count()).select_from(GroupMember).where(GroupMember.group_id == group.id)
-        )
-        member_count = member_count_result.scalar() or 0
-        notion_count_result = await db.execute(
-            select(func.count())
-            .select_from(NotionGroupMember)
-            .where(NotionGroupMember.group_id == group.id)
-        )
-        member_count += notion_count_result.scalar() or 0
+    for row in rows:
+        group = row.group
         # group_profile에서 tags, region, image_url 추출
         profile = group.group_profile or {}
         tags = profile.get("tags", [])
@@ -169,15 +169,15 @@ async def list_groups(
                 id=str(group.id),
                 name=group.name,
                 description=group.description,
-                member_count=member_count,
-                is_member=group.id in member_group_ids,
+                member_count=row.member_count,
+                is_member=row.is_member,
                 tags=tags,
                 region=region,
                 image_url=image_url,
             )
         )
 
-    return GroupListResponse(items=items)
+    return GroupListResponse(items=items, next_cursor=page.next_cursor)
 
 
 @router.post("/{group_id}/join", response_model=OkResponse)
@@ -192,7 +192,9 @@ async def join_group(
     if not existing:
         member = GroupMember(group_id=group_id, user_id=current_user.id, role="member")
         db.add(member)
+        await update_group_embedding(db, group_id, added=current_user.embedding)
         await db.commit()
+        layout_scheduler.schedule(group_id)
 
     return OkResponse(ok=True)
 
@@ -216,13 +218,16 @@ async def leave_group(
         current_user.id,
         group_id,
     )
-    await db.execute(
+    removed = await db.execute(
         delete(GroupMember).where(
             GroupMember.group_id == group_id,
             GroupMember.user_id == current_user.id,
         )
     )
+    if removed.rowcount:
+        await update_group_embedding(db, group_id, removed=current_user.embedding)
     await db.commit()
+    layout_scheduler.schedule(group_id)
     logging.getLogger("uvicorn.error").info(
         "Leave group completed user_id=%s group_id=%s",
         current_user.id,
@@ -238,43 +243,17 @@ async def list_group_members(
     db: AsyncSession = Depends(get_db),
 ):
     await _ensure_group(db, group_id)
-
-    result = await db.execute(
-        select(User)
-        .join(GroupMember, GroupMember.user_id == User.id)
-        .where(GroupMember.group_id == group_id)
-    )
-    users = result.scalars().all()
-
-    notion_result = await db.execute(
-        select(NotionUser)
-        .join(NotionGroupMember, NotionGroupMember.notion_user_id == NotionUser.id)
-        .where(NotionGroupMember.group_id == group_id)
-    )
-    notion_users = notion_result.scalars().all()
-
-    primary_photo_map = await _get_primary_photo_map(db, [user.id for user in users])
+    members = await membership.list_group_members(db, group_id)
 
     items = [
         GroupMemberItem(
-            user_id=str(user.id),
-            nickname=user.nickname,
-            primary_photo_url=_normalize_upload_url(primary_photo_map.get(user.id)),
+            user_id=str(member.member_id),
+            nickname=member.nickname,
+            primary_photo_url=_normalize_upload_url(member.photo),
         )
-        for user in users
+        for member in members
     ]
 
-    items.extend(
-        [
-            GroupMemberItem(
-                user_id=str(user.id),
-                nickname=user.nickname,
-                primary_photo_url=_normalize_upload_url(user.profile_image_url),
-            )
-            for user in notion_users
-        ]
-    )
-
     return GroupMembersResponse(items=items)
 
 
@@ -285,54 +264,19 @@ async def group_interest_map(
     db: AsyncSession = Depends(get_db),
 ):
     group = await _ensure_group(db, group_id)
-
-    result = await db.execute(
-        select(User)
-        .join(GroupMember, GroupMember.user_id == User.id)
-        .where(GroupMember.group_id == group_id)
-    )
-    users = result.scalars().all()
-    user_ids = [user.id for user in users]
-
-    notion_result = await db.execute(
-        select(NotionUser)
-        .join(NotionGroupMember, NotionGroupMember.notion_user_id == NotionUser.id)
-        .where(NotionGroupMember.group_id == group_id)
-    )
-    notion_users = notion_result.scalars().all()
-
-    embedding_user_ids = {
-        user.id
-        for user in users
-        if user.embedding is not None and len(user.embedding) > 0
-    }
-
-    primary_photo_map = await _get_primary_photo_map(db, user_ids)
+    members = await membership.list_group_members(db, group_id)
 
     nodes = []
-    for user in users:
-        x, y = _coords_from_uuid(user.id)
-        nodes.append(
-            InterestMapNode(
-                user_id=str(user.id),
-                nickname=user.nickname,
-                primary_photo_url=_normalize_upload_url(primary_photo_map.get(user.id)),
-                x=x,
-                y=y,
-                embedding_status="ready" if user.id in embedding_user_ids else "missing",
-            )
-        )
-
-    for user in notion_users:
-        x, y = _coords_from_uuid(user.id)
+    for member in members:
+        x, y = _coords_from_uuid(member.member_id)
         nodes.append(
             InterestMapNode(
-                user_id=str(user.id),
-                nickname=user.nickname,
-                primary_photo_url=_normalize_upload_url(user.profile_image_url),
+                user_id=str(member.member_id),
+                nickname=member.nickname,
+                primary_photo_url=_normalize_upload_url(member.photo),
                 x=x,
                 y=y,
-                embedding_status="ready" if user.embedding is not None and len(user.embedding) > 0 else "missing",
+                embedding_status="ready" if member.has_embedding else "missing",
             )
         )
 
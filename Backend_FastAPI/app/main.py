@@ -1,17 +1,15 @@
-from fastapi import FastAPI, HTTPException, UploadFile, File, Form, Depends, Request, Query
+from fastapi import FastAPI, HTTPException, UploadFile, File, Form, Depends, Request, Query, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 from fastapi.staticfiles import StaticFiles
-from collections import Counter
 import json
 from typing import List, Optional, Dict, Any
 import asyncio
-import hashlib
 import uuid
-from datetime import datetime, timezone
 import logging
 from pathlib import Path
 from urllib.parse import urlparse
-from sqlalchemy import text, select, func, inspect, delete, update
+from sqlalchemy import text, select, func, inspect, delete
 from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -29,10 +27,27 @@ from app.schemas import (
 )
 from app.auth.router import router as auth_router
 from app.groups.router import router as groups_router
+from app.groups.member_count import ensure_member_count_triggers
+from app.groups.membership import (
+    ensure_all_group_members_view,
+    list_group_member_ids,
+    list_group_members,
+)
+from app.groups.queries import (
+    GROUP_LISTING_INDEXES,
+    GroupFilters,
+    InvalidCursor,
+    decode_score_cursor,
+    encode_score_cursor,
+    is_public_profile,
+    list_groups_with_members,
+)
 from app.me.router import router as me_router
 from app.db.session import engine, get_db, AsyncSessionLocal
 from app.db.base import Base
 from app.core.config import settings
+from app.core.http import http_clients
+from app.core.user_cache import get_primary_photo_url, invalidate_user, user_cache_stats
 import app.models  # ensure models are registered for metadata
 from app.models.user import User
 from app.models.notion_user import NotionUser
@@ -40,20 +55,52 @@ from app.models.photo import UserPhoto
 from app.models.group import Group, GroupMember
 from app.models.notion_group_member import NotionGroupMember
 from app.models.message import GroupMessage
-from app.services.embedding.captioning import caption_image, is_blip_ready
+from app.services.embedding.caption_cache import caption_cache
+from app.services.embedding.caption_executor import (
+    captioning_ready,
+    captioning_state,
+    shutdown_caption_executor,
+    warm_up_captioning,
+)
+from app.services.embedding.caption_queue import (
+    caption_workers,
+    enqueue_caption_job,
+    requeue_stale_jobs,
+)
 from app.services.embedding.composer import build_final_text
-from app.services.embedding.embedding_log import log_embedding_io
-from app.services.embedding.group_map import GroupMapInput, build_group_map_positions
-from app.services.embedding.interest import infer_interest_tags
-from app.services.embedding.openai_embed import embed_text, EMBEDDING_DIM, MODEL_NAME, MODEL_VERSION
+from app.services.embedding.embedding_cache import embedding_cache
+from app.services.embedding.embedding_log import embedding_log_writer, log_embedding_io
+from app.services.embedding.group_index import (
+    ensure_group_index,
+    ensure_search_updated_at_trigger,
+    group_index,
+    refresh_group_visibility_in_index,
+)
+from app.services.embedding.group_map import GroupMapInput
+from app.services.embedding.image_prep import derivative_path, derivative_url
+from app.services.embedding.layout_cache import get_layout_cache, resolve_group_map_positions
+from app.services.embedding.layout_scheduler import layout_scheduler
+from app.services.embedding.openai_embed import (
+    close_embedding_batcher,
+    embed_text,
+    EMBEDDING_DIM,
+    MODEL_NAME,
+    MODEL_VERSION,
+)
 from app.services.embedding.repo import (
+    GROUP_EMBEDDING_RECONCILE_LOCK_ID,
+    backfill_group_embedding_totals,
     create_embedding,
     deactivate_embeddings,
     get_active_embedding,
     get_recent_captions,
-    upsert_image_caption,
+    reconcile_group_embeddings,
+    search_similar_groups,
+    update_group_embedding,
+    vector_storage_enabled,
 )
-from app.services.embedding.translation import translate_to_korean
+from app.services.embedding.vector_columns import embedding_vector_schema_sql
+from app.services.uploads import save_upload
 
 LOG_FORMAT = "%(asctime)s | %(levelname)s | %(name)s | %(message)s"
 DATE_FORMAT = "%Y-%m-%d %H:%M:%S"
@@ -250,6 +297,107 @@ async def _backfill_user_embeddings() -> None:
             logger.warning("Embedding backfill skipped: %s", exc)
 
 
+async def _ensure_embedding_vector_columns() -> None:
+    if not vector_storage_enabled():
+        return
+    logger = logging.getLogger("uvicorn.error")
+    try:
+        async with engine.begin() as conn:
+            for statement in embedding_vector_schema_sql():
+                await conn.execute(text(statement))
+    except Exception as exc:
+        logger.warning("pgvector columns could not be ensured: %s", exc)
+
+
+async def _ensure_group_embedding_sum_columns() -> None:
+    async with engine.begin() as conn:
+        await conn.execute(
+            text("ALTER TABLE groups ADD COLUMN IF NOT EXISTS embedding_sum JSONB")
+        )
+        await conn.execute(
+            text(
+                "ALTER TABLE groups "
+                "ADD COLUMN IF NOT EXISTS embedding_count INTEGER NOT NULL DEFAULT 0"
+            )
+        )
+
+
+async def _ensure_group_member_count() -> None:
+    async with engine.begin() as conn:
+        fixed = await ensure_member_count_triggers(conn)
+    if fixed:
+        logging.getLogger("uvicorn.error").info("Group member counts resynced groups=%d", fixed)
+
+
+async def _ensure_all_group_members_view() -> None:
+    async with engine.begin() as conn:
+        await ensure_all_group_members_view(conn)
+
+
+async def _ensure_group_search_updated_at() -> None:
+    async with engine.begin() as conn:
+        await ensure_search_updated_at_trigger(conn)
+
+
+async def _ensure_group_listing_indexes() -> None:
+    async with engine.begin() as conn:
+        for statement in GROUP_LISTING_INDEXES:
+            await conn.execute(text(statement))
+
+
+async def _run_with_reconcile_lock(job) -> int | None:
+    """API 워커마다 호출되므로 advisory lock 을 잡은 한 프로세스만 job 을 실행한다."""
+    async with engine.connect() as lock_conn:
+        lock_params = {"key": GROUP_EMBEDDING_RECONCILE_LOCK_ID}
+        locked = await lock_conn.scalar(
+            text("SELECT pg_try_advisory_lock(:key)"), lock_params
+        )
+        if not locked:
+            return None
+        try:
+            async with AsyncSessionLocal() as session:
+                return await job(session)
+        finally:
+            await lock_conn.execute(text("SELECT pg_advisory_unlock(:key)"), lock_params)
+
+
+async def _backfill_group_embedding_totals() -> None:
+    # 합계가 NULL 인 그룹이 남아 있으면 증분 갱신이 전체 재계산으로 빠지므로 먼저 채운다.
+    logger = logging.getLogger("uvicorn.error")
+    try:
+        backfilled = await _run_with_reconcile_lock(backfill_group_embedding_totals)
+        if backfilled:
+            logger.info("Group embedding totals backfilled groups=%d", backfilled)
+    except Exception as exc:
+        logger.warning("Group embedding backfill failed: %s", exc)
+
+
+async def _reconcile_group_embeddings_periodically(interval_seconds: int) -> None:
+    logger = logging.getLogger("uvicorn.error")
+    while True:
+        await asyncio.sleep(interval_seconds)
+        try:
+            count = await _run_with_reconcile_lock(reconcile_group_embeddings)
+            if count is not None:
+                logger.info("Group embeddings reconciled groups=%d", count)
+        except Exception as exc:
+            logger.warning("Group embedding reconcile failed: %s", exc)
+
+
+_background_tasks: set[asyncio.Task] = set()
+
+
+def _spawn_background_task(coro) -> None:
+    task = asyncio.create_task(coro)
+    _background_tasks.add(task)
+    task.add_done_callback(_background_tasks.discard)
+
+
+def _captioning_warmup_expected() -> bool:
+    # API 프로세스가 캡셔닝을 직접 처리할 때만 warm-up 을 readiness 조건으로 삼는다.
+    return settings.CAPTION_WARMUP_ON_STARTUP and settings.CAPTION_WORKERS > 0
+
+
 @app.on_event("startup")
 async def init_db_schema() -> None:
     async with engine.begin() as conn:
@@ -257,6 +405,43 @@ async def init_db_schema() -> None:
     await _ensure_user_embedding_columns()
     await _backfill_user_embeddings()
     await _ensure_photo_hash_index()
+    await _ensure_embedding_vector_columns()
+    await _ensure_group_embedding_sum_columns()
+    # member_count 드리프트 검사가 뷰를 읽으므로 뷰를 먼저 만든다.
+    await _ensure_all_group_members_view()
+    await _ensure_group_member_count()
+    await _ensure_group_listing_indexes()
+    await _ensure_group_search_updated_at()
+    http_clients.start()
+    try:
+        requeued = await requeue_stale_jobs()
+        if requeued:
+            logging.getLogger("uvicorn.error").info("Caption jobs requeued count=%d", requeued)
+    except Exception as exc:
+        logging.getLogger("uvicorn.error").warning("Caption job requeue skipped: %s", exc)
+    caption_workers.start()
+    if _captioning_warmup_expected():
+        _spawn_background_task(warm_up_captioning())
+    _spawn_background_task(_backfill_group_embedding_totals())
+    if settings.GROUP_EMBEDDING_RECONCILE_SECONDS > 0:
+        _spawn_background_task(
+            _reconcile_group_embeddings_periodically(
+                settings.GROUP_EMBEDDING_RECONCILE_SECONDS
+            )
+        )
+
+
+@app.on_event("shutdown")
+async def stop_background_tasks() -> None:
+    await caption_workers.stop()
+    shutdown_caption_executor()
+    await layout_scheduler.shutdown()
+    await close_embedding_batcher()
+    await http_clients.aclose()
+    await embedding_log_writer.aclose()
+    for task in list(_background_tasks):
+        task.cancel()
+    await asyncio.gather(*_background_tasks, return_exceptions=True)
 
 
 def _cache_user(user: User, is_new_user: bool = False) -> dict:
@@ -329,26 +514,8 @@ async def _get_group_by_id(db: AsyncSession, group_id: str) -> Group:
     return group
 
 
-async def _get_group_member_ids(db: AsyncSession, group_id: uuid.UUID) -> list[uuid.UUID]:
-    result = await db.execute(
-        select(GroupMember.user_id).where(GroupMember.group_id == group_id)
-    )
-    return [row[0] for row in result.all()]
-
-
-async def _get_notion_member_ids(db: AsyncSession, group_id: uuid.UUID) -> list[uuid.UUID]:
-    result = await db.execute(
-        select(NotionGroupMember.notion_user_id).where(
-            NotionGroupMember.group_id == group_id
-        )
-    )
-    return [row[0] for row in result.all()]
-
-
 async def _get_all_group_member_ids(db: AsyncSession, group_id: uuid.UUID) -> list[uuid.UUID]:
-    user_ids = await _get_group_member_ids(db, group_id)
-    notion_ids = await _get_notion_member_ids(db, group_id)
-    return user_ids + notion_ids
+    return await list_group_member_ids(db, group_id)
 
 
 def _group_response(group: Group, member_ids: list[uuid.UUID]) -> dict:
@@ -358,7 +525,7 @@ def _group_response(group: Group, member_ids: list[uuid.UUID]) -> dict:
     region = profile.get("region") or ""
     image_url = _normalize_upload_url(profile.get("image_url")) or ""
     icon_type = profile.get("icon_type") or ""
-    is_public = bool(profile.get("is_public", True))
+    is_public = is_public_profile(profile)
     return {
         "id": str(group.id),
         "name": group.name,
@@ -383,79 +550,10 @@ def _to_float_vector(embedding: list[float] | None) -> list[float] | None:
         return None
 
 
-async def _collect_group_member_embeddings(
-    db: AsyncSession,
-    user_ids: list[uuid.UUID],
-    notion_ids: list[uuid.UUID],
-) -> list[list[float]]:
-    vectors: list[list[float]] = []
-    if user_ids:
-        result = await db.execute(select(User.embedding).where(User.id.in_(user_ids)))
-        for raw in result.scalars().all():
-            vector = _to_float_vector(raw)
-            if vector:
-                vectors.append(vector)
-    if notion_ids:
-        result = await db.execute(select(NotionUser.embedding).where(NotionUser.id.in_(notion_ids)))
-        for raw in result.scalars().all():
-            vector = _to_float_vector(raw)
-            if vector:
-                vectors.append(vector)
-    return vectors
-
-
-def _average_vectors(vectors: list[list[float]]) -> list[float] | None:
-    if not vectors:
-        return None
-    dim = len(vectors[0])
-    if dim == 0:
-        return None
-    accumulator = [0.0] * dim
-    count = 0
-    for vector in vectors:
-        if len(vector) != dim:
-            continue
-        for i, value in enumerate(vector):
-            accumulator[i] += value
-        count += 1
-    if count == 0:
-        return None
-    return [value / count for value in accumulator]
-
-
-async def _recompute_group_embedding(db: AsyncSession, group: Group) -> None:
-    try:
-        user_ids = await _get_group_member_ids(db, group.id)
-        notion_ids = await _get_notion_member_ids(db, group.id)
-        vectors = await _collect_group_member_embeddings(db, user_ids, notion_ids)
-        average = _average_vectors(vectors)
-        timestamp = datetime.now(timezone.utc)
-        values = {
-            "embedding": average,
-            "embedding_updated_at": timestamp,
-        }
-        await db.execute(update(Group).where(Group.id == group.id).values(**values))
-        await db.commit()
-    except Exception as exc:
-        logging.getLogger("uvicorn.error").warning(
-            "Failed to recompute embedding for group_id=%s: %s", group.id, exc
-        )
-
-
-async def _count_group_members(db: AsyncSession, group_id: uuid.UUID) -> tuple[int, int]:
-    result = await db.execute(
-        select(func.count())
-        .select_from(GroupMember)
-        .where(GroupMember.group_id == group_id)
-    )
-    user_count = result.scalar() or 0
-    notion_result = await db.execute(
-        select(func.count())
-        .select_from(NotionGroupMember)
-        .where(NotionGroupMember.group_id == group_id)
-    )
-    notion_count = notion_result.scalar() or 0
-    return user_count, notion_count
+async def _count_group_members(db: AsyncSession, group: Group) -> int:
+    # member_count 는 트리거가 DB 에서 갱신하므로 세션에 들고 있는 값 대신 다시 읽는다.
+    await db.refresh(group, attribute_names=["member_count"])
+    return group.member_count
 
 
 async def _has_subgroups(db: AsyncSession, group_id: uuid.UUID) -> bool:
@@ -468,8 +566,7 @@ async def _has_subgroups(db: AsyncSession, group_id: uuid.UUID) -> bool:
 
 
 async def _delete_group_if_empty(db: AsyncSession, group: Group) -> bool:
-    user_count, notion_count = await _count_group_members(db, group.id)
-    if user_count + notion_count > 0:
+    if await _count_group_members(db, group) > 0:
         return False
     if await _has_subgroups(db, group.id):
         return False
@@ -479,6 +576,7 @@ async def _delete_group_if_empty(db: AsyncSession, group: Group) -> bool:
     await db.execute(delete(NotionGroupMember).where(NotionGroupMember.group_id == group.id))
     await db.execute(delete(Group).where(Group.id == group.id))
     await db.commit()
+    group_index.remove(group.id)
     return True
 
 
@@ -530,6 +628,17 @@ def _build_file_url(request: Request, file_path: str) -> str:
     return _normalize_upload_url(file_path) or ""
 
 
+def _thumbnail_url(file_path: str) -> str | None:
+    normalized = _normalize_upload_url(file_path) or ""
+    if not normalized.startswith("/uploads/"):
+        return None
+    # 캡셔닝 단계에서 만든 저해상도 파생본이 있으면 썸네일로 쓴다.
+    disk_path = UPLOAD_ROOT / normalized[len("/uploads/"):]
+    if not derivative_path(disk_path).exists():
+        return None
+    return derivative_url(normalized)
+
+
 def _photo_response(photo: UserPhoto, request: Request) -> dict:
     file_path = photo.url
     return {
@@ -537,239 +646,15 @@ def _photo_response(photo: UserPhoto, request: Request) -> dict:
         "user_id": str(photo.user_id),
         "file_path": _normalize_upload_url(file_path) or "",
         "file_url": _build_file_url(request, file_path),
+        "thumbnail_url": _thumbnail_url(file_path),
         "uploaded_at": photo.created_at.isoformat() if photo.created_at else None,
     }
 
 
 async def _get_primary_photo_url(db: AsyncSession, user_id: uuid.UUID) -> str | None:
-    result = await db.execute(
-        select(UserPhoto.url).where(
-            UserPhoto.user_id == user_id,
-            UserPhoto.is_primary == True,  # noqa: E712
-        )
-    )
-    row = result.first()
-    return row[0] if row else None
+    return await get_primary_photo_url(db, user_id)
 
 
-async def _generate_caption_data(
-    disk_path: Path,
-    timeout_caption: int = 30,
-    timeout_translate: int = 15,
-    timeout_interest: int = 10,
-) -> tuple[str, str, str, str, list[str]]:
-    logger = logging.getLogger("uvicorn.error")
-    caption_raw_en = f"an uploaded image ({disk_path.name})"
-    caption_ko = caption_raw_en
-    model_name = "fallback"
-    model_version = "fallback"
-    if not is_blip_ready():
-        timeout_caption = max(timeout_caption, 180)
-        logger.info("Captioning warm-up detected, extending timeout to %ss", timeout_caption)
-
-    try:
-        logger.info("Captioning start image=%s", disk_path.name)
-        caption_task = asyncio.to_thread(caption_image, str(disk_path))
-        caption_raw_en, model_name, model_version = await asyncio.wait_for(
-            caption_task, timeout=timeout_caption
-        )
-        logger.info("Captioning done image=%s", disk_path.name)
-    except asyncio.TimeoutError:
-        logger.warning("Captioning timed out for %s", disk_path.name)
-    except Exception as exc:
-        logger.warning("Captioning failed for %s: %s", disk_path.name, exc)
-
-    try:
-        translate_task = translate_to_korean(caption_raw_en)
-        caption_ko = await asyncio.wait_for(translate_task, timeout=timeout_translate)
-    except asyncio.TimeoutError:
-        logger.warning("Translation timed out for %s", disk_path.name)
-        caption_ko = caption_raw_en
-    except Exception as exc:
-        logger.warning("Translation failed for %s: %s", disk_path.name, exc)
-        caption_ko = caption_raw_en
-
-    interest_tags: list[str] = []
-    try:
-        interest_task = infer_interest_tags(caption_ko)
-        interest_tags = await asyncio.wait_for(interest_task, timeout=timeout_interest)
-    except asyncio.TimeoutError:
-        logger.warning("Interest inference timed out for %s", disk_path.name)
-    except Exception as exc:
-        logger.warning("Interest inference failed for %s: %s", disk_path.name, exc)
-
-    if interest_tags:
-        caption_ko = f"{caption_ko} | 취미 추정: {', '.join(interest_tags)}"
-
-    return caption_raw_en, caption_ko, model_name, model_version, interest_tags
-
-
-async def _process_photo_captions(
-    user_id: str,
-    photo_jobs: list[tuple[uuid.UUID, Path]],
-    incoming_tags: list[str],
-    compute_embedding: bool,
-) -> None:
-    if not photo_jobs:
-        return
-    logger = logging.getLogger("uvicorn.error")
-    try:
-        async with AsyncSessionLocal() as session:
-            try:
-                user_uuid = uuid.UUID(user_id)
-            except ValueError:
-                logger.warning("Background captioning invalid user_id=%s", user_id)
-                return
-            result = await session.execute(
-                select(User.id, User.nickname, User.profile_data).where(User.id == user_uuid)
-            )
-            row = result.one_or_none()
-            if not row:
-                logger.warning("Background captioning missing user_id=%s", user_id)
-                return
-            _, user_nickname, user_profile_data = row
-            batch_captions: list[str] = []
-            suggested_tag_counts: Counter[str] = Counter()
-
-            for photo_id, disk_path in photo_jobs:
-                (
-                    caption_raw_en,
-                    caption_ko,
-                    caption_model_name,
-                    caption_model_version,
-                    interest_tags,
-                ) = await _generate_caption_data(disk_path)
-                if interest_tags:
-                    suggested_tag_counts.update(interest_tags)
-                batch_captions.append(caption_ko)
-                await upsert_image_caption(
-                    session,
-                    image_id=photo_id,
-                    caption_raw_en=caption_raw_en,
-                    caption_ko=caption_ko,
-                    model_name=caption_model_name,
-                    model_version=caption_model_version,
-                )
-
-            await session.commit()
-
-            if not compute_embedding:
-                return
-
-            selected_tags: set[str] = set(str(item) for item in incoming_tags if item)
-            if user_profile_data:
-                for key in ("tags", "interests", "photo_interests", "hobbies", "selected_tags"):
-                    value = user_profile_data.get(key)
-                    if isinstance(value, list):
-                        selected_tags.update(str(item) for item in value if item)
-
-            suggested_tags = [
-                tag for tag, _count in suggested_tag_counts.most_common()
-                if tag not in selected_tags
-            ][:5]
-            profile_data = dict(user_profile_data or {})
-            profile_data["suggested_tags"] = suggested_tags
-            await session.execute(
-                update(User)
-                .where(User.id == user_uuid)
-                .values(profile_data=profile_data)
-            )
-            await session.commit()
-
-            if batch_captions or selected_tags:
-                user_description = None
-                if user_profile_data:
-                    user_description = user_profile_data.get("bio") or user_profile_data.get("description")
-                unique_captions: list[str] = []
-                seen: set[str] = set()
-                for caption in batch_captions:
-                    if caption and caption not in seen:
-                        seen.add(caption)
-                        unique_captions.append(caption)
-                image_captions_for_embedding = unique_captions
-                final_text = build_final_text(
-                    selected_tags=list(selected_tags)[:10],
-                    user_description=user_description,
-                    image_captions=image_captions_for_embedding,
-                )
-                try:
-                    embedding, model_name, model_version = await embed_text(final_text)
-                except Exception as exc:
-                    logger.warning(
-                        "Embedding generation failed user_id=%s error=%s",
-                        user_id,
-                        exc,
-                    )
-                else:
-                    await deactivate_embeddings(session, user_uuid)
-                    await create_embedding(
-                        session,
-                        user_id=user_uuid,
-                        embedding=embedding,
-                    )
-                    await session.commit()
-                    log_embedding_io(
-                        user_name=user_nickname,
-                        user_id=str(user_uuid),
-                        input_text=final_text,
-                        image_captions=image_captions_for_embedding,
-                        image_tags=suggested_tags,
-                        embedding=embedding,
-                        model_name=model_name,
-                        model_version=model_version,
-                    )
-            if compute_embedding:
-                profile_data = dict(profile_data)
-                profile_data["captioning_status"] = "done"
-                await session.execute(
-                    update(User)
-                    .where(User.id == user_uuid)
-                    .values(profile_data=profile_data)
-                )
-                await session.commit()
-            logger.info(
-                "Background captioning completed user_id=%s count=%d",
-                user_id,
-                len(photo_jobs),
-            )
-    except Exception as exc:
-        logger.warning("Background captioning failed user_id=%s error=%s", user_id, exc)
-        if compute_embedding:
-            await _set_captioning_status(user_id, "failed")
-
-
-async def _set_captioning_status(user_id: str, status: str) -> None:
-    logger = logging.getLogger("uvicorn.error")
-    try:
-        async with AsyncSessionLocal() as session:
-            try:
-                user_uuid = uuid.UUID(user_id)
-            except ValueError:
-                logger.warning("Invalid user_id for captioning status: %s", user_id)
-                return
-            result = await session.execute(
-                select(User.profile_data).where(User.id == user_uuid)
-            )
-            row = result.one_or_none()
-            if not row:
-                logger.warning("Missing user for captioning status: %s", user_id)
-                return
-            profile_data = dict(row[0] or {})
-            profile_data["captioning_status"] = status
-            await session.execute(
-                update(User)
-                .where(User.id == user_uuid)
-                .values(profile_data=profile_data)
-            )
-            await session.commit()
-    except Exception as exc:
-        logger.warning(
-            "Failed to update captioning status user_id=%s status=%s error=%s",
-            user_id,
-            status,
-            exc,
-        )
-
 @app.get("/", tags=["system"])
 def read_root():
     return {"message": "Hello FastAPI"}
@@ -779,9 +664,42 @@ def health_check():
     return {
         "status": "healthy",
         "service": "InterestMap Backend",
-        "version": "1.0.0"
+        "version": "1.0.0",
+        "layout_cache": get_layout_cache().stats(),
+        "embedding_cache": embedding_cache.stats(),
+        "captioning": captioning_state(),
+        "caption_cache": caption_cache.stats(),
+        "embedding_log": embedding_log_writer.stats(),
+        "user_cache": user_cache_stats(),
     }
 
+
+@app.get("/ready", tags=["system"])
+async def readiness_check(db: AsyncSession = Depends(get_db)):
+    """로드밸런서용 readiness: DB 연결과 캡셔닝 모델 warm-up 완료 여부"""
+    checks: dict[str, str] = {}
+    try:
+        await db.execute(text("SELECT 1"))
+        checks["database"] = "ok"
+    except Exception as exc:
+        checks["database"] = f"error: {exc}"
+
+    caption_state = captioning_state()["state"]
+    if (
+        _captioning_warmup_expected()
+        and caption_state in ("cold", "warming")
+        and not captioning_ready()
+    ):
+        checks["captioning"] = str(caption_state)
+    else:
+        checks["captioning"] = "ok"
+
+    ready = all(value == "ok" for value in checks.values())
+    return JSONResponse(
+        status_code=200 if ready else 503,
+        content={"ready": ready, "checks": checks},
+    )
+
 # ==================== User APIs ====================
 
 @app.post("/api/users", response_model=UserResponse, tags=["users"])
@@ -803,6 +721,7 @@ async def create_user(request: UserCreateRequest, db: AsyncSession = Depends(get
             merged.update(request.profile_data)
             user.profile_data = merged
         await db.commit()
+        invalidate_user(user.id)
         await db.refresh(user)
         return _cache_user(user, is_new_user=False)
 
@@ -881,6 +800,7 @@ async def update_user(user_id: str, request: UserUpdateRequest, db: AsyncSession
         user.profile_data = merged
 
     await db.commit()
+    invalidate_user(user.id)
     await db.refresh(user)
     return _cache_user(user)
 
@@ -903,14 +823,8 @@ async def upload_user_profile_image(
     user_dir.mkdir(parents=True, exist_ok=True)
     
     disk_path = user_dir / f"profile_{photo_uuid}_{safe_name}"
-    
-    with disk_path.open("wb") as buffer:
-        while True:
-            chunk = file.file.read(1024 * 1024)
-            if not chunk:
-                break
-            buffer.write(chunk)
-            
+    await save_upload(file, disk_path)
+
     # 2. URL 생성 및 DB 업데이트
     file_path = f"/uploads/{user_id}/{disk_path.name}"
     full_url = _build_file_url(request, file_path)
@@ -918,6 +832,7 @@ async def upload_user_profile_image(
     user.profile_image_url = full_url
     
     await db.commit()
+    invalidate_user(user.id)
     await db.refresh(user)
     return _cache_user(user)
 
@@ -937,15 +852,7 @@ async def upload_photo(
     user_dir = UPLOAD_ROOT / user_id
     user_dir.mkdir(parents=True, exist_ok=True)
     disk_path = user_dir / f"{photo_id}_{safe_name}"
-    hasher = hashlib.sha256()
-    with disk_path.open("wb") as buffer:
-        while True:
-            chunk = file.file.read(1024 * 1024)
-            if not chunk:
-                break
-            buffer.write(chunk)
-            hasher.update(chunk)
-    content_hash = hasher.hexdigest()
+    content_hash = (await save_upload(file, disk_path)).content_hash
 
     file_path = f"/uploads/{user_id}/{disk_path.name}"
     file_url = _build_file_url(request, file_path)
@@ -964,6 +871,7 @@ async def upload_photo(
             if user.profile_image_url != existing_url:
                 user.profile_image_url = existing_url
                 await db.commit()
+                invalidate_user(user.id)
                 await db.refresh(user)
                 _cache_user(user)
             logger.info("Duplicate photo ignored user_id=%s hash=%s", user_id, content_hash)
@@ -986,20 +894,21 @@ async def upload_photo(
     )
     db.add(photo)
     user.profile_image_url = file_url
+    enqueue_caption_job(
+        db,
+        user_id=user.id,
+        photo_jobs=[(photo_id, disk_path)],
+        incoming_tags=[],
+        compute_embedding=False,
+    )
 
     await db.commit()
+    invalidate_user(user.id)
+    caption_workers.notify()
     await db.refresh(photo)
     await db.refresh(user)
     _cache_user(user)
     logger.info("Photo uploaded user_id=%s file=%s", user_id, disk_path.name)
-    asyncio.create_task(
-        _process_photo_captions(
-            user_id=user_id,
-            photo_jobs=[(photo_id, disk_path)],
-            incoming_tags=[],
-            compute_embedding=False,
-        )
-    )
     return _photo_response(photo, request)
 
 @app.post("/api/photos/batch", response_model=BatchPhotoUploadResponse, tags=["photos"])
@@ -1040,17 +949,7 @@ async def upload_photos_batch(
         safe_name = Path(file.filename or f"upload_{idx}").name
         photo_id = uuid.uuid4()
         disk_path = user_dir / f"{photo_id}_{safe_name}"
-        hasher = hashlib.sha256()
-        
-        with disk_path.open("wb") as buffer:
-            while True:
-                chunk = file.file.read(1024 * 1024)
-                if not chunk:
-                    break
-                buffer.write(chunk)
-                hasher.update(chunk)
-        
-        content_hash = hasher.hexdigest()
+        content_hash = (await save_upload(file, disk_path)).content_hash
         file_path = f"/uploads/{user_id}/{disk_path.name}"
         file_url = _build_file_url(request, file_path)
         
@@ -1095,8 +994,18 @@ async def upload_photos_batch(
         profile_data = dict(user.profile_data or {})
         profile_data["captioning_status"] = "processing"
         user.profile_data = profile_data
+        enqueue_caption_job(
+            db,
+            user_id=user.id,
+            photo_jobs=photo_jobs,
+            incoming_tags=incoming_tags,
+            compute_embedding=True,
+        )
 
     await db.commit()
+    invalidate_user(user.id)
+    if photo_jobs:
+        caption_workers.notify()
     
     # 모든 사진 refresh
     for photo_resp in uploaded_photos:
@@ -1109,16 +1018,6 @@ async def upload_photos_batch(
     await db.refresh(user)
     _cache_user(user)
     
-    if photo_jobs:
-        asyncio.create_task(
-            _process_photo_captions(
-                user_id=user_id,
-                photo_jobs=photo_jobs,
-                incoming_tags=incoming_tags,
-                compute_embedding=True,
-            )
-        )
-
     logger.info("Batch upload completed user_id=%s count=%d", user_id, len(uploaded_photos))
     return BatchPhotoUploadResponse(
         photos=uploaded_photos,
@@ -1177,55 +1076,64 @@ async def create_group(request: GroupCreateRequest, db: AsyncSession = Depends(g
             role="owner",
         )
     )
+    await update_group_embedding(db, group.id, added=_to_float_vector(creator.embedding))
     await db.commit()
     await db.refresh(group)
-    await _recompute_group_embedding(db, group)
     return _group_response(group, [creator.id])
 
+def _group_filters(tags: list[str], region: str | None, is_public: bool | None) -> GroupFilters:
+    return GroupFilters(tags=[tag.strip() for tag in tags if tag.strip()], region=region or None, is_public=is_public)
+
+
+async def _group_list_page(db: AsyncSession, response: Response, **kwargs) -> list[dict]:
+    try:
+        page = await list_groups_with_members(db, **kwargs)
+    except InvalidCursor as exc:
+        raise HTTPException(status_code=400, detail="Invalid cursor") from exc
+    if page.next_cursor:
+        response.headers["X-Next-Cursor"] = page.next_cursor
+    return [_group_response(row.group, row.member_ids) for row in page.rows]
+
+
 @app.get("/api/groups", response_model=List[GroupResponse], tags=["groups"])
-async def list_groups(db: AsyncSession = Depends(get_db)):
-    """모든 그룹 목록 조회"""
-    result = await db.execute(select(Group).where(Group.is_subgroup == False))  # noqa: E712
-    groups = result.scalars().all()
-    responses: list[dict] = []
-    for group in groups:
-        member_ids = await _get_all_group_member_ids(db, group.id)
-        responses.append(_group_response(group, member_ids))
-    return responses
+async def list_groups(
+    response: Response,
+    tags: List[str] = Query([]),
+    region: str | None = Query(None),
+    is_public: bool | None = Query(None),
+    after: str | None = Query(None),
+    limit: int | None = Query(None, ge=1, le=200),
+    db: AsyncSession = Depends(get_db),
+):
+    """모든 그룹 목록 조회 (limit 을 주면 created_at 순 페이지, 다음 커서는 X-Next-Cursor 헤더)"""
+    return await _group_list_page(
+        db,
+        response,
+        filters=_group_filters(tags, region, is_public),
+        after=after,
+        limit=limit,
+    )
 
 @app.get("/api/groups/user/{user_id}", response_model=List[GroupResponse], tags=["groups"])
-async def get_user_groups(user_id: str, db: AsyncSession = Depends(get_db)):
+async def get_user_groups(
+    user_id: str,
+    response: Response,
+    tags: List[str] = Query([]),
+    region: str | None = Query(None),
+    is_public: bool | None = Query(None),
+    after: str | None = Query(None),
+    limit: int | None = Query(None, ge=1, le=200),
+    db: AsyncSession = Depends(get_db),
+):
     """사용자가 속한 그룹 목록 조회"""
+    page_args = dict(filters=_group_filters(tags, region, is_public), after=after, limit=limit)
     if _is_master_user(user_id):
-        result = await db.execute(select(Group).where(Group.is_subgroup == False))  # noqa: E712
-        groups = result.scalars().all()
-        responses: list[dict] = []
-        for group in groups:
-            member_ids = await _get_all_group_member_ids(db, group.id)
-            responses.append(_group_response(group, member_ids))
-        return responses
+        return await _group_list_page(db, response, **page_args)
 
     user = await _get_user_by_id(db, user_id)
     if _is_spectator_user(user):
-        result = await db.execute(select(Group).where(Group.is_subgroup == False))  # noqa: E712
-        groups = result.scalars().all()
-        responses: list[dict] = []
-        for group in groups:
-            member_ids = await _get_all_group_member_ids(db, group.id)
-            responses.append(_group_response(group, member_ids))
-        return responses
-    result = await db.execute(
-        select(Group)
-        .join(GroupMember, GroupMember.group_id == Group.id)
-        .where(GroupMember.user_id == user.id, Group.is_subgroup == False)  # noqa: E712
-    )
-    group_by_id = {group.id: group for group in result.scalars().all()}
-
-    responses: list[dict] = []
-    for group in group_by_id.values():
-        member_ids = await _get_all_group_member_ids(db, group.id)
-        responses.append(_group_response(group, member_ids))
-    return responses
+        return await _group_list_page(db, response, **page_args)
+    return await _group_list_page(db, response, member_user_id=user.id, **page_args)
 
 
 @app.get(
@@ -1236,9 +1144,19 @@ async def get_user_groups(user_id: str, db: AsyncSession = Depends(get_db)):
 async def search_groups(
     current_user_id: str | None = Query(None),
     limit: int = Query(40, ge=1, le=200),
+    after: str | None = Query(None),
+    tags: List[str] = Query([]),
+    region: str | None = Query(None),
     db: AsyncSession = Depends(get_db),
 ):
-    """추천 순으로 그룹을 가져오되 사용자가 속한 그룹은 제외"""
+    """추천 순으로 그룹을 가져오되 사용자가 속한 그룹은 제외 (after: 이전 응답의 nextCursor)"""
+    after_key: tuple[float | None, uuid.UUID] | None = None
+    if after:
+        try:
+            after_key = decode_score_cursor(after)
+        except InvalidCursor as exc:
+            raise HTTPException(status_code=400, detail="Invalid cursor") from exc
+    filters = _group_filters(tags, region, None)
     user_uuid: uuid.UUID | None = None
     user_embedding: list[float] | None = None
     if current_user_id:
@@ -1250,10 +1168,6 @@ async def search_groups(
             user_uuid = None
             user_embedding = None
 
-    group_result = await db.execute(select(Group).where(Group.is_subgroup == False))  # noqa: E712
-    groups = group_result.scalars().all()
-    group_ids = [group.id for group in groups]
-
     exclude_group_ids: set[uuid.UUID] = set()
     if user_uuid:
         member_result = await db.execute(
@@ -1261,64 +1175,72 @@ async def search_groups(
         )
         exclude_group_ids = {row[0] for row in member_result.all()}
 
-    member_counts: dict[uuid.UUID, int] = {}
-    if group_ids:
-        user_counts = await db.execute(
-            select(GroupMember.group_id, func.count())
-            .where(GroupMember.group_id.in_(group_ids))
-            .group_by(GroupMember.group_id)
+    if user_embedding and vector_storage_enabled():
+        ranked = await search_similar_groups(
+            db,
+            user_embedding,
+            limit=limit + 1,
+            exclude_member_id=user_uuid,
+            after=after_key,
+            tags=filters.tags,
+            region=filters.region,
         )
-        member_counts.update({row[0]: row[1] for row in user_counts.all()})
+    else:
+        index = await ensure_group_index(db)
+        if after_key is not None and after_key[0] is None:
+            ranked = []
+        else:
+            ranked = index.top_k(
+                user_embedding,
+                limit + 1,
+                exclude=exclude_group_ids,
+                after=after_key,
+                filters=filters,
+            )
 
-        notion_counts = await db.execute(
-            select(NotionGroupMember.group_id, func.count())
-            .where(NotionGroupMember.group_id.in_(group_ids))
-            .group_by(NotionGroupMember.group_id)
-        )
-        for group_id, count in notion_counts.all():
-            member_counts[group_id] = member_counts.get(group_id, 0) + count
+    next_cursor: str | None = None
+    if len(ranked) > limit:
+        ranked = ranked[:limit]
+        last_id, last_score = ranked[-1]
+        next_cursor = encode_score_cursor(last_score, last_id)
+
+    ranked_scores = dict(ranked)
+    group_result = await db.execute(select(Group).where(Group.id.in_(list(ranked_scores))))
+    group_by_id = {group.id: group for group in group_result.scalars().all()}
 
     items: list[GroupSearchItem] = []
-    for group in groups:
-        if group.id in exclude_group_ids:
+    for group_id, score in ranked:
+        group = group_by_id.get(group_id)
+        if group is None or group.id in exclude_group_ids:
             continue
         profile = group.group_profile or {}
-        if not bool(profile.get("is_public", True)):
+        if not is_public_profile(profile):
             continue
 
-        if group.embedding is None and group.embedding_updated_at is None:
-            await _recompute_group_embedding(db, group)
-            await db.refresh(group)
-
-        group_vector = _to_float_vector(group.embedding if group.embedding else None)
-        match_score = _cosine_similarity(user_embedding, group_vector)
+        match_score = score or 0.0
 
         raw_tags = profile.get("tags") or profile.get("interests") or []
         tags = [str(tag) for tag in raw_tags] if isinstance(raw_tags, list) else []
         region = profile.get("region") or ""
         image_url = _normalize_upload_url(profile.get("image_url")) or ""
         icon_type = profile.get("icon_type") or ""
-        member_count = member_counts.get(group.id, 0)
 
         items.append(
             GroupSearchItem(
                 id=str(group.id),
                 name=group.name,
                 description=group.description,
-                memberCount=member_count,
+                memberCount=group.member_count,
                 tags=tags,
                 region=region,
                 imageUrl=image_url,
                 iconType=icon_type,
-                isPublic=bool(profile.get("is_public", True)),
+                isPublic=is_public_profile(profile),
                 matchScore=match_score,
             )
         )
 
-    items.sort(key=lambda item: item.matchScore, reverse=True)
-    if limit and len(items) > limit:
-        items = items[:limit]
-    return GroupSearchResponse(items=items)
+    return GroupSearchResponse(items=items, nextCursor=next_cursor)
 
 @app.post("/api/groups/{group_id}/members", response_model=GroupResponse, tags=["groups"])
 async def add_group_member(
@@ -1350,8 +1272,9 @@ async def add_group_member(
         existing = result.scalar_one_or_none()
         if not existing:
             db.add(GroupMember(group_id=group.id, user_id=user.id, role="member"))
+            await update_group_embedding(db, group.id, added=_to_float_vector(user.embedding))
             await db.commit()
-            await _recompute_group_embedding(db, group)
+            layout_scheduler.schedule(group.id)
     elif notion_user:
         result = await db.execute(
             select(NotionGroupMember).where(
@@ -1368,8 +1291,11 @@ async def add_group_member(
                     role="member",
                 )
             )
+            await update_group_embedding(
+                db, group.id, added=_to_float_vector(notion_user.embedding)
+            )
             await db.commit()
-            await _recompute_group_embedding(db, group)
+            layout_scheduler.schedule(group.id)
 
     member_ids = await _get_all_group_member_ids(db, group.id)
     return _group_response(group, member_ids)
@@ -1459,6 +1385,7 @@ async def create_subgroups(
                         role="member",
                     )
                 )
+        await update_group_embedding(db, subgroup.id, full=True)
 
         responses.append(
             SubgroupItemResponse(
@@ -1470,6 +1397,8 @@ async def create_subgroups(
         )
 
     await db.commit()
+    for response in responses:
+        layout_scheduler.schedule(response.id)
     return responses
 
 @app.delete("/api/groups/{group_id}/members/{user_id}", tags=["groups"])
@@ -1482,12 +1411,14 @@ async def remove_group_member(group_id: str, user_id: str, db: AsyncSession = De
         user.id,
         group.id,
     )
-    await db.execute(
+    removed = await db.execute(
         delete(GroupMember).where(
             GroupMember.group_id == group.id,
             GroupMember.user_id == user.id,
         )
     )
+    if removed.rowcount:
+        await update_group_embedding(db, group.id, removed=_to_float_vector(user.embedding))
     await db.commit()
     deleted = await _delete_group_if_empty(db, group)
     if deleted:
@@ -1498,7 +1429,7 @@ async def remove_group_member(group_id: str, user_id: str, db: AsyncSession = De
         )
         return {"message": "Member removed successfully"}
 
-    await _recompute_group_embedding(db, group)
+    layout_scheduler.schedule(group.id)
     logging.getLogger("uvicorn.error").info(
         "Remove group member completed user_id=%s group_id=%s",
         user.id,
@@ -1576,6 +1507,7 @@ async def create_group_message_public(
         )
         if existing.scalar_one_or_none() is None:
             db.add(GroupMember(group_id=group.id, user_id=user.id, role="member"))
+            await update_group_embedding(db, group.id, added=_to_float_vector(user.embedding))
             await db.commit()
     else:
         existing = await db.execute(
@@ -1592,6 +1524,9 @@ async def create_group_message_public(
                     role="member",
                 )
             )
+            await update_group_embedding(
+                db, group.id, added=_to_float_vector(notion_user.embedding)
+            )
             await db.commit()
 
     message = GroupMessage(
@@ -1647,6 +1582,7 @@ async def create_group_image_message_public(
         )
         if existing.scalar_one_or_none() is None:
             db.add(GroupMember(group_id=group.id, user_id=user.id, role="member"))
+            await update_group_embedding(db, group.id, added=_to_float_vector(user.embedding))
             await db.commit()
     else:
         existing = await db.execute(
@@ -1663,19 +1599,16 @@ async def create_group_image_message_public(
                     role="member",
                 )
             )
+            await update_group_embedding(
+                db, group.id, added=_to_float_vector(notion_user.embedding)
+            )
             await db.commit()
 
     safe_name = Path(file.filename or "group_message").name
     group_dir = UPLOAD_ROOT / "groups" / group_id / "messages"
     group_dir.mkdir(parents=True, exist_ok=True)
     disk_path = group_dir / f"{uuid.uuid4()}_{safe_name}"
-
-    with disk_path.open("wb") as buffer:
-        while True:
-            chunk = file.file.read(1024 * 1024)
-            if not chunk:
-                break
-            buffer.write(chunk)
+    await save_upload(file, disk_path)
 
     file_path = f"/uploads/groups/{group_id}/messages/{disk_path.name}"
     file_url = _build_file_url(request, file_path)
@@ -1709,28 +1642,18 @@ async def create_group_image_message_public(
 @app.get("/api/groups/{group_id}/detail", response_model=GroupDetailResponse, tags=["groups"])
 async def get_group_detail(group_id: str, db: AsyncSession = Depends(get_db)):
     group = await _get_group_by_id(db, group_id)
-    result = await db.execute(
-        select(func.count()).select_from(GroupMember).where(GroupMember.group_id == group.id)
-    )
-    member_count = result.scalar() or 0
-    notion_result = await db.execute(
-        select(func.count())
-        .select_from(NotionGroupMember)
-        .where(NotionGroupMember.group_id == group.id)
-    )
-    member_count += notion_result.scalar() or 0
     created_at = group.created_at.isoformat() if group.created_at else ""
     updated_at = created_at
     profile = group.group_profile or {}
     image_url = _normalize_upload_url(profile.get("image_url")) or ""
     icon_type = profile.get("icon_type") or ""
-    is_public = bool(profile.get("is_public", True))
+    is_public = is_public_profile(profile)
     return GroupDetailResponse(
         id=str(group.id),
         name=group.name,
         description=group.description,
         iconType=icon_type,
-        memberCount=member_count,
+        memberCount=group.member_count,
         isPublic=is_public,
         createdByUserId=str(group.created_by) if group.created_by else "",
         createdAt=created_at,
@@ -1752,13 +1675,7 @@ async def upload_group_profile_image(
     group_dir = UPLOAD_ROOT / "groups" / group_id
     group_dir.mkdir(parents=True, exist_ok=True)
     disk_path = group_dir / f"{uuid.uuid4()}_{safe_name}"
-
-    with disk_path.open("wb") as buffer:
-        while True:
-            chunk = file.file.read(1024 * 1024)
-            if not chunk:
-                break
-            buffer.write(chunk)
+    await save_upload(file, disk_path)
 
     file_path = f"/uploads/groups/{group_id}/{disk_path.name}"
     file_url = _build_file_url(request, file_path)
@@ -1768,6 +1685,7 @@ async def upload_group_profile_image(
     group.group_profile = profile
     await db.commit()
     await db.refresh(group)
+    refresh_group_visibility_in_index(group)
 
     member_ids = await _get_all_group_member_ids(db, group.id)
     return _group_response(group, member_ids)
@@ -1794,9 +1712,8 @@ async def get_group_embeddings(
     db: AsyncSession = Depends(get_db),
 ):
     group = await _get_group_by_id(db, group_id)
-    member_ids = await _get_group_member_ids(db, group.id)
-    notion_member_ids = await _get_notion_member_ids(db, group.id)
-    if not member_ids and not notion_member_ids:
+    members = await list_group_members(db, group.id)
+    if not members:
         if not current_user_id:
             raise HTTPException(status_code=404, detail="Group has no members")
         try:
@@ -1832,165 +1749,83 @@ async def get_group_embeddings(
             nodePositions=node_positions,
         )
 
+    member_by_id = {member.member_id: member for member in members}
+    user_member_ids = [member.member_id for member in members if not member.is_notion]
+
     current_uuid: uuid.UUID | None = None
     if current_user_id:
         try:
-            candidate = uuid.UUID(current_user_id)
+            current_uuid = uuid.UUID(current_user_id)
         except ValueError:
-            candidate = None
-        if candidate and (candidate in member_ids or candidate in notion_member_ids):
-            current_uuid = candidate
-        elif candidate:
-            current_uuid = candidate
+            current_uuid = None
     if current_uuid is None:
-        if group.created_by and group.created_by in member_ids:
+        if group.created_by and group.created_by in user_member_ids:
             current_uuid = group.created_by
         else:
-            current_uuid = member_ids[0] if member_ids else None
-    if current_uuid is None and notion_member_ids:
-        current_uuid = notion_member_ids[0]
-
-    if current_uuid is None:
-        raise HTTPException(status_code=404, detail="Group has no user members")
-
-    result = await db.execute(select(User).where(User.id.in_(member_ids)))
-    users = {user.id: user for user in result.scalars().all()}
+            current_uuid = members[0].member_id
 
-    notion_users: dict[uuid.UUID, NotionUser] = {}
-    if notion_member_ids:
-        notion_result = await db.execute(
-            select(NotionUser).where(NotionUser.id.in_(notion_member_ids))
-        )
-        notion_users = {user.id: user for user in notion_result.scalars().all()}
-
-    def _build_embedding(user_id: uuid.UUID) -> UserEmbeddingResponse:
-        user = users.get(user_id)
-        if not user:
-            return UserEmbeddingResponse(
-                userId=str(user_id),
-                userName="",
-                profileImageUrl=None,
-                embeddingVector=_embedding_vector_or_zero(None),
-            )
-        vector = _embedding_vector_or_zero(user.embedding if user.embedding else None)
+    def _build_embedding(member) -> UserEmbeddingResponse:
         return UserEmbeddingResponse(
-            userId=str(user.id),
-            userName=user.nickname or "",
-            profileImageUrl=_normalize_upload_url(user.profile_image_url),
-            embeddingVector=vector,
+            userId=str(member.member_id),
+            userName=member.nickname or "",
+            profileImageUrl=_normalize_upload_url(member.profile_image_url),
+            embeddingVector=_embedding_vector_or_zero(member.embedding or None),
             activityStatus="활동중",
         )
 
-    async def _build_current_embedding(user_id: uuid.UUID) -> UserEmbeddingResponse:
-        user = users.get(user_id)
-        if user:
-            vector = _embedding_vector_or_zero(user.embedding if user.embedding else None)
-            return UserEmbeddingResponse(
-                userId=str(user.id),
-                userName=user.nickname or "",
-                profileImageUrl=_normalize_upload_url(user.profile_image_url),
-                embeddingVector=vector,
-                activityStatus="활동중",
-            )
-        notion_user = notion_users.get(user_id)
-        if notion_user:
-            vector = _embedding_vector_or_zero(
-                notion_user.embedding if notion_user.embedding else None
-            )
-            return UserEmbeddingResponse(
-                userId=str(notion_user.id),
-                userName=notion_user.nickname or "",
-                profileImageUrl=_normalize_upload_url(notion_user.profile_image_url),
-                embeddingVector=vector,
-                activityStatus="활동중",
-            )
-        fetched_user = await _get_user_by_id(db, str(user_id))
-        vector = _embedding_vector_or_zero(
-            fetched_user.embedding if fetched_user.embedding else None
+    member_inputs = [
+        GroupMapInput(
+            user_id=str(member.member_id),
+            embedding=list(member.embedding) if member.embedding else None,
+            updated_at=member.embedding_updated_at,
         )
-        return UserEmbeddingResponse(
+        for member in members
+    ]
+
+    positions = await resolve_group_map_positions(str(group.id), member_inputs)
+
+    current_member = member_by_id.get(current_uuid)
+    if current_member is not None:
+        current_embedding = _build_embedding(current_member)
+    else:
+        fetched_user = await _get_user_by_id(db, str(current_uuid))
+        current_embedding = UserEmbeddingResponse(
             userId=str(fetched_user.id),
             userName=fetched_user.nickname or "",
             profileImageUrl=_normalize_upload_url(fetched_user.profile_image_url),
-            embeddingVector=vector,
+            embeddingVector=_embedding_vector_or_zero(
+                fetched_user.embedding if fetched_user.embedding else None
+            ),
             activityStatus="활동중",
         )
+    other_embeddings = [
+        _build_embedding(member) for member in members if member.member_id != current_uuid
+    ]
 
-    member_inputs = []
-    for member_id in member_ids:
-        user = users.get(member_id)
-        member_inputs.append(
-            GroupMapInput(
-                user_id=str(member_id),
-                embedding=list(user.embedding) if user and user.embedding else None,
-                updated_at=user.embedding_updated_at if user else None,
-            )
-        )
-    for member_id in notion_member_ids:
-        user = notion_users.get(member_id)
-        member_inputs.append(
-            GroupMapInput(
-                user_id=str(member_id),
-                embedding=list(user.embedding) if user and user.embedding else None,
-                updated_at=user.embedding_updated_at if user else None,
-            )
-        )
-
-    positions = build_group_map_positions(str(group.id), member_inputs)
-
-    current_embedding = await _build_current_embedding(current_uuid)
-    other_embeddings = []
-    for member_id in member_ids:
-        if member_id == current_uuid:
-            continue
-        other_embeddings.append(_build_embedding(member_id))
-    for member_id in notion_member_ids:
-        if member_id == current_uuid:
-            continue
-        user = notion_users.get(member_id)
-        if not user:
-            continue
-        vector = _embedding_vector_or_zero(user.embedding if user.embedding else None)
-        other_embeddings.append(
-            UserEmbeddingResponse(
-                userId=str(user.id),
-                userName=user.nickname or "",
-                profileImageUrl=_normalize_upload_url(user.profile_image_url),
-                embeddingVector=vector,
-                activityStatus="활동중",
-            )
-        )
-
-    current_user = users.get(current_uuid)
-    current_notion_user = notion_users.get(current_uuid)
-    current_vector_source = None
-    if current_user:
-        current_vector_source = current_user.embedding
-    elif current_notion_user:
-        current_vector_source = current_notion_user.embedding
-    current_vector = list(current_vector_source) if current_vector_source else None
+    current_vector = (
+        list(current_member.embedding)
+        if current_member is not None and current_member.embedding
+        else None
+    )
 
     node_positions = []
-    for member_id in member_ids + notion_member_ids:
-        user = users.get(member_id)
-        notion_user = notion_users.get(member_id)
-        vector_source = user.embedding if user else (notion_user.embedding if notion_user else None)
-        vector = list(vector_source) if vector_source else None
+    for member in members:
+        vector = list(member.embedding) if member.embedding else None
         similarity = _cosine_similarity(current_vector, vector)
         distance = 1.0 - similarity
-        pos = positions.get(str(member_id))
+        pos = positions.get(str(member.member_id))
         if pos is None:
             pos = (195.0, 260.0)
         node_positions.append(
             GraphNodePositionResponse(
-                userId=str(member_id),
+                userId=str(member.member_id),
                 x=pos[0],
                 y=pos[1],
                 distance=distance,
                 similarityScore=similarity,
             )
         )
-    if current_uuid not in member_ids and current_uuid not in notion_member_ids:
+    if current_member is None:
         node_positions.append(
             GraphNodePositionResponse(
                 userId=str(current_uuid),
@@ -2129,6 +1964,8 @@ async def generate_embedding(
         embedding=embedding,
     )
     await db.commit()
+    invalidate_user(user.id)
+    layout_scheduler.schedule_for_user(user.id)
 
     user_name = user.nickname or request.nickname
     log_embedding_io(
@@ -2168,6 +2005,8 @@ async def generate_embedding_from_text(
         embedding=embedding,
     )
     await db.commit()
+    invalidate_user(user.id)
+    layout_scheduler.schedule_for_user(user.id)
 
     log_embedding_io(
         user_name=user.nickname,
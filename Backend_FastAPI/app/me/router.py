@@ -10,10 +10,12 @@ from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.deps import get_current_user
+from app.core.user_cache import get_primary_photo_url, invalidate_user
 from app.db.session import get_db
 from app.models.photo import UserPhoto
 from app.models.user import User
 from app.services.embedding.composer import build_final_text
+from app.services.embedding.layout_scheduler import layout_scheduler
 from app.services.embedding.openai_embed import embed_text, MODEL_NAME
 from app.services.embedding.repo import (
     create_embedding,
@@ -49,13 +51,7 @@ def _normalize_upload_url(value: str | None) -> str | None:
 
 
 async def _get_primary_photo_url(db: AsyncSession, user_id: uuid.UUID) -> str | None:
-    result = await db.execute(
-        select(UserPhoto.url).where(
-            UserPhoto.user_id == user_id,
-            UserPhoto.is_primary == True,  # noqa: E712
-        )
-    )
-    return result.scalar_one_or_none()
+    return await get_primary_photo_url(db, user_id)
 
 
 @router.get("/me", response_model=MeResponse)
@@ -108,6 +104,9 @@ async def update_me(
     current_user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
 ):
+    # 캡션 작업이 다른 프로세스에서 photo_interests/captioning_status 를 쓰므로
+    # 행을 잠그고 다시 읽은 뒤 병합한다.
+    await db.refresh(current_user, with_for_update=True)
     if payload.nickname is not None:
         current_user.nickname = payload.nickname
 
@@ -117,6 +116,7 @@ async def update_me(
         current_user.profile_data = current_data
 
     await db.commit()
+    invalidate_user(current_user.id)
     return OkResponse(ok=True)
 
 
@@ -161,6 +161,7 @@ async def add_photo(
             },
         )
 
+    invalidate_user(current_user.id)
     await db.refresh(photo)
     return MePhoto(
         id=str(photo.id),
@@ -200,6 +201,7 @@ async def update_photo_order(
         )
 
     await db.commit()
+    invalidate_user(current_user.id)
     return OkResponse(ok=True)
 
 
@@ -227,6 +229,7 @@ async def set_primary_photo(
     photo.is_primary = True
 
     await db.commit()
+    invalidate_user(current_user.id)
     primary_photo_url = await _get_primary_photo_url(db, current_user.id)
 
     return {"ok": True, "primary_photo_url": _normalize_upload_url(primary_photo_url)}
@@ -247,6 +250,7 @@ async def delete_photo(
         raise HTTPException(status_code=404, detail="Photo not found")
 
     await db.commit()
+    invalidate_user(current_user.id)
     return OkResponse(ok=True)
 
 
@@ -279,6 +283,8 @@ async def rebuild_embedding(
         embedding=vector,
     )
     await db.commit()
+    invalidate_user(current_user.id)
+    layout_scheduler.schedule_for_user(current_user.id)
 
     return EmbeddingResponse(
         ok=True,
@@ -5,6 +5,10 @@ from app.models.notion_group_member import NotionGroupMember
 from app.models.photo import UserPhoto
 from app.models.message import GroupMessage
 from app.models.image_caption import ImageCaption
+from app.models.group_map_layout import GroupMapLayout
+from app.models.embedding_cache import EmbeddingCacheEntry
+from app.models.caption_job import CaptionJob
+from app.models.caption_cache import CaptionCacheEntry
 
 __all__ = [
     "User",
@@ -15,4 +19,8 @@ __all__ = [
     "UserPhoto",
     "GroupMessage",
     "ImageCaption",
+    "GroupMapLayout",
+    "EmbeddingCacheEntry",
+    "CaptionJob",
+    "CaptionCacheEntry",
 ]
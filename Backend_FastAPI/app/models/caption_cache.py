@@ -0,0 +1,38 @@
+"""
+DB: caption_cache
+- content_hash (VARCHAR(64), PK)          # user_photos.content_hash (업로드 파일 SHA-256)
+- caption_model (VARCHAR(80), PK)         # 예: "blip-base", "blip-base-onnx"
+- translation_model (VARCHAR(80), PK)     # 예: "gpt-4o-mini" (API 키 없으면 "none")
+- caption_raw_en (TEXT, NOT NULL)
+- caption_ko (TEXT, NOT NULL)             # 취미 추정 suffix 포함 최종 문자열
+- interest_tags (JSONB, NOT NULL, default=[])
+- model_version (VARCHAR(40), NULL)
+- created_at (timestamptz, NOT NULL, default=now())
+- last_used_at (timestamptz, NOT NULL, default=now())
+"""
+
+from sqlalchemy import DateTime, String, Text, func
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.base import Base
+
+
+class CaptionCacheEntry(Base):
+    __tablename__ = "caption_cache"
+
+    content_hash: Mapped[str] = mapped_column(String(64), primary_key=True)
+    caption_model: Mapped[str] = mapped_column(String(80), primary_key=True)
+    translation_model: Mapped[str] = mapped_column(String(80), primary_key=True)
+
+    caption_raw_en: Mapped[str] = mapped_column(Text, nullable=False)
+    caption_ko: Mapped[str] = mapped_column(Text, nullable=False)
+    interest_tags: Mapped[list[str]] = mapped_column(JSONB, nullable=False, default=list)
+    model_version: Mapped[str | None] = mapped_column(String(40), nullable=True)
+
+    created_at: Mapped[DateTime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False
+    )
+    last_used_at: Mapped[DateTime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False
+    )
@@ -0,0 +1,56 @@
+"""
+DB: caption_jobs
+- id (UUID, PK)
+- user_id (UUID, FK -> users.id, NOT NULL)
+- payload (JSONB, NOT NULL)               # {"photos": [{"photo_id", "path"}], "incoming_tags": [...]}
+- compute_embedding (BOOLEAN, NOT NULL, default=false)
+- status (VARCHAR(16), NOT NULL, default="pending")  # pending | running | done | failed
+- attempts (INTEGER, NOT NULL, default=0)
+- last_error (TEXT, NULL)
+- run_after (timestamptz, NOT NULL, default=now())   # 재시도 backoff 이후 실행 시각
+- locked_at (timestamptz, NULL)           # running 으로 가져간 시각 (lease 만료 판단용)
+- created_at (timestamptz, NOT NULL, default=now())
+- updated_at (timestamptz, NOT NULL, default=now())
+
+Constraints / Indexes
+- INDEX(status, run_after)                # SKIP LOCKED claim 용
+"""
+
+import uuid
+
+from sqlalchemy import Boolean, DateTime, ForeignKey, Index, Integer, String, Text, func
+from sqlalchemy.dialects.postgresql import JSONB, UUID
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.base import Base
+
+
+class CaptionJob(Base):
+    __tablename__ = "caption_jobs"
+    __table_args__ = (
+        Index("ix_caption_jobs_status_run_after", "status", "run_after"),
+    )
+
+    id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    user_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
+        ForeignKey("users.id", ondelete="CASCADE"),
+        nullable=False,
+    )
+    payload: Mapped[dict] = mapped_column(JSONB, nullable=False, default=dict)
+    compute_embedding: Mapped[bool] = mapped_column(Boolean, nullable=False, default=False)
+
+    status: Mapped[str] = mapped_column(String(16), nullable=False, default="pending")
+    attempts: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    last_error: Mapped[str | None] = mapped_column(Text, nullable=True)
+
+    run_after: Mapped[DateTime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False
+    )
+    locked_at: Mapped[DateTime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    created_at: Mapped[DateTime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False
+    )
+    updated_at: Mapped[DateTime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False
+    )
@@ -0,0 +1,40 @@
+"""
+DB: embedding_cache
+- model_name (VARCHAR(128), PK)
+- dimensions (INTEGER, PK)                # 요청한 차원 수 (모델 기본값이면 0)
+- source_hash (VARCHAR(64), PK)           # composer.compute_source_hash(final_text)
+- embedding (JSONB, NOT NULL)
+- model_version (VARCHAR(64), NULL)
+- created_at (timestamptz, NOT NULL, default=now())
+- last_used_at (timestamptz, NOT NULL, default=now())
+
+Constraints / Indexes
+- PK(model_name, dimensions, source_hash)
+- INDEX(last_used_at)                     # LRU 방식 eviction 용
+"""
+
+from sqlalchemy import DateTime, Index, Integer, String, func
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.base import Base
+
+
+class EmbeddingCacheEntry(Base):
+    __tablename__ = "embedding_cache"
+    __table_args__ = (
+        Index("ix_embedding_cache_last_used", "last_used_at"),
+    )
+
+    model_name: Mapped[str] = mapped_column(String(128), primary_key=True)
+    dimensions: Mapped[int] = mapped_column(Integer, primary_key=True)
+    source_hash: Mapped[str] = mapped_column(String(64), primary_key=True)
+    embedding: Mapped[list[float]] = mapped_column(JSONB, nullable=False)
+    model_version: Mapped[str | None] = mapped_column(String(64), nullable=True)
+
+    created_at: Mapped[DateTime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False
+    )
+    last_used_at: Mapped[DateTime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False
+    )
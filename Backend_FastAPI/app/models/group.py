@@ -6,11 +6,16 @@ DB: groups
 - created_by (UUID, FK -> users.id, NULL)   # seed group이면 NULL도 가능
 - group_profile (JSONB, NOT NULL, default={})  # 그룹 취향/성격 데이터
 - embedding (JSONB, NULL)  # 평균화된 그룹 임베딩
+- embedding_vec (vector(1024), NULL)  # EMBEDDING_STORAGE=pgvector 일 때만, HNSW 인덱스
 - embedding_updated_at (timestamptz, NULL)  # 마지막 갱신 시각
+- embedding_sum (JSONB, NULL)  # 임베딩 있는 멤버 벡터 합 (NULL이면 아직 미집계, startup 에서 backfill)
+- embedding_count (INTEGER, NOT NULL, default=0)  # embedding_sum에 더해진 멤버 수
+- member_count (INTEGER, NOT NULL, default=0)  # group_members + notion_group_members 수 (DB 트리거가 유지)
 - is_subgroup (BOOLEAN, NOT NULL, default=false)
 - parent_group_id (UUID, FK -> groups.id, NULL)
 - subgroup_index (INTEGER, NULL)
 - created_at (timestamptz, NOT NULL, default=now())
+- search_updated_at (timestamptz, NULL)  # group_profile/embedding/is_subgroup 변경 시각 (DB 트리거가 유지)
 
 DB: group_members
 - group_id (UUID, PK, FK -> groups.id)
@@ -45,6 +50,14 @@ class Group(Base):
     embedding_updated_at: Mapped[DateTime | None] = mapped_column(
         DateTime(timezone=True), nullable=True
     )
+    # 앱에서 만든 그룹은 생성 시점부터 합계를 증분으로 유지하므로 빈 합계로 시작한다.
+    embedding_sum: Mapped[list[float] | None] = mapped_column(JSONB, nullable=True, default=list)
+    embedding_count: Mapped[int] = mapped_column(
+        Integer, nullable=False, default=0, server_default="0"
+    )
+    member_count: Mapped[int] = mapped_column(
+        Integer, nullable=False, default=0, server_default="0"
+    )
     is_subgroup: Mapped[bool] = mapped_column(Boolean, nullable=False, default=False)
     parent_group_id: Mapped[uuid.UUID | None] = mapped_column(
         UUID(as_uuid=True), ForeignKey("groups.id"), nullable=True
@@ -54,6 +67,10 @@ class Group(Base):
     created_at: Mapped[DateTime] = mapped_column(
         DateTime(timezone=True), server_default=func.now(), nullable=False
     )
+    # 인메모리 검색 인덱스가 다른 워커의 변경만 골라 읽는 워터마크 (트리거가 채운다)
+    search_updated_at: Mapped[DateTime | None] = mapped_column(
+        DateTime(timezone=True), nullable=True
+    )
 
 
 class GroupMember(Base):
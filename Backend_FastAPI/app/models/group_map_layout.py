@@ -0,0 +1,37 @@
+"""
+DB: group_map_layouts
+- cache_key (VARCHAR(128), PK)            # "{group_id}:{멤버/임베딩 시그니처 sha1}"
+- group_id (UUID, NOT NULL)
+- positions (JSONB, NOT NULL)             # {user_id: [x, y]}
+- created_at (timestamptz, NOT NULL, default=now())
+- last_used_at (timestamptz, NOT NULL, default=now())
+
+Constraints / Indexes
+- INDEX(last_used_at)                     # LRU 방식 eviction 용
+"""
+
+import uuid
+
+from sqlalchemy import DateTime, Index, String, func
+from sqlalchemy.dialects.postgresql import JSONB, UUID
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.base import Base
+
+
+class GroupMapLayout(Base):
+    __tablename__ = "group_map_layouts"
+    __table_args__ = (
+        Index("ix_group_map_layouts_last_used", "last_used_at"),
+    )
+
+    cache_key: Mapped[str] = mapped_column(String(128), primary_key=True)
+    group_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), nullable=False)
+    positions: Mapped[dict] = mapped_column(JSONB, nullable=False, default=dict)
+
+    created_at: Mapped[DateTime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False
+    )
+    last_used_at: Mapped[DateTime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False
+    )
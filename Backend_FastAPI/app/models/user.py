@@ -7,6 +7,7 @@ DB: users
 - profile_image_url (VARCHAR(512), NULL)
 - profile_data (JSONB, NOT NULL, default={})
 - embedding (JSONB, NULL)
+- embedding_vec (vector(1024), NULL)        # EMBEDDING_STORAGE=pgvector 일 때만 (id 로만 읽어 ANN 인덱스 없음)
 - embedding_updated_at (timestamptz, NULL)
 - created_at (timestamptz, NOT NULL, default=now())
 - updated_at (timestamptz, NOT NULL, default=now(), onupdate=now())
@@ -87,6 +87,7 @@ class GroupListItem(BaseSchema):
 
 class GroupListResponse(BaseSchema):
     items: list[GroupListItem]
+    next_cursor: str | None = None
 
 
 class GroupMemberItem(BaseSchema):
@@ -165,6 +166,7 @@ class GroupSearchItem(BaseSchema):
 
 class GroupSearchResponse(BaseSchema):
     items: list[GroupSearchItem]
+    nextCursor: str | None = None
 
 
 class GroupDetailResponse(BaseSchema):
@@ -230,6 +232,7 @@ class PhotoUploadResponse(BaseSchema):
     user_id: str
     file_path: str
     file_url: str
+    thumbnail_url: str | None = None
     uploaded_at: str | None
 
 
@@ -0,0 +1,98 @@
+"""BLIP 캡셔닝 CPU 백엔드.
+
+fp32 BlipForConditionalGeneration 을 불러온 뒤 CAPTION_BACKEND 값에 맞게 변환한다.
+- torch: 변환 없음 (기존 fp32 경로)
+- torch_int8: Linear 레이어 dynamic int8 양자화
+- onnx: vision encoder 를 ONNX(int8 dynamic 양자화)로 export 해 ONNX Runtime 으로 실행하고,
+  text decoder 의 generate 루프는 torch(int8)로 돌린다.
+"""
+
+from __future__ import annotations
+
+import logging
+from pathlib import Path
+from typing import Any, Callable
+
+BLIP_IMAGE_SIZE = 384
+
+
+def prepare_torch(model: Any, cache_dir: Path) -> Any:
+    return model
+
+
+def prepare_torch_int8(model: Any, cache_dir: Path) -> Any:
+    import torch  # type: ignore
+
+    return torch.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+
+
+def _export_vision_encoder(model: Any, export_dir: Path) -> Path:
+    import torch  # type: ignore
+
+    export_dir.mkdir(parents=True, exist_ok=True)
+    fp32_path = export_dir / "vision_model.onnx"
+    int8_path = export_dir / "vision_model.int8.onnx"
+    if int8_path.exists():
+        return int8_path
+
+    class _VisionEncoder(torch.nn.Module):
+        def __init__(self, vision_model: Any) -> None:
+            super().__init__()
+            self.vision_model = vision_model
+
+        def forward(self, pixel_values):
+            return self.vision_model(pixel_values=pixel_values)[0]
+
+    dummy = torch.zeros(1, 3, BLIP_IMAGE_SIZE, BLIP_IMAGE_SIZE)
+    with torch.no_grad():
+        torch.onnx.export(
+            _VisionEncoder(model.vision_model).eval(),
+            (dummy,),
+            str(fp32_path),
+            input_names=["pixel_values"],
+            output_names=["image_embeds"],
+            dynamic_axes={"pixel_values": {0: "batch"}, "image_embeds": {0: "batch"}},
+            opset_version=17,
+        )
+
+    from onnxruntime.quantization import QuantType, quantize_dynamic  # type: ignore
+
+    quantize_dynamic(str(fp32_path), str(int8_path), weight_type=QuantType.QInt8)
+    logging.getLogger("uvicorn.error").info("BLIP vision encoder exported to %s", int8_path)
+    return int8_path
+
+
+def prepare_onnx(model: Any, cache_dir: Path) -> Any:
+    import onnxruntime as ort  # type: ignore
+    import torch  # type: ignore
+
+    onnx_path = _export_vision_encoder(model, cache_dir / "blip-onnx")
+    options = ort.SessionOptions()
+    options.intra_op_num_threads = torch.get_num_threads()
+    options.inter_op_num_threads = 1
+    options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+    session = ort.InferenceSession(
+        str(onnx_path),
+        sess_options=options,
+        providers=["CPUExecutionProvider"],
+    )
+
+    class _OnnxVisionModel(torch.nn.Module):
+        # generate() 는 vision_model(...)[0] 만 사용하므로 같은 모양으로 돌려준다.
+        def forward(self, pixel_values=None, **_kwargs):
+            (image_embeds,) = session.run(
+                ["image_embeds"],
+                {"pixel_values": pixel_values.detach().cpu().numpy()},
+            )
+            return (torch.from_numpy(image_embeds),)
+
+    model.vision_model = _OnnxVisionModel()
+    model.text_decoder = prepare_torch_int8(model.text_decoder, cache_dir)
+    return model
+
+
+CAPTION_BACKENDS: dict[str, Callable[[Any, Path], Any]] = {
+    "torch": prepare_torch,
+    "torch_int8": prepare_torch_int8,
+    "onnx": prepare_onnx,
+}
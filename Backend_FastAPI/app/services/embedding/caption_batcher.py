@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Awaitable, Callable
+import logging
+
+from app.core.config import settings
+from app.services.embedding.caption_executor import caption_concurrency, run_caption_batch
+
+CaptionResult = tuple[str, str, str]
+
+
+class CaptionBatcher:
+    """여러 요청(사용자)의 caption 호출을 짧은 윈도우 동안 모아 runner 한 번으로 처리한다.
+
+    동시에 실행되는 배치는 max_concurrency 개로 제한해 CPU 를 나눠 쓰지 않게 한다.
+    """
+
+    def __init__(
+        self,
+        runner: Callable[[list[str]], Awaitable[list[CaptionResult]]],
+        max_batch_size: int = 16,
+        max_wait_seconds: float = 0.05,
+        max_concurrency: int = 1,
+    ) -> None:
+        self._runner = runner
+        self._max_batch_size = max(1, max_batch_size)
+        self._max_wait_seconds = max(0.0, max_wait_seconds)
+        self._max_concurrency = max(1, max_concurrency)
+        self._pending: list[tuple[str, asyncio.Future]] = []
+        self._flush_handle: asyncio.TimerHandle | None = None
+        self._run_slots: asyncio.Semaphore | None = None
+        self._inflight: set[asyncio.Task] = set()
+        self.batches_run = 0
+        self.images_captioned = 0
+
+    async def caption(self, image_path: str) -> CaptionResult:
+        loop = asyncio.get_running_loop()
+        future: asyncio.Future = loop.create_future()
+        self._pending.append((image_path, future))
+        if len(self._pending) >= self._max_batch_size:
+            self._flush()
+        elif self._flush_handle is None:
+            self._flush_handle = loop.call_later(self._max_wait_seconds, self._flush)
+        return await future
+
+    async def caption_many(self, image_paths: list[str]) -> list[CaptionResult]:
+        return list(await asyncio.gather(*(self.caption(path) for path in image_paths)))
+
+    def _flush(self) -> None:
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        if not self._pending:
+            return
+        batch = self._pending
+        self._pending = []
+        task = asyncio.get_running_loop().create_task(self._run(batch))
+        self._inflight.add(task)
+        task.add_done_callback(self._inflight.discard)
+
+    async def _run(self, batch: list[tuple[str, asyncio.Future]]) -> None:
+        if self._run_slots is None:
+            self._run_slots = asyncio.Semaphore(self._max_concurrency)
+        paths = [path for path, _ in batch]
+        try:
+            async with self._run_slots:
+                results = await self._runner(paths)
+            if len(results) != len(paths):
+                raise ValueError(f"expected {len(paths)} captions, got {len(results)}")
+        except Exception as exc:
+            logging.getLogger("uvicorn.error").warning(
+                "Caption batch failed images=%d error=%s", len(paths), exc
+            )
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(exc)
+            return
+
+        self.batches_run += 1
+        self.images_captioned += len(paths)
+        for (_, future), result in zip(batch, results):
+            if not future.done():
+                future.set_result(result)
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "batches_run": self.batches_run,
+            "images_captioned": self.images_captioned,
+            "pending": len(self._pending),
+        }
+
+
+caption_batcher = CaptionBatcher(
+    runner=run_caption_batch,
+    max_batch_size=settings.CAPTION_BATCH_MAX_SIZE,
+    max_wait_seconds=settings.CAPTION_BATCH_WAIT_MS / 1000,
+    max_concurrency=caption_concurrency(),
+)
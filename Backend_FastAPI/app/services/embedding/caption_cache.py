@@ -0,0 +1,133 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+import logging
+
+from sqlalchemy import func, update
+from sqlalchemy.dialects.postgresql import insert
+
+from app.core.config import settings
+from app.db.session import AsyncSessionLocal
+from app.models.caption_cache import CaptionCacheEntry
+from app.services.embedding.caption_executor import resolved_caption_model
+
+
+@dataclass(frozen=True)
+class CachedCaption:
+    caption_raw_en: str
+    caption_ko: str
+    model_name: str
+    model_version: str | None
+    interest_tags: list[str]
+
+
+def current_caption_models() -> tuple[str, str]:
+    """캐시 키에 들어가는 (caption model, translation model).
+
+    get 과 set 이 같은 키를 쓰도록 설정값이 아니라 실제로 돈 백엔드 이름을 쓴다.
+    """
+    caption_model = resolved_caption_model()
+    if not settings.OPENAI_API_KEY:
+        # 번역/취미 추정이 생략되는 환경의 결과는 따로 보관한다.
+        return caption_model, "none"
+    return caption_model, settings.OPENAI_TRANSLATION_MODEL or "gpt-4o-mini"
+
+
+class CaptionCache:
+    """같은 이미지(content_hash)의 캡션/번역/취미 추정 결과를 사용자와 무관하게 재사용한다."""
+
+    def __init__(self) -> None:
+        self.hits = 0
+        self.misses = 0
+        self.errors = 0
+
+    async def get(self, content_hash: str) -> CachedCaption | None:
+        caption_model, translation_model = current_caption_models()
+        try:
+            async with AsyncSessionLocal() as session:
+                result = await session.execute(
+                    update(CaptionCacheEntry)
+                    .where(
+                        CaptionCacheEntry.content_hash == content_hash,
+                        CaptionCacheEntry.caption_model == caption_model,
+                        CaptionCacheEntry.translation_model == translation_model,
+                    )
+                    .values(last_used_at=func.now())
+                    .returning(
+                        CaptionCacheEntry.caption_raw_en,
+                        CaptionCacheEntry.caption_ko,
+                        CaptionCacheEntry.model_version,
+                        CaptionCacheEntry.interest_tags,
+                    )
+                )
+                row = result.one_or_none()
+                await session.commit()
+        except Exception as exc:
+            self.errors += 1
+            logging.getLogger("uvicorn.error").warning(
+                "Caption cache read failed hash=%s error=%s", content_hash, exc
+            )
+            return None
+        if row is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        caption_raw_en, caption_ko, model_version, interest_tags = row
+        return CachedCaption(
+            caption_raw_en=caption_raw_en,
+            caption_ko=caption_ko,
+            model_name=caption_model,
+            model_version=model_version,
+            interest_tags=list(interest_tags or []),
+        )
+
+    async def set(
+        self,
+        content_hash: str,
+        caption_raw_en: str,
+        caption_ko: str,
+        model_version: str | None,
+        interest_tags: list[str],
+    ) -> None:
+        caption_model, translation_model = current_caption_models()
+        values = {
+            "caption_raw_en": caption_raw_en,
+            "caption_ko": caption_ko,
+            "model_version": model_version,
+            "interest_tags": interest_tags,
+        }
+        try:
+            async with AsyncSessionLocal() as session:
+                stmt = insert(CaptionCacheEntry).values(
+                    content_hash=content_hash,
+                    caption_model=caption_model,
+                    translation_model=translation_model,
+                    **values,
+                )
+                stmt = stmt.on_conflict_do_update(
+                    index_elements=[
+                        CaptionCacheEntry.content_hash,
+                        CaptionCacheEntry.caption_model,
+                        CaptionCacheEntry.translation_model,
+                    ],
+                    set_={**values, "last_used_at": func.now()},
+                )
+                await session.execute(stmt)
+                await session.commit()
+        except Exception as exc:
+            self.errors += 1
+            logging.getLogger("uvicorn.error").warning(
+                "Caption cache write failed hash=%s error=%s", content_hash, exc
+            )
+
+    def stats(self) -> dict[str, int | float]:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "errors": self.errors,
+        }
+
+
+caption_cache = CaptionCache()
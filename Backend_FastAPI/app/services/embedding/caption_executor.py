@@ -0,0 +1,160 @@
+from __future__ import annotations
+
+import asyncio
+from concurrent.futures import ProcessPoolExecutor
+import logging
+import multiprocessing
+import os
+import time
+
+from app.core.config import settings
+from app.services.embedding.captioning import (
+    caption_images,
+    caption_model_name,
+    configure_backend,
+    configure_torch_threads,
+    ensure_blip_loaded,
+    is_blip_ready,
+    warm_up_blip,
+)
+
+_POOL: ProcessPoolExecutor | None = None
+_THREAD_MODE_CONFIGURED = False
+# cold -> warming -> ready | unavailable (모델 로드 실패, fallback 캡션 사용) | failed
+_WARMUP: dict[str, object] = {"state": "cold", "elapsed_ms": None, "error": None}
+# process 모드에서 워커 프로세스가 BLIP 을 올린 것을 한 번이라도 확인했는지 (warm-up 없이 첫 배치로도 켜진다)
+_PROCESS_MODEL_LOADED = False
+# 실제로 돈 캡션 모델 이름. configure_backend 가 onnx → torch 처럼 fallback 하면 설정값과 다르다.
+_RESOLVED_MODEL: str | None = None
+
+
+def _init_caption_process(torch_threads: int, backend: str) -> None:
+    # 워커 프로세스마다 한 번: 스레드 수를 묶고 BLIP 을 미리 올린다.
+    if torch_threads > 0:
+        os.environ["OMP_NUM_THREADS"] = str(torch_threads)
+        os.environ["MKL_NUM_THREADS"] = str(torch_threads)
+    configure_torch_threads(torch_threads)
+    configure_backend(backend)
+    ensure_blip_loaded()
+
+
+def process_mode_enabled() -> bool:
+    return (settings.CAPTION_EXECUTOR or "").lower() == "process"
+
+
+def _get_pool() -> ProcessPoolExecutor:
+    global _POOL
+    if _POOL is None:
+        # torch 는 fork 이후 스레드 상태가 꼬일 수 있어 spawn 으로 띄운다.
+        _POOL = ProcessPoolExecutor(
+            max_workers=max(1, settings.CAPTION_PROCESS_WORKERS),
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_caption_process,
+            initargs=(settings.CAPTION_TORCH_THREADS, settings.CAPTION_BACKEND),
+        )
+        logging.getLogger("uvicorn.error").info(
+            "Caption process pool started workers=%d torch_threads=%d",
+            max(1, settings.CAPTION_PROCESS_WORKERS),
+            settings.CAPTION_TORCH_THREADS,
+        )
+    return _POOL
+
+
+def caption_concurrency() -> int:
+    """동시에 실행할 수 있는 캡션 배치 수 (프로세스 모드에서는 워커 수만큼)."""
+    if process_mode_enabled():
+        return max(1, settings.CAPTION_PROCESS_WORKERS)
+    return 1
+
+
+def _configure_thread_mode() -> None:
+    global _THREAD_MODE_CONFIGURED
+    if _THREAD_MODE_CONFIGURED:
+        return
+    configure_torch_threads(settings.CAPTION_TORCH_THREADS)
+    configure_backend(settings.CAPTION_BACKEND)
+    _THREAD_MODE_CONFIGURED = True
+
+
+def resolved_caption_model() -> str:
+    """캡션 캐시 키로 쓰는 모델 이름. 아직 한 번도 안 돌았으면 설정값 기준."""
+    return _RESOLVED_MODEL or caption_model_name(settings.CAPTION_BACKEND or "torch")
+
+
+def _remember_model(model_name: str) -> None:
+    global _RESOLVED_MODEL
+    _RESOLVED_MODEL = model_name
+
+
+async def run_caption_batch(image_paths: list[str]) -> list[tuple[str, str, str]]:
+    """설정된 실행기(thread | process)에서 caption_images 를 실행한다."""
+    global _PROCESS_MODEL_LOADED
+    if process_mode_enabled():
+        loop = asyncio.get_running_loop()
+        pool = _get_pool()
+        results = await loop.run_in_executor(pool, caption_images, image_paths)
+        if not _PROCESS_MODEL_LOADED:
+            # fallback 캡션과 구분하려면 워커 쪽 로드 상태를 물어봐야 한다 (처음 로드될 때까지만).
+            _PROCESS_MODEL_LOADED = await loop.run_in_executor(pool, is_blip_ready)
+    else:
+        _configure_thread_mode()
+        results = await asyncio.to_thread(caption_images, image_paths)
+    if results:
+        _remember_model(results[0][1])
+    return results
+
+
+async def warm_up_captioning() -> None:
+    """startup 에서 백그라운드로 실행: 실행기별로 BLIP 을 올리고 더미 추론을 한 번 돌린다."""
+    logger = logging.getLogger("uvicorn.error")
+    _WARMUP.update(state="warming", error=None)
+    started = time.perf_counter()
+    try:
+        if process_mode_enabled():
+            loop = asyncio.get_running_loop()
+            pool = _get_pool()
+            results = await asyncio.gather(
+                *(
+                    loop.run_in_executor(pool, warm_up_blip)
+                    for _ in range(max(1, settings.CAPTION_PROCESS_WORKERS))
+                )
+            )
+            loaded = all(results)
+            _remember_model(await loop.run_in_executor(pool, caption_model_name))
+        else:
+            _configure_thread_mode()
+            loaded = await asyncio.to_thread(warm_up_blip)
+            _remember_model(caption_model_name())
+    except Exception as exc:
+        _WARMUP.update(state="failed", error=str(exc))
+        logger.warning("Captioning warm-up failed: %s", exc)
+        return
+    elapsed_ms = round((time.perf_counter() - started) * 1000, 1)
+    _WARMUP.update(state="ready" if loaded else "unavailable", elapsed_ms=elapsed_ms)
+    logger.info("Captioning warm-up finished state=%s elapsed_ms=%.1f", _WARMUP["state"], elapsed_ms)
+
+
+def captioning_ready() -> bool:
+    if _WARMUP["state"] == "ready":
+        return True
+    # warm-up 없이 첫 배치에서 lazy 로드된 경우도 준비된 것으로 본다.
+    if process_mode_enabled():
+        return _PROCESS_MODEL_LOADED
+    return is_blip_ready()
+
+
+def captioning_state() -> dict[str, object]:
+    return {
+        "executor": "process" if process_mode_enabled() else "thread",
+        "backend": (settings.CAPTION_BACKEND or "torch").lower(),
+        "model_loaded": captioning_ready(),
+        "warmup_enabled": settings.CAPTION_WARMUP_ON_STARTUP,
+        **_WARMUP,
+    }
+
+
+def shutdown_caption_executor() -> None:
+    global _POOL
+    if _POOL is not None:
+        _POOL.shutdown(wait=False, cancel_futures=True)
+        _POOL = None
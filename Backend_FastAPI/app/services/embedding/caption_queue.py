@@ -0,0 +1,252 @@
+from __future__ import annotations
+
+import asyncio
+from datetime import datetime, timedelta, timezone
+import logging
+from pathlib import Path
+import time
+import uuid
+
+from sqlalchemy import and_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.db.session import AsyncSessionLocal
+from app.models.caption_job import CaptionJob
+from app.services.embedding.pipeline import process_photo_captions, set_captioning_status
+
+
+def enqueue_caption_job(
+    db: AsyncSession,
+    user_id: uuid.UUID,
+    photo_jobs: list[tuple[uuid.UUID, Path]],
+    incoming_tags: list[str],
+    compute_embedding: bool,
+) -> CaptionJob:
+    """업로드 트랜잭션에 캡셔닝 작업을 함께 넣는다. 커밋은 호출자가 한다."""
+    job = CaptionJob(
+        user_id=user_id,
+        payload={
+            "photos": [
+                {"photo_id": str(photo_id), "path": str(disk_path)}
+                for photo_id, disk_path in photo_jobs
+            ],
+            "incoming_tags": list(incoming_tags),
+        },
+        compute_embedding=compute_embedding,
+    )
+    db.add(job)
+    return job
+
+
+def _backoff_seconds(attempts: int) -> float:
+    base = max(1.0, float(settings.CAPTION_JOB_BACKOFF_SECONDS))
+    return min(base * (2 ** max(0, attempts - 1)), 3600.0)
+
+
+def _lease_renew_seconds() -> float:
+    return max(1.0, settings.CAPTION_JOB_LEASE_SECONDS / 3)
+
+
+async def requeue_stale_jobs() -> int:
+    """lease 가 만료된 running 작업(워커가 죽어 lease 갱신이 끊긴 작업)을 정리한다.
+
+    시도 횟수가 CAPTION_JOB_MAX_ATTEMPTS 에 닿은 작업은 failed 로, 나머지는 pending 으로
+    돌리고 pending 으로 돌린 수를 반환한다.
+    """
+    logger = logging.getLogger("uvicorn.error")
+    now = datetime.now(timezone.utc)
+    cutoff = now - timedelta(seconds=settings.CAPTION_JOB_LEASE_SECONDS)
+    stale = and_(CaptionJob.status == "running", CaptionJob.locked_at < cutoff)
+    async with AsyncSessionLocal() as session:
+        failed = await session.execute(
+            update(CaptionJob)
+            .where(stale, CaptionJob.attempts >= settings.CAPTION_JOB_MAX_ATTEMPTS)
+            .values(status="failed", locked_at=None, last_error="lease expired", updated_at=now)
+            .returning(CaptionJob.id, CaptionJob.user_id, CaptionJob.compute_embedding)
+        )
+        failed_jobs = failed.all()
+        result = await session.execute(
+            update(CaptionJob)
+            .where(stale)
+            .values(status="pending", locked_at=None, run_after=now, updated_at=now)
+        )
+        await session.commit()
+    for job_id, user_id, compute_embedding in failed_jobs:
+        logger.warning("Caption job failed permanently job_id=%s error=lease expired", job_id)
+        if compute_embedding:
+            await set_captioning_status(str(user_id), "failed")
+    return result.rowcount or 0
+
+
+async def _claim_job(session: AsyncSession) -> CaptionJob | None:
+    now = datetime.now(timezone.utc)
+    result = await session.execute(
+        select(CaptionJob)
+        .where(CaptionJob.status == "pending", CaptionJob.run_after <= now)
+        .order_by(CaptionJob.run_after)
+        .limit(1)
+        .with_for_update(skip_locked=True)
+    )
+    job = result.scalar_one_or_none()
+    if job is None:
+        await session.rollback()
+        return None
+    job.status = "running"
+    job.attempts += 1
+    job.locked_at = now
+    job.updated_at = now
+    await session.commit()
+    return job
+
+
+async def _update_job(job: CaptionJob, **values) -> None:
+    # attempts 가 같을 때만 쓴다: lease 가 끊겨 다른 워커가 다시 가져간 작업을 덮어쓰지 않게.
+    async with AsyncSessionLocal() as session:
+        await session.execute(
+            update(CaptionJob)
+            .where(
+                CaptionJob.id == job.id,
+                CaptionJob.status == "running",
+                CaptionJob.attempts == job.attempts,
+            )
+            .values(updated_at=datetime.now(timezone.utc), **values)
+        )
+        await session.commit()
+
+
+async def _renew_lease(job: CaptionJob) -> None:
+    logger = logging.getLogger("uvicorn.error")
+    while True:
+        await asyncio.sleep(_lease_renew_seconds())
+        try:
+            await _update_job(job, locked_at=datetime.now(timezone.utc))
+        except Exception as exc:
+            logger.warning("Caption job lease renewal failed job_id=%s error=%s", job.id, exc)
+
+
+async def run_next_caption_job() -> bool:
+    """pending 작업 하나를 가져와 실행한다. 가져온 작업이 없으면 False."""
+    logger = logging.getLogger("uvicorn.error")
+    async with AsyncSessionLocal() as session:
+        job = await _claim_job(session)
+    if job is None:
+        return False
+
+    payload = job.payload or {}
+    photo_jobs = [
+        (uuid.UUID(item["photo_id"]), Path(item["path"]))
+        for item in payload.get("photos", [])
+    ]
+    lease = asyncio.create_task(_renew_lease(job))
+    try:
+        await process_photo_captions(
+            user_id=str(job.user_id),
+            photo_jobs=photo_jobs,
+            incoming_tags=list(payload.get("incoming_tags", [])),
+            compute_embedding=job.compute_embedding,
+        )
+    except Exception as exc:
+        if job.attempts >= settings.CAPTION_JOB_MAX_ATTEMPTS:
+            logger.warning(
+                "Caption job failed permanently job_id=%s attempts=%d error=%s",
+                job.id,
+                job.attempts,
+                exc,
+            )
+            await _update_job(job, status="failed", locked_at=None, last_error=str(exc))
+            if job.compute_embedding:
+                await set_captioning_status(str(job.user_id), "failed")
+        else:
+            delay = _backoff_seconds(job.attempts)
+            logger.info(
+                "Caption job retry scheduled job_id=%s attempts=%d delay=%.0fs",
+                job.id,
+                job.attempts,
+                delay,
+            )
+            await _update_job(
+                job,
+                status="pending",
+                locked_at=None,
+                last_error=str(exc),
+                run_after=datetime.now(timezone.utc) + timedelta(seconds=delay),
+            )
+        return True
+    finally:
+        lease.cancel()
+
+    await _update_job(job, status="done", locked_at=None, last_error=None)
+    return True
+
+
+class CaptionWorkerPool:
+    """caption_jobs 를 처리하는 asyncio 워커 묶음.
+
+    업로드 직후에는 notify() 로 바로 깨우고, 다른 프로세스가 넣은 작업이나
+    backoff 가 끝난 작업은 poll_seconds 주기로 확인한다. 같은 루프에서 lease 갱신이
+    끊긴 작업도 주기적으로 정리한다 (어느 프로세스의 워커가 죽었든 살아 있는 풀이 회수).
+    """
+
+    def __init__(self, worker_count: int, poll_seconds: float) -> None:
+        self._worker_count = max(0, worker_count)
+        self._poll_seconds = max(0.1, poll_seconds)
+        self._wakeup = asyncio.Event()
+        self._tasks: list[asyncio.Task] = []
+        self._next_sweep = 0.0
+
+    @property
+    def running(self) -> bool:
+        return bool(self._tasks)
+
+    def notify(self) -> None:
+        self._wakeup.set()
+
+    async def _sweep_stale_jobs(self) -> None:
+        now = time.monotonic()
+        if now < self._next_sweep:
+            return
+        self._next_sweep = now + _lease_renew_seconds()
+        requeued = await requeue_stale_jobs()
+        if requeued:
+            logging.getLogger("uvicorn.error").info("Caption jobs requeued count=%d", requeued)
+            self.notify()
+
+    async def _worker(self, index: int) -> None:
+        logger = logging.getLogger("uvicorn.error")
+        while True:
+            try:
+                await self._sweep_stale_jobs()
+                processed = await run_next_caption_job()
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                logger.warning("Caption worker %d error: %s", index, exc)
+                processed = False
+            if processed:
+                continue
+            self._wakeup.clear()
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self._poll_seconds)
+            except asyncio.TimeoutError:
+                pass
+
+    def start(self) -> None:
+        if self._tasks:
+            return
+        self._tasks = [
+            asyncio.create_task(self._worker(index)) for index in range(self._worker_count)
+        ]
+
+    async def stop(self) -> None:
+        tasks = self._tasks
+        self._tasks = []
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+
+caption_workers = CaptionWorkerPool(
+    worker_count=settings.CAPTION_WORKERS,
+    poll_seconds=settings.CAPTION_JOB_POLL_SECONDS,
+)
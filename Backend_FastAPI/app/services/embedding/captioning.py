@@ -3,6 +3,9 @@ from pathlib import Path
 from threading import Lock
 from typing import Any
 
+from app.services.embedding.caption_backends import CAPTION_BACKENDS
+from app.services.embedding.image_prep import load_caption_image
+
 _MODEL_NAME = "blip-base"
 _MODEL_VERSION = "salesforce/blip-image-captioning-base"
 _CACHE_DIR = Path.home() / ".cache" / "huggingface"
@@ -10,6 +13,55 @@ _CACHE_DIR = Path.home() / ".cache" / "huggingface"
 _processor: Any | None = None
 _model: Any | None = None
 _LOAD_LOCK = Lock()
+_backend_name = "torch"
+
+
+def configure_backend(name: str) -> None:
+    """모델을 올리기 전에 CAPTION_BACKEND (torch | torch_int8 | onnx) 를 지정한다."""
+    global _backend_name
+    value = (name or "torch").lower()
+    if value not in CAPTION_BACKENDS:
+        logging.getLogger("uvicorn.error").warning(
+            "Unknown caption backend %s, using torch", name
+        )
+        value = "torch"
+    _backend_name = value
+
+
+def caption_model_name(backend: str | None = None) -> str:
+    name = (backend or _backend_name).lower()
+    if name == "torch":
+        return _MODEL_NAME
+    return f"{_MODEL_NAME}-{name}"
+
+
+def _prepare_backend() -> None:
+    global _model, _backend_name
+    if _backend_name == "torch":
+        return
+    try:
+        _model = CAPTION_BACKENDS[_backend_name](_model.eval(), _CACHE_DIR)
+    except Exception as exc:
+        logging.getLogger("uvicorn.error").warning(
+            "Caption backend %s unavailable, using torch fp32: %s", _backend_name, exc
+        )
+        _backend_name = "torch"
+
+
+def configure_torch_threads(num_threads: int) -> None:
+    """CPU 추론이 쓰는 intra/inter-op 스레드 수를 제한한다. torch 가 없으면 무시한다."""
+    if num_threads <= 0:
+        return
+    try:
+        import torch  # type: ignore
+    except Exception:
+        return
+    torch.set_num_threads(num_threads)
+    try:
+        torch.set_num_interop_threads(max(1, num_threads // 2))
+    except RuntimeError:
+        # inter-op 스레드 수는 첫 병렬 작업 이전에만 바꿀 수 있다.
+        pass
 
 
 def is_blip_ready() -> bool:
@@ -65,20 +117,70 @@ def _load_blip() -> bool:
                 _processor = None
                 _model = None
                 return False
+        _prepare_backend()
         return True
 
 
-def caption_image(image_path: str) -> tuple[str, str, str]:
+def fallback_caption(image_path: str) -> str:
+    return f"an uploaded image ({Path(image_path).name})"
+
+
+def ensure_blip_loaded() -> bool:
+    return _load_blip()
+
+
+def caption_images(image_paths: list[str]) -> list[tuple[str, str, str]]:
+    """여러 이미지를 하나의 배치 텐서로 묶어 generate 한 번으로 캡션을 만든다.
+
+    열 수 없는 이미지는 fallback 캡션을 돌려주고 나머지만 배치에 넣는다.
+    """
+    if not image_paths:
+        return []
     if not _load_blip():
-        fallback = f"an uploaded image ({Path(image_path).name})"
-        return fallback, _MODEL_NAME, _MODEL_VERSION
+        return [
+            (fallback_caption(path), caption_model_name(), _MODEL_VERSION)
+            for path in image_paths
+        ]
 
-    from PIL import Image  # type: ignore
+    captions = [fallback_caption(path) for path in image_paths]
+    images = []
+    positions: list[int] = []
+    for position, image_path in enumerate(image_paths):
+        try:
+            images.append(load_caption_image(image_path))
+        except Exception as exc:
+            logging.getLogger("uvicorn.error").warning(
+                "Captioning skipped unreadable image %s: %s", image_path, exc
+            )
+            continue
+        positions.append(position)
+
+    if images:
+        decoded = _generate_captions(images)
+        for position, caption in zip(positions, decoded):
+            captions[position] = caption.strip()
+    model_name = caption_model_name()
+    return [(caption, model_name, _MODEL_VERSION) for caption in captions]
+
+
+def _generate_captions(images: list) -> list[str]:
     import torch  # type: ignore
 
-    image = Image.open(image_path).convert("RGB")
-    inputs = _processor(image, return_tensors="pt")
+    inputs = _processor(images=images, return_tensors="pt")
     with torch.no_grad():
         output = _model.generate(**inputs, max_new_tokens=32)
-    caption = _processor.decode(output[0], skip_special_tokens=True)
-    return caption.strip(), _MODEL_NAME, _MODEL_VERSION
+    return _processor.batch_decode(output, skip_special_tokens=True)
+
+
+def warm_up_blip() -> bool:
+    """모델을 올리고 더미 이미지로 한 번 추론해 lazy 커널 초기화를 미리 끝낸다."""
+    if not _load_blip():
+        return False
+    from PIL import Image  # type: ignore
+
+    _generate_captions([Image.new("RGB", (384, 384), color=(127, 127, 127))])
+    return True
+
+
+def caption_image(image_path: str) -> tuple[str, str, str]:
+    return caption_images([image_path])[0]
@@ -0,0 +1,128 @@
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Callable
+import logging
+
+import httpx
+
+OPENAI_EMBEDDINGS_URL = "https://api.openai.com/v1/embeddings"
+
+
+class EmbeddingBatcher:
+    """동시에 들어온 embed 요청을 짧은 윈도우 동안 모아 `input: [...]` 한 번으로 보낸다.
+
+    max_batch_size 개가 차면 즉시, 아니면 max_wait_seconds 후에 flush 하고,
+    응답은 index 순서대로 각 호출자에게 돌려준다. client_provider 가 있으면 공유 클라이언트를
+    쓰고, 없으면 자체 클라이언트 하나를 만들어 재사용한다.
+    """
+
+    def __init__(
+        self,
+        api_key: str,
+        model: str,
+        dimensions: int | None = None,
+        max_batch_size: int = 64,
+        max_wait_seconds: float = 0.02,
+        endpoint: str = OPENAI_EMBEDDINGS_URL,
+        timeout: float = 30.0,
+        transport: httpx.AsyncBaseTransport | None = None,
+        client_provider: Callable[[], httpx.AsyncClient] | None = None,
+    ) -> None:
+        self._api_key = api_key
+        self._model = model
+        self._dimensions = dimensions
+        self._max_batch_size = max(1, max_batch_size)
+        self._max_wait_seconds = max(0.0, max_wait_seconds)
+        self._endpoint = endpoint
+        self._timeout = timeout
+        self._transport = transport
+        self._client_provider = client_provider
+        self._client: httpx.AsyncClient | None = None
+        self._pending: list[tuple[str, asyncio.Future]] = []
+        self._flush_handle: asyncio.TimerHandle | None = None
+        self._inflight: set[asyncio.Task] = set()
+        self.requests_sent = 0
+        self.inputs_sent = 0
+
+    def _get_client(self) -> httpx.AsyncClient:
+        if self._client_provider is not None:
+            return self._client_provider()
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                timeout=self._timeout,
+                transport=self._transport,
+                limits=httpx.Limits(max_connections=8, max_keepalive_connections=8),
+            )
+        return self._client
+
+    async def embed(self, text: str) -> list[float]:
+        loop = asyncio.get_running_loop()
+        future: asyncio.Future = loop.create_future()
+        self._pending.append((text, future))
+        if len(self._pending) >= self._max_batch_size:
+            self._flush()
+        elif self._flush_handle is None:
+            self._flush_handle = loop.call_later(self._max_wait_seconds, self._flush)
+        return await future
+
+    def _flush(self) -> None:
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        if not self._pending:
+            return
+        batch = self._pending
+        self._pending = []
+        task = asyncio.get_running_loop().create_task(self._send(batch))
+        self._inflight.add(task)
+        task.add_done_callback(self._inflight.discard)
+
+    async def _send(self, batch: list[tuple[str, asyncio.Future]]) -> None:
+        # 같은 배치 안의 중복 텍스트는 한 번만 보낸다.
+        unique_texts = list(dict.fromkeys(text for text, _ in batch))
+        payload: dict[str, object] = {"model": self._model, "input": unique_texts}
+        if self._dimensions is not None:
+            payload["dimensions"] = self._dimensions
+        try:
+            response = await self._get_client().post(
+                self._endpoint,
+                json=payload,
+                headers={"Authorization": f"Bearer {self._api_key}"},
+            )
+            response.raise_for_status()
+            items = sorted(response.json()["data"], key=lambda item: item["index"])
+            if len(items) != len(unique_texts):
+                raise ValueError(
+                    f"expected {len(unique_texts)} embeddings, got {len(items)}"
+                )
+        except Exception as exc:
+            logging.getLogger("uvicorn.error").warning(
+                "Embedding batch failed inputs=%d error=%s", len(unique_texts), exc
+            )
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(exc)
+            return
+
+        self.requests_sent += 1
+        self.inputs_sent += len(unique_texts)
+        by_text = {text: item["embedding"] for text, item in zip(unique_texts, items)}
+        for text, future in batch:
+            if not future.done():
+                future.set_result(list(by_text[text]))
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "requests_sent": self.requests_sent,
+            "inputs_sent": self.inputs_sent,
+            "pending": len(self._pending),
+        }
+
+    async def aclose(self) -> None:
+        self._flush()
+        if self._inflight:
+            await asyncio.gather(*self._inflight, return_exceptions=True)
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
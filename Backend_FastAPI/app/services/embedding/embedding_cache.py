@@ -0,0 +1,129 @@
+from __future__ import annotations
+
+import logging
+
+from sqlalchemy import delete, func, select, tuple_, update
+from sqlalchemy.dialects.postgresql import insert
+
+from app.core.config import settings
+from app.db.session import AsyncSessionLocal
+from app.models.embedding_cache import EmbeddingCacheEntry
+
+
+class EmbeddingCache:
+    """(model_name, dimensions, source_hash) 로 주소화된 임베딩 캐시 (last_used_at 기준 LRU).
+
+    같은 final_text 는 업스트림 호출 없이 바로 돌려준다. DB 오류는 miss 로 취급한다.
+    """
+
+    def __init__(self, max_rows: int, evict_every: int = 100) -> None:
+        self._max_rows = max(1, max_rows)
+        self._evict_every = max(1, evict_every)
+        self._writes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.errors = 0
+
+    async def get(self, model_name: str, dimensions: int, source_hash: str) -> list[float] | None:
+        try:
+            async with AsyncSessionLocal() as session:
+                result = await session.execute(
+                    update(EmbeddingCacheEntry)
+                    .where(
+                        EmbeddingCacheEntry.model_name == model_name,
+                        EmbeddingCacheEntry.dimensions == dimensions,
+                        EmbeddingCacheEntry.source_hash == source_hash,
+                    )
+                    .values(last_used_at=func.now())
+                    .returning(EmbeddingCacheEntry.embedding)
+                )
+                embedding = result.scalar_one_or_none()
+                await session.commit()
+        except Exception as exc:
+            self.errors += 1
+            logging.getLogger("uvicorn.error").warning(
+                "Embedding cache read failed hash=%s error=%s", source_hash, exc
+            )
+            return None
+        if embedding is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return list(embedding)
+
+    async def set(
+        self,
+        model_name: str,
+        dimensions: int,
+        source_hash: str,
+        embedding: list[float],
+        model_version: str | None,
+    ) -> None:
+        self._writes += 1
+        try:
+            async with AsyncSessionLocal() as session:
+                stmt = insert(EmbeddingCacheEntry).values(
+                    model_name=model_name,
+                    dimensions=dimensions,
+                    source_hash=source_hash,
+                    embedding=embedding,
+                    model_version=model_version,
+                )
+                stmt = stmt.on_conflict_do_update(
+                    index_elements=[
+                        EmbeddingCacheEntry.model_name,
+                        EmbeddingCacheEntry.dimensions,
+                        EmbeddingCacheEntry.source_hash,
+                    ],
+                    set_={
+                        "embedding": embedding,
+                        "model_version": model_version,
+                        "last_used_at": func.now(),
+                    },
+                )
+                await session.execute(stmt)
+                evicted = 0
+                # 정렬 스캔 비용을 줄이기 위해 eviction 은 evict_every 번 쓰기마다 한 번만 한다.
+                if self._writes % self._evict_every == 0:
+                    stale = (
+                        select(
+                            EmbeddingCacheEntry.model_name,
+                            EmbeddingCacheEntry.dimensions,
+                            EmbeddingCacheEntry.source_hash,
+                        )
+                        .order_by(EmbeddingCacheEntry.last_used_at.desc())
+                        .offset(self._max_rows)
+                    )
+                    result = await session.execute(
+                        delete(EmbeddingCacheEntry).where(
+                            tuple_(
+                                EmbeddingCacheEntry.model_name,
+                                EmbeddingCacheEntry.dimensions,
+                                EmbeddingCacheEntry.source_hash,
+                            ).in_(stale)
+                        )
+                    )
+                    evicted = result.rowcount or 0
+                await session.commit()
+        except Exception as exc:
+            self.errors += 1
+            logging.getLogger("uvicorn.error").warning(
+                "Embedding cache write failed hash=%s error=%s", source_hash, exc
+            )
+            return
+        self.evictions += evicted
+
+    def stats(self) -> dict[str, int | float]:
+        lookups = self.hits + self.misses
+        return {
+            "max_rows": self._max_rows,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "evictions": self.evictions,
+            "errors": self.errors,
+        }
+
+
+embedding_cache = EmbeddingCache(max_rows=settings.EMBEDDING_CACHE_MAX_ROWS)
@@ -1,13 +1,33 @@
+"""사용자별 임베딩 입출력 로그 (user_embeddings/<name>_embeddings.jsonl).
+
+한 줄에 레코드 하나를 append 만 하고, 파일이 EMBEDDING_LOG_MAX_BYTES 를 넘으면
+<name>_embeddings.1.jsonl, .2.jsonl ... 로 밀어낸다. 쓰기는 큐를 받는 백그라운드
+writer task 가 to_thread 로 처리하므로 log_embedding_io 는 이벤트 루프를 막지 않는다.
+
+오프라인 분석은 iter_embedding_log() 나 아래처럼 읽는다.
+
+    python -m app.services.embedding.embedding_log <user_name 또는 user_id>
+"""
+
 from __future__ import annotations
 
+import asyncio
+from collections.abc import Iterator
 import json
 import logging
+import os
 import re
 from datetime import datetime, timezone
 from pathlib import Path
+import sys
+
+from app.core.config import settings
 
 
 _LOG_DIR = Path(__file__).resolve().parents[3] / "user_embeddings"
+_LOG_SUFFIX = "_embeddings.jsonl"
+# 이전 형식 (레코드 전체를 JSON 배열로 다시 쓰던 파일). 읽기만 지원한다.
+_LEGACY_SUFFIX = "_embeddings.json"
 
 
 def _safe_filename(name: str | None, fallback: str) -> str:
@@ -17,6 +37,130 @@ def _safe_filename(name: str | None, fallback: str) -> str:
     return cleaned or fallback
 
 
+def _log_path(log_dir: Path, safe_name: str, generation: int = 0) -> Path:
+    if generation == 0:
+        return log_dir / f"{safe_name}{_LOG_SUFFIX}"
+    return log_dir / f"{safe_name}_embeddings.{generation}.jsonl"
+
+
+def _rotate(log_dir: Path, safe_name: str, backup_count: int) -> None:
+    if backup_count <= 0:
+        _log_path(log_dir, safe_name).unlink(missing_ok=True)
+        return
+    _log_path(log_dir, safe_name, backup_count).unlink(missing_ok=True)
+    for generation in range(backup_count - 1, -1, -1):
+        source = _log_path(log_dir, safe_name, generation)
+        if source.exists():
+            os.replace(source, _log_path(log_dir, safe_name, generation + 1))
+
+
+def _append_records(
+    log_dir: Path,
+    records: list[tuple[str, dict]],
+    max_bytes: int,
+    backup_count: int,
+) -> None:
+    log_dir.mkdir(parents=True, exist_ok=True)
+    by_name: dict[str, list[str]] = {}
+    for safe_name, payload in records:
+        by_name.setdefault(safe_name, []).append(json.dumps(payload, ensure_ascii=False))
+    for safe_name, lines in by_name.items():
+        path = _log_path(log_dir, safe_name)
+        if max_bytes > 0 and path.exists() and path.stat().st_size >= max_bytes:
+            _rotate(log_dir, safe_name, backup_count)
+        with path.open("a", encoding="utf-8") as handle:
+            handle.write("\n".join(lines) + "\n")
+
+
+class EmbeddingLogWriter:
+    """큐에 쌓인 로그 레코드를 모아 파일별로 한 번에 append 하는 백그라운드 writer.
+
+    실행 중인 이벤트 루프가 없으면(스크립트 등) 호출한 자리에서 바로 쓴다.
+    큐가 가득 차면 레코드를 버리고 dropped 만 센다.
+    """
+
+    def __init__(
+        self,
+        log_dir: Path,
+        max_bytes: int,
+        backup_count: int,
+        queue_size: int = 1000,
+    ) -> None:
+        self._log_dir = log_dir
+        self._max_bytes = max_bytes
+        self._backup_count = max(0, backup_count)
+        self._queue_size = max(1, queue_size)
+        self._queue: asyncio.Queue | None = None
+        self._task: asyncio.Task | None = None
+        self.written = 0
+        self.dropped = 0
+
+    def submit(self, safe_name: str, payload: dict) -> None:
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            self._write([(safe_name, payload)])
+            return
+        if self._task is None or self._task.done():
+            self._queue = asyncio.Queue(maxsize=self._queue_size)
+            self._task = asyncio.create_task(self._run(self._queue))
+        try:
+            self._queue.put_nowait((safe_name, payload))
+        except asyncio.QueueFull:
+            self.dropped += 1
+
+    def _write(self, records: list[tuple[str, dict]]) -> None:
+        try:
+            _append_records(self._log_dir, records, self._max_bytes, self._backup_count)
+        except Exception as exc:
+            self.dropped += len(records)
+            logging.getLogger("uvicorn.error").warning(
+                "Embedding log write failed records=%d dir=%s error=%s",
+                len(records),
+                self._log_dir,
+                exc,
+            )
+            return
+        self.written += len(records)
+
+    async def _run(self, queue: asyncio.Queue) -> None:
+        while True:
+            records = [await queue.get()]
+            while not queue.empty():
+                records.append(queue.get_nowait())
+            try:
+                await asyncio.to_thread(self._write, records)
+            finally:
+                for _ in records:
+                    queue.task_done()
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "written": self.written,
+            "dropped": self.dropped,
+            "pending": self._queue.qsize() if self._queue is not None else 0,
+        }
+
+    async def aclose(self) -> None:
+        """남은 레코드를 모두 쓴 뒤 writer task 를 멈춘다."""
+        task, queue = self._task, self._queue
+        self._task = None
+        if task is None:
+            return
+        if not task.done() and queue is not None:
+            await queue.join()
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+
+
+embedding_log_writer = EmbeddingLogWriter(
+    log_dir=_LOG_DIR,
+    max_bytes=settings.EMBEDDING_LOG_MAX_BYTES,
+    backup_count=settings.EMBEDDING_LOG_BACKUP_COUNT,
+    queue_size=settings.EMBEDDING_LOG_QUEUE_SIZE,
+)
+
+
 def log_embedding_io(
     user_name: str | None,
     user_id: str,
@@ -27,9 +171,6 @@ def log_embedding_io(
     model_name: str | None,
     model_version: str | None,
 ) -> None:
-    logger = logging.getLogger("uvicorn.error")
-    _LOG_DIR.mkdir(parents=True, exist_ok=True)
-    safe_name = _safe_filename(user_name, user_id)
     payload = {
         "timestamp": datetime.now(timezone.utc).isoformat(),
         "user_id": user_id,
@@ -38,29 +179,49 @@ def log_embedding_io(
         "input_text_lines": input_text.splitlines(),
         "image_captions": image_captions or [],
         "image_tags": image_tags or [],
-        "embedding": embedding,
+        "embedding": list(embedding),
         "model_name": model_name,
         "model_version": model_version,
     }
-    log_path = _LOG_DIR / f"{safe_name}_embeddings.json"
-    try:
-        if log_path.exists():
-            existing = json.loads(log_path.read_text(encoding="utf-8") or "[]")
-            if not isinstance(existing, list):
-                existing = []
-        else:
-            existing = []
-        existing.append(payload)
-        log_path.write_text(
-            json.dumps(existing, ensure_ascii=False, indent=2),
-            encoding="utf-8",
-        )
-    except Exception as exc:
-        logger.warning(
-            "Embedding log write failed user_id=%s path=%s error=%s",
-            user_id,
-            log_path,
-            exc,
-        )
-        return
-    logger.info("Embedding log written user_id=%s path=%s", user_id, log_path)
+    embedding_log_writer.submit(_safe_filename(user_name, user_id), payload)
+
+
+def iter_embedding_log(user: str, log_dir: Path | None = None) -> Iterator[dict]:
+    """한 사용자의 로그 레코드를 오래된 순서(이전 형식 파일 -> 회전 파일 -> 현재 파일)로 흘려준다."""
+    log_dir = log_dir or _LOG_DIR
+    safe_name = _safe_filename(user, user)
+    legacy_path = log_dir / f"{safe_name}{_LEGACY_SUFFIX}"
+    if legacy_path.exists():
+        records = json.loads(legacy_path.read_text(encoding="utf-8") or "[]")
+        if isinstance(records, list):
+            yield from records
+
+    generations = sorted(
+        (
+            int(match.group(1))
+            for path in log_dir.glob(f"{safe_name}_embeddings.*.jsonl")
+            if (match := re.fullmatch(rf"{re.escape(safe_name)}_embeddings\.(\d+)\.jsonl", path.name))
+        ),
+        reverse=True,
+    )
+    for generation in [*generations, 0]:
+        path = _log_path(log_dir, safe_name, generation)
+        if not path.exists():
+            continue
+        with path.open(encoding="utf-8") as handle:
+            for line in handle:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    yield json.loads(line)
+                except json.JSONDecodeError:
+                    # 프로세스가 쓰는 도중 죽어 잘린 마지막 줄은 건너뛴다.
+                    continue
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 2:
+        raise SystemExit("usage: python -m app.services.embedding.embedding_log <user_name 또는 user_id>")
+    for record in iter_embedding_log(sys.argv[1]):
+        sys.stdout.write(json.dumps(record, ensure_ascii=False) + "\n")
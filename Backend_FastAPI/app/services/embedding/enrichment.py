@@ -0,0 +1,143 @@
+from __future__ import annotations
+
+import asyncio
+from dataclasses import dataclass
+import json
+import logging
+
+import httpx
+
+from app.core.config import settings
+from app.core.http import http_clients
+
+OPENAI_CHAT_URL = "https://api.openai.com/v1/chat/completions"
+
+_SYSTEM_PROMPT = (
+    "You receive numbered English image captions. For each caption, translate it to "
+    "natural Korean and infer 0-3 likely hobbies/interests of the person who uploaded it. "
+    "Prefer higher-level hobby tags over literal objects and use short Korean nouns. "
+    "If uncertain, return an empty tag list. "
+    "Return JSON only: "
+    "{\"items\": [{\"index\": 0, \"caption_ko\": \"...\", \"tags\": [\"...\"]}]} "
+    "with exactly one item per input index."
+)
+
+
+@dataclass(frozen=True)
+class CaptionEnrichment:
+    caption_ko: str
+    tags: list[str]
+    # False 이면 번역을 받지 못해 원문을 그대로 돌려준 것 (캐시하지 않음)
+    ok: bool
+
+
+def clean_interest_tags(tags: object) -> list[str]:
+    if not isinstance(tags, list):
+        return []
+    cleaned: list[str] = []
+    seen: set[str] = set()
+    for tag in tags:
+        if not isinstance(tag, str):
+            continue
+        value = tag.strip()
+        if not value or value in seen:
+            continue
+        seen.add(value)
+        cleaned.append(value)
+
+    return cleaned[:3]
+
+
+def _fallback(caption: str) -> CaptionEnrichment:
+    return CaptionEnrichment(caption_ko=caption, tags=[], ok=False)
+
+
+def _parse_items(content: str, count: int) -> dict[int, dict]:
+    parsed = json.loads(content)
+    items = parsed.get("items", []) if isinstance(parsed, dict) else parsed
+    by_index: dict[int, dict] = {}
+    for item in items if isinstance(items, list) else []:
+        if not isinstance(item, dict):
+            continue
+        try:
+            index = int(item.get("index"))
+        except (TypeError, ValueError):
+            continue
+        if 0 <= index < count:
+            by_index[index] = item
+    return by_index
+
+
+async def _enrich_chunk(
+    captions: list[str],
+    api_key: str,
+    client: httpx.AsyncClient,
+    timeout: float,
+) -> list[CaptionEnrichment]:
+    numbered = "\n".join(f"{index}: {caption}" for index, caption in enumerate(captions))
+    payload = {
+        "model": settings.OPENAI_TRANSLATION_MODEL or "gpt-4o-mini",
+        "messages": [
+            {"role": "system", "content": _SYSTEM_PROMPT},
+            {"role": "user", "content": numbered},
+        ],
+        "temperature": 0.2,
+        "response_format": {"type": "json_object"},
+    }
+    try:
+        response = await client.post(
+            OPENAI_CHAT_URL,
+            json=payload,
+            headers={"Authorization": f"Bearer {api_key}"},
+            timeout=timeout,
+        )
+        response.raise_for_status()
+        content = response.json()["choices"][0]["message"]["content"]
+        by_index = _parse_items(content, len(captions))
+    except Exception as exc:
+        logging.getLogger("uvicorn.error").warning(
+            "Caption enrichment failed captions=%d error=%s", len(captions), exc
+        )
+        return [_fallback(caption) for caption in captions]
+
+    results: list[CaptionEnrichment] = []
+    for index, caption in enumerate(captions):
+        item = by_index.get(index)
+        caption_ko = item.get("caption_ko") if item else None
+        if not isinstance(caption_ko, str) or not caption_ko.strip():
+            results.append(_fallback(caption))
+            continue
+        results.append(
+            CaptionEnrichment(
+                caption_ko=caption_ko.strip(),
+                tags=clean_interest_tags(item.get("tags")),
+                ok=True,
+            )
+        )
+    return results
+
+
+async def enrich_captions(
+    captions: list[str],
+    api_key: str | None = None,
+    client: httpx.AsyncClient | None = None,
+    batch_size: int | None = None,
+    timeout: float = 30.0,
+) -> list[CaptionEnrichment]:
+    """영문 캡션들의 한국어 번역과 취미 태그를 JSON 모드 호출 한 번(배치당)으로 얻는다."""
+    if not captions:
+        return []
+    api_key = api_key if api_key is not None else settings.OPENAI_API_KEY
+    if not api_key:
+        # 기존 번역/취미 추정과 같이 키가 없으면 원문과 빈 태그를 돌려준다.
+        return [CaptionEnrichment(caption_ko=caption, tags=[], ok=True) for caption in captions]
+
+    client = client or http_clients.get("openai")
+    size = max(1, batch_size or settings.CAPTION_ENRICH_BATCH_SIZE)
+    chunks = await asyncio.gather(
+        *(
+            _enrich_chunk(captions[offset : offset + size], api_key, client, timeout)
+            for offset in range(0, len(captions), size)
+        )
+    )
+    return [result for chunk in chunks for result in chunk]
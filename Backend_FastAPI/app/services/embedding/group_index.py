@@ -0,0 +1,400 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+from datetime import datetime, timedelta
+import time
+import uuid
+
+import numpy as np
+from sqlalchemy import func, select, text
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncSession
+
+from app.core.config import settings
+from app.groups.queries import GroupFilters, is_public_profile
+from app.models.group import Group
+from app.services.embedding.openai_embed import EMBEDDING_DIM
+
+
+def _profile_keys(profile: dict | None) -> tuple[frozenset[str], frozenset[str], str | None]:
+    """group_filter_clauses 와 같은 규칙으로 (tags, interests, region) 필터 키를 뽑는다."""
+    profile = profile or {}
+
+    def strings(value) -> frozenset[str]:
+        # jsonb @> 는 배열 안의 같은 문자열 원소만 맞춘다.
+        if not isinstance(value, list):
+            return frozenset()
+        return frozenset(item for item in value if isinstance(item, str))
+
+    region = profile.get("region")
+    if region is not None and not isinstance(region, str):
+        # ->> 는 문자열이 아닌 값을 JSON 텍스트로 돌려준다.
+        region = json.dumps(region)
+    return strings(profile.get("tags")), strings(profile.get("interests")), region
+
+
+SEARCH_UPDATED_AT_FUNCTION_SQL = """
+CREATE OR REPLACE FUNCTION groups_search_updated_at() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP = 'INSERT'
+        OR NEW.group_profile IS DISTINCT FROM OLD.group_profile
+        OR NEW.embedding IS DISTINCT FROM OLD.embedding
+        OR NEW.is_subgroup IS DISTINCT FROM OLD.is_subgroup THEN
+        NEW.search_updated_at = clock_timestamp();
+    END IF;
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql
+"""
+SEARCH_UPDATED_AT_STATEMENTS = [
+    "ALTER TABLE groups ADD COLUMN IF NOT EXISTS search_updated_at TIMESTAMPTZ",
+    "CREATE INDEX IF NOT EXISTS ix_groups_search_updated_at ON groups (search_updated_at)",
+    SEARCH_UPDATED_AT_FUNCTION_SQL,
+    "DROP TRIGGER IF EXISTS groups_search_updated_at ON groups",
+    "CREATE TRIGGER groups_search_updated_at BEFORE INSERT OR UPDATE ON groups "
+    "FOR EACH ROW EXECUTE FUNCTION groups_search_updated_at()",
+]
+
+
+async def ensure_search_updated_at_trigger(conn: AsyncConnection) -> None:
+    """어느 프로세스가 바꿨든 검색에 쓰는 컬럼이 바뀌면 groups.search_updated_at 이 움직이게 한다."""
+    for statement in SEARCH_UPDATED_AT_STATEMENTS:
+        await conn.execute(text(statement))
+
+
+class _KeyMasks:
+    """키(태그/지역)마다 해당 행을 True 로 둔 bool 마스크. 필터를 O(키 수) 배열 연산으로 만든다."""
+
+    def __init__(self, capacity: int) -> None:
+        self._capacity = capacity
+        self._masks: dict[str, np.ndarray] = {}
+
+    def grow(self, capacity: int, size: int) -> None:
+        for key, mask in self._masks.items():
+            grown = np.zeros(capacity, dtype=bool)
+            grown[:size] = mask[:size]
+            self._masks[key] = grown
+        self._capacity = capacity
+
+    def set(self, row: int, keys, value: bool) -> None:
+        for key in keys:
+            mask = self._masks.get(key)
+            if mask is None:
+                if not value:
+                    continue
+                mask = self._masks[key] = np.zeros(self._capacity, dtype=bool)
+            mask[row] = value
+
+    def get(self, key: str) -> np.ndarray | None:
+        return self._masks.get(key)
+
+
+class GroupEmbeddingIndex:
+    """공개 그룹 임베딩을 L2 정규화된 float32 행렬로 들고 있는 프로세스 로컬 인덱스.
+
+    공개 여부와 태그/지역 필터는 행마다 bool 마스크로 같이 들고 있어, top-k 추천은
+    행렬-벡터 곱 한 번과 마스크 AND, argpartition 으로 계산한다 (요청마다 DB 조회 없음).
+    """
+
+    def __init__(self, dim: int, refresh_seconds: float = 300.0) -> None:
+        self._dim = dim
+        self._refresh_seconds = refresh_seconds
+        self._loaded_at: float | None = None
+        # 이 시각(groups.search_updated_at)까지의 변경은 반영돼 있다.
+        self.synced_through: datetime | None = None
+        self._clear(64)
+
+    def _clear(self, capacity: int) -> None:
+        self._matrix = np.zeros((capacity, self._dim), dtype=np.float32)
+        self._public = np.zeros(capacity, dtype=bool)
+        # uuid 정렬(= str(uuid) 정렬)을 벡터 연산으로 하기 위한 상/하위 64비트
+        self._id_hi = np.zeros(capacity, dtype=np.uint64)
+        self._id_lo = np.zeros(capacity, dtype=np.uint64)
+        self._tags = _KeyMasks(capacity)
+        self._interests = _KeyMasks(capacity)
+        self._regions = _KeyMasks(capacity)
+        self._ids: list[uuid.UUID] = []
+        self._keys: list[tuple[frozenset[str], frozenset[str], str | None]] = []
+        self._rows: dict[uuid.UUID, int] = {}
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    @property
+    def is_loaded(self) -> bool:
+        return self._loaded_at is not None
+
+    def is_stale(self) -> bool:
+        if self._loaded_at is None:
+            return True
+        return time.monotonic() - self._loaded_at > self._refresh_seconds
+
+    def _to_unit_vector(self, embedding: list[float] | None) -> np.ndarray:
+        if not embedding or len(embedding) != self._dim:
+            return np.zeros(self._dim, dtype=np.float32)
+        try:
+            vector = np.asarray(embedding, dtype=np.float32)
+        except (TypeError, ValueError):
+            return np.zeros(self._dim, dtype=np.float32)
+        norm = float(np.linalg.norm(vector))
+        if not np.isfinite(norm) or norm <= 0.0:
+            return np.zeros(self._dim, dtype=np.float32)
+        return vector / norm
+
+    def _reserve(self, capacity: int) -> None:
+        if capacity <= self._matrix.shape[0]:
+            return
+        new_capacity = max(capacity, self._matrix.shape[0] * 2, 64)
+
+        def grow(array: np.ndarray) -> np.ndarray:
+            grown = np.zeros((new_capacity, *array.shape[1:]), dtype=array.dtype)
+            grown[: self._size] = array[: self._size]
+            return grown
+
+        self._matrix = grow(self._matrix)
+        self._public = grow(self._public)
+        self._id_hi = grow(self._id_hi)
+        self._id_lo = grow(self._id_lo)
+        for masks in (self._tags, self._interests, self._regions):
+            masks.grow(new_capacity, self._size)
+
+    def _set_keys(self, row: int, keys, value: bool) -> None:
+        tags, interests, region = keys
+        self._tags.set(row, tags, value)
+        self._interests.set(row, interests, value)
+        if region is not None:
+            self._regions.set(row, (region,), value)
+
+    def _set_profile(self, row: int, profile: dict | None) -> None:
+        self._public[row] = is_public_profile(profile)
+        keys = _profile_keys(profile)
+        if keys != self._keys[row]:
+            self._set_keys(row, self._keys[row], False)
+            self._set_keys(row, keys, True)
+            self._keys[row] = keys
+
+    def replace_all(
+        self,
+        entries: list[tuple[uuid.UUID, list[float] | None, dict | None]],
+        synced_through: datetime | None = None,
+    ) -> None:
+        """entries: (group_id, embedding, group_profile)"""
+        self._clear(max(len(entries), 64))
+        for group_id, embedding, profile in entries:
+            self._append(group_id, embedding, profile)
+        self._loaded_at = time.monotonic()
+        self.synced_through = synced_through
+
+    def _append(
+        self,
+        group_id: uuid.UUID,
+        embedding: list[float] | None,
+        profile: dict | None,
+    ) -> None:
+        self._reserve(self._size + 1)
+        row = self._size
+        self._matrix[row] = self._to_unit_vector(embedding)
+        self._id_hi[row] = group_id.int >> 64
+        self._id_lo[row] = group_id.int & 0xFFFFFFFFFFFFFFFF
+        self._ids.append(group_id)
+        self._keys.append((frozenset(), frozenset(), None))
+        self._rows[group_id] = row
+        self._size += 1
+        self._set_profile(row, profile)
+
+    def upsert(
+        self,
+        group_id: uuid.UUID,
+        embedding: list[float] | None,
+        profile: dict | None,
+    ) -> None:
+        if not self.is_loaded:
+            return
+        row = self._rows.get(group_id)
+        if row is None:
+            self._append(group_id, embedding, profile)
+            return
+        self._matrix[row] = self._to_unit_vector(embedding)
+        self._set_profile(row, profile)
+
+    def set_profile(self, group_id: uuid.UUID, profile: dict | None) -> None:
+        """임베딩은 두고 공개 여부/필터 키만 바꾼다."""
+        row = self._rows.get(group_id)
+        if row is not None:
+            self._set_profile(row, profile)
+
+    def remove(self, group_id: uuid.UUID) -> None:
+        row = self._rows.pop(group_id, None)
+        if row is None:
+            return
+        last = self._size - 1
+        self._set_keys(row, self._keys[row], False)
+        if row != last:
+            moved_id = self._ids[last]
+            moved_keys = self._keys[last]
+            self._set_keys(last, moved_keys, False)
+            self._set_keys(row, moved_keys, True)
+            self._matrix[row] = self._matrix[last]
+            self._public[row] = self._public[last]
+            self._id_hi[row] = self._id_hi[last]
+            self._id_lo[row] = self._id_lo[last]
+            self._ids[row] = moved_id
+            self._keys[row] = moved_keys
+            self._rows[moved_id] = row
+        self._ids.pop()
+        self._keys.pop()
+        self._matrix[last] = 0.0
+        self._public[last] = False
+        self._size -= 1
+
+    def _filter_mask(self, filters: GroupFilters) -> np.ndarray:
+        size = self._size
+        allowed = np.ones(size, dtype=bool)
+        tags = [tag for tag in filters.tags if tag]
+        if tags:
+            # tags 에 전부 있거나 interests 에 전부 있는 그룹 (group_filter_clauses 와 같다)
+            in_tags = np.ones(size, dtype=bool)
+            in_interests = np.ones(size, dtype=bool)
+            for tag in tags:
+                tag_mask = self._tags.get(tag)
+                interest_mask = self._interests.get(tag)
+                in_tags &= tag_mask[:size] if tag_mask is not None else False
+                in_interests &= interest_mask[:size] if interest_mask is not None else False
+            allowed &= in_tags | in_interests
+        if filters.region:
+            region_mask = self._regions.get(filters.region)
+            allowed &= region_mask[:size] if region_mask is not None else False
+        if filters.is_public is not None:
+            allowed &= self._public[:size] == filters.is_public
+        return allowed
+
+    def _lowest_ids(self, rows: np.ndarray, count: int) -> np.ndarray:
+        """rows 중 id 가 가장 작은 count 개를 id 오름차순으로."""
+        if len(rows) > count:
+            hi = self._id_hi[rows]
+            # 상위 64비트로 먼저 count 개 남짓으로 줄인 뒤(같은 값은 모두 포함) 정렬한다.
+            cutoff = np.partition(hi, count - 1)[count - 1]
+            rows = rows[hi <= cutoff]
+        order = np.lexsort((self._id_lo[rows], self._id_hi[rows]))
+        return rows[order[:count]]
+
+    def top_k(
+        self,
+        query: list[float] | None,
+        k: int,
+        exclude: set[uuid.UUID] | None = None,
+        after: tuple[float, uuid.UUID] | None = None,
+        filters: GroupFilters | None = None,
+    ) -> list[tuple[uuid.UUID, float]]:
+        """공개 그룹 중 (score 내림차순, id 오름차순) 상위 k 개.
+
+        after 가 있으면 그 (score, id) 다음 순위부터, filters 가 있으면 태그/지역이 맞는 그룹만 고른다.
+        """
+        size = self._size
+        if size == 0 or k <= 0:
+            return []
+        unit_query = self._to_unit_vector(query)
+        scores = self._matrix[:size] @ unit_query
+        valid = self._public[:size].copy()
+        if exclude:
+            rows = [self._rows[group_id] for group_id in exclude if group_id in self._rows]
+            valid[rows] = False
+        if filters is not None:
+            valid &= self._filter_mask(filters)
+        if after is not None:
+            after_score = np.float32(after[0])
+            after_hi = np.uint64(after[1].int >> 64)
+            after_lo = np.uint64(after[1].int & 0xFFFFFFFFFFFFFFFF)
+            hi = self._id_hi[:size]
+            later_id = (hi > after_hi) | ((hi == after_hi) & (self._id_lo[:size] > after_lo))
+            valid &= (scores < after_score) | ((scores == after_score) & later_id)
+        candidates = np.flatnonzero(valid)
+        if len(candidates) == 0:
+            return []
+
+        k = min(k, len(candidates))
+        candidate_scores = scores[candidates]
+        # 경계 점수보다 높은 행은 k 개 미만이고, 경계 점수와 같은 동점 행은 id 순으로 남은 자리를 채운다.
+        threshold = -np.partition(-candidate_scores, k - 1)[k - 1]
+        above = candidates[candidate_scores > threshold]
+        above = above[np.lexsort((self._id_lo[above], self._id_hi[above], -scores[above]))]
+        tied = self._lowest_ids(candidates[candidate_scores == threshold], k - len(above))
+        top = np.concatenate([above, tied])
+        return [(self._ids[row], float(scores[row])) for row in top]
+
+
+group_index = GroupEmbeddingIndex(
+    dim=EMBEDDING_DIM,
+    refresh_seconds=settings.GROUP_INDEX_REFRESH_SECONDS,
+)
+_LOAD_LOCK = asyncio.Lock()
+
+
+async def ensure_group_index(db: AsyncSession) -> GroupEmbeddingIndex:
+    """주기적으로 전체를 다시 읽고, 그 사이에는 다른 워커가 바꾼 그룹만 읽어 반영한다."""
+    if not group_index.is_stale():
+        await _sync_changed_groups(db)
+        return group_index
+    async with _LOAD_LOCK:
+        if not group_index.is_stale():
+            return group_index
+        started = time.perf_counter()
+        # 적재 도중 바뀐 행은 다음 동기화가 다시 읽도록 워터마크를 먼저 잡는다.
+        synced_through = await db.scalar(select(func.max(Group.search_updated_at)))
+        result = await db.execute(
+            select(Group.id, Group.embedding, Group.group_profile).where(
+                Group.is_subgroup == False  # noqa: E712
+            )
+        )
+        entries = [tuple(row) for row in result.all()]
+        group_index.replace_all(entries, synced_through=synced_through)
+        logging.getLogger("uvicorn.error").info(
+            "Group embedding index loaded groups=%d elapsed_ms=%.1f",
+            len(entries),
+            (time.perf_counter() - started) * 1000,
+        )
+    return group_index
+
+
+async def _sync_changed_groups(db: AsyncSession) -> None:
+    """search_updated_at 인덱스로 워터마크 이후 바뀐 그룹만 읽는다 (새 그룹, 공개 여부, 임베딩).
+
+    커밋 순서와 타임스탬프 순서가 다를 수 있어 워터마크보다 조금 앞에서부터 다시 읽는다.
+    """
+    stmt = select(
+        Group.id,
+        Group.embedding,
+        Group.group_profile,
+        Group.is_subgroup,
+        Group.search_updated_at,
+    ).where(Group.search_updated_at.is_not(None))
+    since = group_index.synced_through
+    if since is not None:
+        overlap = timedelta(seconds=settings.GROUP_INDEX_SYNC_OVERLAP_SECONDS)
+        stmt = stmt.where(Group.search_updated_at > since - overlap)
+    result = await db.execute(stmt)
+    for group_id, embedding, profile, is_subgroup, changed_at in result.all():
+        if is_subgroup:
+            group_index.remove(group_id)
+        else:
+            group_index.upsert(group_id, embedding, profile)
+        if since is None or changed_at > since:
+            since = changed_at
+    group_index.synced_through = since
+
+
+def refresh_group_in_index(group: Group, embedding: list[float] | None) -> None:
+    if group.is_subgroup:
+        group_index.remove(group.id)
+        return
+    group_index.upsert(group.id, embedding, group.group_profile)
+
+
+def refresh_group_visibility_in_index(group: Group) -> None:
+    """임베딩은 그대로 두고 공개 여부/필터 키/소그룹 여부만 반영한다. group_profile 이나 is_subgroup 을 바꾼 커밋 뒤에 부른다."""
+    if group.is_subgroup:
+        group_index.remove(group.id)
+        return
+    group_index.set_profile(group.id, group.group_profile)
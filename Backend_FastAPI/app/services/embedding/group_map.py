@@ -7,6 +7,11 @@ import hashlib
 import math
 from typing import Iterable
 
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - numpy는 requirements에 있지만 순수 파이썬 경로를 유지
+    np = None
+
 
 CANVAS_WIDTH = 390.0
 CANVAS_HEIGHT = 520.0
@@ -24,37 +29,74 @@ class GroupMapCache:
     def __init__(self, max_items: int = 128) -> None:
         self._items: OrderedDict[str, dict[str, tuple[float, float]]] = OrderedDict()
         self._max_items = max_items
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
 
     def get(self, key: str) -> dict[str, tuple[float, float]] | None:
         if key not in self._items:
+            self.misses += 1
             return None
+        self.hits += 1
         self._items.move_to_end(key)
         return self._items[key]
 
     def set(self, key: str, value: dict[str, tuple[float, float]]) -> None:
         self._items[key] = value
         self._items.move_to_end(key)
-        if len(self._items) > self._max_items:
+        self._evict()
+
+    def set_max_items(self, max_items: int) -> None:
+        self._max_items = max(1, max_items)
+        self._evict()
+
+    def _evict(self) -> None:
+        while len(self._items) > self._max_items:
             self._items.popitem(last=False)
+            self.evictions += 1
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "size": len(self._items),
+            "max_items": self._max_items,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
 
 
 _CACHE = GroupMapCache()
 
 
+def get_memory_cache() -> GroupMapCache:
+    return _CACHE
+
+
+def build_cache_key(group_id: str, members: Iterable[GroupMapInput]) -> str:
+    return f"{group_id}:{_build_signature(members)}"
+
+
+def compute_group_map_positions(
+    members: Iterable[GroupMapInput],
+) -> dict[str, tuple[float, float]]:
+    # 입력 순서와 무관하게 같은 시그니처면 같은 레이아웃(축 부호 포함)이 나오도록 정렬한다.
+    member_list = sorted(members, key=lambda item: item.user_id)
+    user_ids = [member.user_id for member in member_list]
+    embeddings = [member.embedding for member in member_list]
+    return _compute_positions(user_ids, embeddings)
+
+
 def build_group_map_positions(
     group_id: str,
     members: Iterable[GroupMapInput],
 ) -> dict[str, tuple[float, float]]:
     member_list = list(members)
-    signature = _build_signature(member_list)
-    cache_key = f"{group_id}:{signature}"
+    cache_key = build_cache_key(group_id, member_list)
     cached = _CACHE.get(cache_key)
     if cached is not None:
         return cached
 
-    user_ids = [member.user_id for member in member_list]
-    embeddings = [member.embedding for member in member_list]
-    positions = _compute_positions(user_ids, embeddings)
+    positions = compute_group_map_positions(member_list)
     _CACHE.set(cache_key, positions)
     return positions
 
@@ -86,14 +128,17 @@ def _compute_positions(
     if dim == 0:
         return _circle_layout(user_ids)
 
-    vectors: list[list[float]] = []
-    for emb in embeddings:
-        if emb and len(emb) == dim:
-            vectors.append([float(value) for value in emb])
-        else:
-            vectors.append([0.0] * dim)
+    if np is not None:
+        coords = _pca_2d_numpy(_to_matrix(embeddings, dim))
+    else:
+        vectors: list[list[float]] = []
+        for emb in embeddings:
+            if emb and len(emb) == dim:
+                vectors.append([float(value) for value in emb])
+            else:
+                vectors.append([0.0] * dim)
+        coords = _pca_2d(vectors)
 
-    coords = _pca_2d(vectors)
     if coords is None:
         return _circle_layout(user_ids)
 
@@ -140,6 +185,64 @@ def _pca_2d(vectors: list[list[float]]) -> list[tuple[float, float]] | None:
     return _scale_coords(coords)
 
 
+def _to_matrix(embeddings: list[list[float] | None], dim: int) -> "np.ndarray":
+    matrix = np.zeros((len(embeddings), dim), dtype=np.float32)
+    for index, emb in enumerate(embeddings):
+        if emb and len(emb) == dim:
+            try:
+                matrix[index] = emb
+            except (TypeError, ValueError):
+                continue
+    return matrix
+
+
+def _pca_2d_numpy(matrix: "np.ndarray") -> list[tuple[float, float]] | None:
+    """_pca_2d 와 같은 결과를 내는 벡터화 버전.
+
+    N <= dim 이면 N x N Gram 행렬의 고유분해, 아니면 truncated SVD 로 상위 2개 주성분을 구한다.
+    축의 부호는 멱반복법과 동일하게 첫 번째 멤버의 투영이 양수가 되도록 맞춘다.
+    """
+    count, dim = matrix.shape
+    if count == 0 or dim == 0:
+        return None
+
+    centered = matrix - matrix.mean(axis=0, dtype=np.float64).astype(np.float32)
+    if not np.any(np.abs(centered) > 1e-12):
+        return None
+
+    if count <= dim:
+        gram = (centered @ centered.T).astype(np.float64)
+        eigenvalues, eigenvectors = np.linalg.eigh(gram)
+        order = np.argsort(eigenvalues)[::-1][:2]
+        strengths = np.sqrt(np.clip(eigenvalues[order], 0.0, None))
+        projections = eigenvectors[:, order] * strengths
+        axis1 = None
+        if strengths[0] > 0:
+            axis1 = centered.T.astype(np.float64) @ eigenvectors[:, order[0]] / strengths[0]
+    else:
+        _u, singular, vt = np.linalg.svd(centered.astype(np.float64), full_matrices=False)
+        strengths = singular[:2]
+        projections = centered.astype(np.float64) @ vt[:2].T
+        axis1 = vt[0]
+
+    if strengths[0] < 1e-12 or axis1 is None:
+        return None
+
+    x = projections[:, 0]
+    if x[0] < 0:
+        x = -x
+        axis1 = -axis1
+    if len(strengths) > 1 and strengths[1] > strengths[0] * 1e-6:
+        y = projections[:, 1]
+        if y[0] < 0:
+            y = -y
+    else:
+        basis = np.asarray(_orthogonal_basis(axis1.tolist()), dtype=np.float64)
+        y = centered.astype(np.float64) @ basis
+
+    return _scale_coords([(float(a), float(b)) for a, b in zip(x, y)])
+
+
 def _scale_coords(coords: list[tuple[float, float]]) -> list[tuple[float, float]]:
     count = len(coords)
     if count == 0:
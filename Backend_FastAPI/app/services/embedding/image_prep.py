@@ -0,0 +1,73 @@
+"""캡셔닝/썸네일용 이미지 전처리.
+
+큰 JPEG 는 PIL draft() 로 DCT 단계에서 축소 디코드하고, 결과를 업로드 파일 옆에
+`{stem}.thumb.jpg` 로 저장해 다음 캡셔닝과 썸네일 응답이 작은 파일만 읽게 한다.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+from pathlib import Path
+import uuid
+
+from PIL import Image, ImageOps
+
+# BLIP 입력(384x384)보다 조금 크게 두어 썸네일 표시에도 쓸 수 있게 한다.
+DERIVATIVE_MAX_SIDE = 512
+DERIVATIVE_SUFFIX = ".thumb.jpg"
+
+
+def derivative_path(image_path: Path) -> Path:
+    return image_path.with_name(f"{image_path.stem}{DERIVATIVE_SUFFIX}")
+
+
+def derivative_url(file_url: str) -> str:
+    head, _, name = file_url.rpartition("/")
+    stem = name.rsplit(".", 1)[0] if "." in name else name
+    return f"{head}/{stem}{DERIVATIVE_SUFFIX}"
+
+
+def is_derivative(image_path: Path) -> bool:
+    return image_path.name.endswith(DERIVATIVE_SUFFIX)
+
+
+def _decode_reduced(image_path: Path, max_side: int) -> Image.Image:
+    with Image.open(image_path) as raw:
+        # JPEG 는 1/2, 1/4, 1/8 스케일로 바로 디코드된다 (다른 포맷에서는 무시됨).
+        raw.draft("RGB", (max_side, max_side))
+        image = ImageOps.exif_transpose(raw)
+        image = image.convert("RGB")
+    image.thumbnail((max_side, max_side), Image.BILINEAR)
+    return image
+
+
+def ensure_derivative(image_path: Path, max_side: int = DERIVATIVE_MAX_SIDE) -> Path:
+    """저해상도 파생본을 만들고 경로를 돌려준다. 이미 있으면 그대로 쓴다."""
+    target = derivative_path(image_path)
+    if target.exists() and target.stat().st_mtime >= image_path.stat().st_mtime:
+        return target
+    image = _decode_reduced(image_path, max_side)
+    tmp_path = target.with_name(f".{target.name}.{uuid.uuid4().hex}.tmp")
+    try:
+        image.save(tmp_path, format="JPEG", quality=85, optimize=True)
+        os.replace(tmp_path, target)
+    finally:
+        tmp_path.unlink(missing_ok=True)
+    return target
+
+
+def load_caption_image(image_path: str | Path) -> Image.Image:
+    """캡셔닝 입력 이미지. 파생본을 우선 쓰고, 만들 수 없으면 축소 디코드한 원본을 쓴다."""
+    path = Path(image_path)
+    if is_derivative(path):
+        return _decode_reduced(path, DERIVATIVE_MAX_SIDE)
+    try:
+        small = ensure_derivative(path)
+    except OSError as exc:
+        logging.getLogger("uvicorn.error").warning(
+            "Derivative write failed for %s: %s", path.name, exc
+        )
+        return _decode_reduced(path, DERIVATIVE_MAX_SIDE)
+    with Image.open(small) as image:
+        return image.convert("RGB")
@@ -0,0 +1,190 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+from typing import Iterable, Protocol
+import uuid
+
+from sqlalchemy import delete, func, select, update
+from sqlalchemy.dialects.postgresql import insert
+
+from app.core.config import settings
+from app.db.session import AsyncSessionLocal
+from app.models.group_map_layout import GroupMapLayout
+from app.services.embedding.group_map import (
+    GroupMapCache,
+    GroupMapInput,
+    build_cache_key,
+    compute_group_map_positions,
+    get_memory_cache,
+)
+
+Positions = dict[str, tuple[float, float]]
+
+
+class LayoutCacheBackend(Protocol):
+    name: str
+
+    async def get(self, key: str) -> Positions | None: ...
+
+    async def set(self, key: str, group_id: str, positions: Positions) -> None: ...
+
+    def stats(self) -> dict[str, int | str]: ...
+
+
+class MemoryLayoutCache:
+    name = "memory"
+
+    def __init__(self, cache: GroupMapCache) -> None:
+        self._cache = cache
+
+    async def get(self, key: str) -> Positions | None:
+        return self._cache.get(key)
+
+    async def set(self, key: str, group_id: str, positions: Positions) -> None:
+        self._cache.set(key, positions)
+
+    def stats(self) -> dict[str, int | str]:
+        return {"backend": self.name, **self._cache.stats()}
+
+
+class PostgresLayoutCache:
+    """워커/재시작 간에 공유되는 group_map_layouts 테이블 캐시 (last_used_at 기준 LRU)."""
+
+    name = "postgres"
+
+    def __init__(self, max_rows: int, evict_every: int = 100) -> None:
+        self._max_rows = max(1, max_rows)
+        self._evict_every = max(1, evict_every)
+        self._writes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.errors = 0
+
+    async def get(self, key: str) -> Positions | None:
+        try:
+            async with AsyncSessionLocal() as session:
+                result = await session.execute(
+                    update(GroupMapLayout)
+                    .where(GroupMapLayout.cache_key == key)
+                    .values(last_used_at=func.now())
+                    .returning(GroupMapLayout.positions)
+                )
+                raw = result.scalar_one_or_none()
+                await session.commit()
+        except Exception as exc:
+            self.errors += 1
+            logging.getLogger("uvicorn.error").warning(
+                "Layout cache read failed key=%s error=%s", key, exc
+            )
+            return None
+        if raw is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return {
+            user_id: (float(coords[0]), float(coords[1]))
+            for user_id, coords in raw.items()
+        }
+
+    async def set(self, key: str, group_id: str, positions: Positions) -> None:
+        payload = {user_id: [x, y] for user_id, (x, y) in positions.items()}
+        self._writes += 1
+        try:
+            async with AsyncSessionLocal() as session:
+                stmt = insert(GroupMapLayout).values(
+                    cache_key=key,
+                    group_id=uuid.UUID(group_id),
+                    positions=payload,
+                )
+                stmt = stmt.on_conflict_do_update(
+                    index_elements=[GroupMapLayout.cache_key],
+                    set_={"positions": payload, "last_used_at": func.now()},
+                )
+                await session.execute(stmt)
+                evicted = 0
+                # 정렬 스캔 비용을 줄이기 위해 eviction 은 evict_every 번 쓰기마다 한 번만 한다.
+                if self._writes % self._evict_every == 0:
+                    stale = (
+                        select(GroupMapLayout.cache_key)
+                        .order_by(GroupMapLayout.last_used_at.desc())
+                        .offset(self._max_rows)
+                    )
+                    result = await session.execute(
+                        delete(GroupMapLayout).where(GroupMapLayout.cache_key.in_(stale))
+                    )
+                    evicted = result.rowcount or 0
+                await session.commit()
+        except Exception as exc:
+            self.errors += 1
+            logging.getLogger("uvicorn.error").warning(
+                "Layout cache write failed key=%s error=%s", key, exc
+            )
+            return
+        self.evictions += evicted
+
+    def stats(self) -> dict[str, int | str]:
+        return {
+            "backend": self.name,
+            "max_rows": self._max_rows,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "errors": self.errors,
+        }
+
+
+class TieredLayoutCache:
+    """앞 tier부터 조회하고, 뒤 tier에서 찾은 값은 앞 tier로 올린다."""
+
+    def __init__(self, tiers: list[LayoutCacheBackend]) -> None:
+        self._tiers = tiers
+
+    async def get(self, key: str, group_id: str) -> Positions | None:
+        for depth, tier in enumerate(self._tiers):
+            positions = await tier.get(key)
+            if positions is None:
+                continue
+            for upper in self._tiers[:depth]:
+                await upper.set(key, group_id, positions)
+            return positions
+        return None
+
+    async def set(self, key: str, group_id: str, positions: Positions) -> None:
+        for tier in self._tiers:
+            await tier.set(key, group_id, positions)
+
+    def stats(self) -> list[dict[str, int | str]]:
+        return [tier.stats() for tier in self._tiers]
+
+
+def _build_layout_cache() -> TieredLayoutCache:
+    memory_cache = get_memory_cache()
+    memory_cache.set_max_items(settings.GROUP_MAP_CACHE_MAX_ITEMS)
+    tiers: list[LayoutCacheBackend] = [MemoryLayoutCache(memory_cache)]
+    if (settings.GROUP_MAP_CACHE_BACKEND or "").lower() == "postgres":
+        tiers.append(PostgresLayoutCache(settings.GROUP_MAP_CACHE_MAX_ROWS))
+    return TieredLayoutCache(tiers)
+
+
+_LAYOUT_CACHE = _build_layout_cache()
+
+
+def get_layout_cache() -> TieredLayoutCache:
+    return _LAYOUT_CACHE
+
+
+async def resolve_group_map_positions(
+    group_id: str,
+    members: Iterable[GroupMapInput],
+) -> Positions:
+    member_list = list(members)
+    cache_key = build_cache_key(group_id, member_list)
+    cached = await _LAYOUT_CACHE.get(cache_key, group_id)
+    if cached is not None:
+        return cached
+
+    positions = await asyncio.to_thread(compute_group_map_positions, member_list)
+    await _LAYOUT_CACHE.set(cache_key, group_id, positions)
+    return positions
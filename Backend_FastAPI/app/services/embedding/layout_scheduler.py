@@ -0,0 +1,109 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import uuid
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.db.session import AsyncSessionLocal
+from app.groups.membership import list_group_members, list_member_group_ids
+from app.services.embedding.group_map import GroupMapInput
+from app.services.embedding.layout_cache import resolve_group_map_positions
+
+
+async def load_group_map_inputs(
+    db: AsyncSession,
+    group_id: uuid.UUID,
+) -> list[GroupMapInput]:
+    return [
+        GroupMapInput(
+            user_id=str(member.member_id),
+            embedding=list(member.embedding) if member.embedding else None,
+            updated_at=member.embedding_updated_at,
+        )
+        for member in await list_group_members(db, group_id)
+    ]
+
+
+class LayoutScheduler:
+    """그룹 멤버/임베딩 변경 시 레이아웃을 요청 경로 밖에서 미리 계산해 캐시를 데운다.
+
+    같은 그룹에 대한 연속 호출은 debounce_seconds 동안 하나로 합쳐진다.
+    """
+
+    def __init__(self, debounce_seconds: float, enabled: bool = True) -> None:
+        self._debounce_seconds = max(0.0, debounce_seconds)
+        self._enabled = enabled
+        self._pending: dict[str, asyncio.Task] = {}
+        self._running: set[asyncio.Task] = set()
+
+    def _spawn(self, coro) -> asyncio.Task | None:
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            coro.close()
+            return None
+        task = loop.create_task(coro)
+        self._running.add(task)
+        task.add_done_callback(self._running.discard)
+        return task
+
+    def schedule(self, group_id: uuid.UUID | str) -> None:
+        if not self._enabled:
+            return
+        key = str(group_id)
+        existing = self._pending.pop(key, None)
+        if existing is not None and not existing.done():
+            existing.cancel()
+        task = self._spawn(self._run_after_delay(key))
+        if task is not None:
+            self._pending[key] = task
+
+    def schedule_for_user(self, user_id: uuid.UUID) -> None:
+        """사용자가 속한 그룹들의 레이아웃을 다시 계산한다. 임베딩을 쓴 트랜잭션이 커밋된 뒤에 부른다."""
+        if not self._enabled:
+            return
+        self._spawn(self._schedule_user_groups(user_id))
+
+    async def _schedule_user_groups(self, user_id: uuid.UUID) -> None:
+        # 그룹별 schedule() 이 debounce 로 합쳐 주므로 여기서는 기다리지 않는다.
+        try:
+            async with AsyncSessionLocal() as session:
+                group_ids = await list_member_group_ids(session, user_id)
+        except Exception as exc:
+            logging.getLogger("uvicorn.error").warning(
+                "Layout precompute lookup failed user_id=%s error=%s", user_id, exc
+            )
+            return
+        for group_id in group_ids:
+            self.schedule(group_id)
+
+    async def _run_after_delay(self, key: str) -> None:
+        await asyncio.sleep(self._debounce_seconds)
+        if self._pending.get(key) is asyncio.current_task():
+            self._pending.pop(key, None)
+        logger = logging.getLogger("uvicorn.error")
+        try:
+            async with AsyncSessionLocal() as session:
+                members = await load_group_map_inputs(session, uuid.UUID(key))
+            if members:
+                await resolve_group_map_positions(key, members)
+        except Exception as exc:
+            logger.warning("Layout precompute failed group_id=%s error=%s", key, exc)
+            return
+        logger.info("Layout precomputed group_id=%s members=%d", key, len(members))
+
+    async def shutdown(self) -> None:
+        tasks = list(self._running)
+        for task in tasks:
+            task.cancel()
+        self._pending.clear()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+
+layout_scheduler = LayoutScheduler(
+    debounce_seconds=settings.LAYOUT_PRECOMPUTE_DEBOUNCE_SECONDS,
+    enabled=settings.LAYOUT_PRECOMPUTE_ENABLED,
+)
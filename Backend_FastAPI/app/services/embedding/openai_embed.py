@@ -1,9 +1,11 @@
 import hashlib
 import random
 
-import httpx
-
 from app.core.config import settings
+from app.core.http import http_clients
+from app.services.embedding.composer import compute_source_hash
+from app.services.embedding.embed_batcher import EmbeddingBatcher
+from app.services.embedding.embedding_cache import embedding_cache
 
 MODEL_NAME = settings.OPENAI_EMBED_MODEL or "text-embedding-3-small"
 MODEL_VERSION = settings.OPENAI_EMBED_MODEL_VERSION
@@ -17,23 +19,49 @@ def _fallback_embedding(text: str) -> list[float]:
     return [rng.uniform(-1, 1) for _ in range(EMBEDDING_DIM)]
 
 
-async def embed_text(text: str) -> tuple[list[float], str, str | None]:
+REQUEST_DIMENSIONS = EMBEDDING_DIM if MODEL_NAME.startswith("text-embedding-3-") else None
+
+_BATCHER: EmbeddingBatcher | None = None
+
+
+def get_embedding_batcher() -> EmbeddingBatcher | None:
+    global _BATCHER
     api_key = settings.OPENAI_API_KEY
     if not api_key:
+        return None
+    if _BATCHER is None:
+        _BATCHER = EmbeddingBatcher(
+            api_key=api_key,
+            model=MODEL_NAME,
+            dimensions=REQUEST_DIMENSIONS,
+            max_batch_size=settings.EMBED_BATCH_MAX_SIZE,
+            max_wait_seconds=settings.EMBED_BATCH_WAIT_MS / 1000,
+            client_provider=lambda: http_clients.get("openai"),
+        )
+    return _BATCHER
+
+
+async def close_embedding_batcher() -> None:
+    global _BATCHER
+    if _BATCHER is not None:
+        await _BATCHER.aclose()
+        _BATCHER = None
+
+
+async def embed_text(text: str) -> tuple[list[float], str, str | None]:
+    batcher = get_embedding_batcher()
+    if batcher is None:
         return _fallback_embedding(text), MODEL_NAME, "mock"
 
-    payload: dict[str, object] = {"model": MODEL_NAME, "input": text}
-    if MODEL_NAME.startswith("text-embedding-3-"):
-        payload["dimensions"] = EMBEDDING_DIM
-    headers = {"Authorization": f"Bearer {api_key}"}
-    async with httpx.AsyncClient(timeout=30) as client:
-        response = await client.post(
-            "https://api.openai.com/v1/embeddings",
-            json=payload,
-            headers=headers,
-        )
-        response.raise_for_status()
-        data = response.json()
+    if not settings.EMBEDDING_CACHE_ENABLED:
+        return await batcher.embed(text), MODEL_NAME, MODEL_VERSION
+
+    source_hash = compute_source_hash(text)
+    dimensions = REQUEST_DIMENSIONS or 0
+    cached = await embedding_cache.get(MODEL_NAME, dimensions, source_hash)
+    if cached is not None:
+        return cached, MODEL_NAME, MODEL_VERSION
 
-    embedding = data["data"][0]["embedding"]
+    embedding = await batcher.embed(text)
+    await embedding_cache.set(MODEL_NAME, dimensions, source_hash, embedding, MODEL_VERSION)
     return embedding, MODEL_NAME, MODEL_VERSION
@@ -0,0 +1,363 @@
+from __future__ import annotations
+
+import asyncio
+from collections import Counter
+from collections.abc import Awaitable, Callable
+import logging
+from pathlib import Path
+import uuid
+
+from sqlalchemy import select, update
+
+from app.core.config import settings
+from app.core.user_cache import invalidate_user
+from app.db.session import AsyncSessionLocal
+from app.models.photo import UserPhoto
+from app.models.user import User
+from app.services.embedding.caption_batcher import caption_batcher
+from app.services.embedding.caption_cache import caption_cache
+from app.services.embedding.caption_executor import captioning_ready
+from app.services.embedding.captioning import fallback_caption
+from app.services.embedding.composer import build_final_text
+from app.services.embedding.embedding_log import log_embedding_io
+from app.services.embedding.enrichment import CaptionEnrichment, enrich_captions
+from app.services.embedding.layout_scheduler import layout_scheduler
+from app.services.embedding.openai_embed import embed_text
+from app.services.embedding.repo import (
+    create_embedding,
+    deactivate_embeddings,
+    upsert_image_caption,
+)
+
+
+CaptionData = tuple[str, str, str, str, list[str]]
+
+
+async def _caption_one(disk_path: Path, timeout_caption: int) -> tuple[str, str, str, bool]:
+    logger = logging.getLogger("uvicorn.error")
+    fallback = fallback_caption(str(disk_path))
+    try:
+        logger.info("Captioning start image=%s", disk_path.name)
+        caption_raw_en, model_name, model_version = await asyncio.wait_for(
+            caption_batcher.caption(str(disk_path)), timeout=timeout_caption
+        )
+        logger.info("Captioning done image=%s", disk_path.name)
+    except asyncio.TimeoutError:
+        logger.warning("Captioning timed out for %s", disk_path.name)
+        return fallback, "fallback", "fallback", False
+    except Exception as exc:
+        logger.warning("Captioning failed for %s: %s", disk_path.name, exc)
+        return fallback, "fallback", "fallback", False
+    return caption_raw_en, model_name, model_version, caption_raw_en != fallback
+
+
+async def _no_cache() -> None:
+    return None
+
+
+async def _enrich_with_timeout(captions: list[str], timeout: int) -> list[CaptionEnrichment]:
+    try:
+        return await asyncio.wait_for(enrich_captions(captions), timeout=timeout)
+    except asyncio.TimeoutError:
+        logging.getLogger("uvicorn.error").warning(
+            "Caption enrichment timed out images=%d", len(captions)
+        )
+        return [CaptionEnrichment(caption_ko=caption, tags=[], ok=False) for caption in captions]
+
+
+_STAGE_DONE = object()
+
+
+async def generate_caption_data(
+    photos: list[tuple[Path, str | None]],
+    timeout_caption: int = 30,
+    timeout_enrich: int = 30,
+    on_result: Callable[[int, CaptionData], Awaitable[None]] | None = None,
+) -> list[CaptionData]:
+    """사진들의 (caption_raw_en, caption_ko, model_name, model_version, interest_tags).
+
+    캐시 hit 은 바로 쓰고, 나머지는 캡셔닝 -> 번역/취미 추정 -> 저장(on_result) 단계를
+    bounded queue 로 이어 붙여, 앞 사진의 LLM 호출과 뒤 사진의 BLIP forward 가 겹치게 한다.
+    """
+    logger = logging.getLogger("uvicorn.error")
+    results: list[CaptionData | None] = [None] * len(photos)
+    cached_entries = await asyncio.gather(
+        *(
+            caption_cache.get(content_hash) if content_hash else _no_cache()
+            for _, content_hash in photos
+        )
+    )
+    pending: list[int] = []
+    for position, cached in enumerate(cached_entries):
+        if cached is None:
+            pending.append(position)
+            continue
+        logger.info("Caption cache hit image=%s", photos[position][0].name)
+        results[position] = (
+            cached.caption_raw_en,
+            cached.caption_ko,
+            cached.model_name,
+            cached.model_version,
+            cached.interest_tags,
+        )
+        if on_result is not None:
+            await on_result(position, results[position])
+    if not pending:
+        return results
+
+    # 다른 요청과 한 배치로 묶여 forward 되므로 배치 크기에 비례해 기다린다.
+    timeout_caption = max(timeout_caption, 5 * settings.CAPTION_BATCH_MAX_SIZE)
+    if not captioning_ready():
+        timeout_caption = max(timeout_caption, 180)
+        logger.info("Captioning warm-up detected, extending timeout to %ss", timeout_caption)
+
+    queue_size = max(1, settings.CAPTION_PIPELINE_QUEUE_SIZE)
+    captioned_queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+    enriched_queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+    enrich_batch_size = max(1, settings.CAPTION_ENRICH_BATCH_SIZE)
+
+    async def caption_stage() -> None:
+        slots = asyncio.Semaphore(max(1, settings.CAPTION_PIPELINE_CAPTION_CONCURRENCY))
+
+        async def caption(position: int) -> None:
+            async with slots:
+                captioned = await _caption_one(photos[position][0], timeout_caption)
+            await captioned_queue.put((position, captioned))
+
+        await asyncio.gather(*(caption(position) for position in pending))
+        await captioned_queue.put(_STAGE_DONE)
+
+    async def enrich_stage() -> None:
+        slots = asyncio.Semaphore(max(1, settings.CAPTION_PIPELINE_ENRICH_CONCURRENCY))
+
+        async def enrich(chunk: list[tuple[int, tuple[str, str, str, bool]]]) -> None:
+            async with slots:
+                enrichments = await _enrich_with_timeout(
+                    [captioned[0] for _, captioned in chunk], timeout_enrich
+                )
+            for (position, captioned), enrichment in zip(chunk, enrichments):
+                await enriched_queue.put((position, captioned, enrichment))
+
+        async with asyncio.TaskGroup() as group:
+            chunk: list[tuple[int, tuple[str, str, str, bool]]] = []
+            while True:
+                item = await captioned_queue.get()
+                if item is _STAGE_DONE:
+                    break
+                chunk.append(item)
+                # 캡션 배치 하나가 다 들어왔거나(큐가 비었거나) 청크가 차면 바로 보낸다.
+                if len(chunk) >= enrich_batch_size or captioned_queue.empty():
+                    group.create_task(enrich(chunk))
+                    chunk = []
+            if chunk:
+                group.create_task(enrich(chunk))
+        await enriched_queue.put(_STAGE_DONE)
+
+    async def persist_stage() -> None:
+        while True:
+            item = await enriched_queue.get()
+            if item is _STAGE_DONE:
+                return
+            position, (caption_raw_en, model_name, model_version, captioned_ok), enrichment = item
+            interest_tags = enrichment.tags
+            caption_ko = enrichment.caption_ko
+            if interest_tags:
+                caption_ko = f"{caption_ko} | 취미 추정: {', '.join(interest_tags)}"
+            data = (caption_raw_en, caption_ko, model_name, model_version, interest_tags)
+            results[position] = data
+
+            # fallback 캡션/번역이 섞인 결과는 캐시하지 않는다.
+            content_hash = photos[position][1]
+            if content_hash and captioned_ok and enrichment.ok:
+                await caption_cache.set(
+                    content_hash,
+                    caption_raw_en=caption_raw_en,
+                    caption_ko=caption_ko,
+                    model_version=model_version,
+                    interest_tags=interest_tags,
+                )
+            if on_result is not None:
+                await on_result(position, data)
+
+    async with asyncio.TaskGroup() as group:
+        group.create_task(caption_stage())
+        group.create_task(enrich_stage())
+        group.create_task(persist_stage())
+    return results
+
+
+async def process_photo_captions(
+    user_id: str,
+    photo_jobs: list[tuple[uuid.UUID, Path]],
+    incoming_tags: list[str],
+    compute_embedding: bool,
+) -> None:
+    if not photo_jobs:
+        return
+    logger = logging.getLogger("uvicorn.error")
+    try:
+        async with AsyncSessionLocal() as session:
+            try:
+                user_uuid = uuid.UUID(user_id)
+            except ValueError:
+                logger.warning("Background captioning invalid user_id=%s", user_id)
+                return
+            result = await session.execute(
+                select(User.id, User.nickname, User.profile_data).where(User.id == user_uuid)
+            )
+            row = result.one_or_none()
+            if not row:
+                logger.warning("Background captioning missing user_id=%s", user_id)
+                return
+            _, user_nickname, user_profile_data = row
+            hash_result = await session.execute(
+                select(UserPhoto.id, UserPhoto.content_hash).where(
+                    UserPhoto.id.in_([photo_id for photo_id, _ in photo_jobs])
+                )
+            )
+            content_hashes = dict(hash_result.all())
+            batch_captions: list[str] = []
+            suggested_tag_counts: Counter[str] = Counter()
+
+            async def store_caption(position: int, data: CaptionData) -> None:
+                caption_raw_en, caption_ko, caption_model_name, caption_model_version, _ = data
+                await upsert_image_caption(
+                    session,
+                    image_id=photo_jobs[position][0],
+                    caption_raw_en=caption_raw_en,
+                    caption_ko=caption_ko,
+                    model_name=caption_model_name,
+                    model_version=caption_model_version,
+                )
+
+            caption_results = await generate_caption_data(
+                [(disk_path, content_hashes.get(photo_id)) for photo_id, disk_path in photo_jobs],
+                on_result=store_caption,
+            )
+            for _, caption_ko, _, _, interest_tags in caption_results:
+                if interest_tags:
+                    suggested_tag_counts.update(interest_tags)
+                batch_captions.append(caption_ko)
+
+            await session.commit()
+
+            if not compute_embedding:
+                return
+
+            selected_tags: set[str] = set(str(item) for item in incoming_tags if item)
+            if user_profile_data:
+                for key in ("tags", "interests", "photo_interests", "hobbies", "selected_tags"):
+                    value = user_profile_data.get(key)
+                    if isinstance(value, list):
+                        selected_tags.update(str(item) for item in value if item)
+
+            suggested_tags = [
+                tag for tag, _count in suggested_tag_counts.most_common()
+                if tag not in selected_tags
+            ][:5]
+            profile_data = dict(user_profile_data or {})
+            profile_data["suggested_tags"] = suggested_tags
+            await session.execute(
+                update(User)
+                .where(User.id == user_uuid)
+                .values(profile_data=profile_data)
+            )
+            await session.commit()
+            invalidate_user(user_uuid)
+
+            if batch_captions or selected_tags:
+                user_description = None
+                if user_profile_data:
+                    user_description = user_profile_data.get("bio") or user_profile_data.get("description")
+                unique_captions: list[str] = []
+                seen: set[str] = set()
+                for caption in batch_captions:
+                    if caption and caption not in seen:
+                        seen.add(caption)
+                        unique_captions.append(caption)
+                image_captions_for_embedding = unique_captions
+                final_text = build_final_text(
+                    selected_tags=list(selected_tags)[:10],
+                    user_description=user_description,
+                    image_captions=image_captions_for_embedding,
+                )
+                try:
+                    embedding, model_name, model_version = await embed_text(final_text)
+                except Exception as exc:
+                    logger.warning(
+                        "Embedding generation failed user_id=%s error=%s",
+                        user_id,
+                        exc,
+                    )
+                else:
+                    await deactivate_embeddings(session, user_uuid)
+                    await create_embedding(
+                        session,
+                        user_id=user_uuid,
+                        embedding=embedding,
+                    )
+                    await session.commit()
+                    invalidate_user(user_uuid)
+                    layout_scheduler.schedule_for_user(user_uuid)
+                    log_embedding_io(
+                        user_name=user_nickname,
+                        user_id=str(user_uuid),
+                        input_text=final_text,
+                        image_captions=image_captions_for_embedding,
+                        image_tags=suggested_tags,
+                        embedding=embedding,
+                        model_name=model_name,
+                        model_version=model_version,
+                    )
+            if compute_embedding:
+                profile_data = dict(profile_data)
+                profile_data["captioning_status"] = "done"
+                await session.execute(
+                    update(User)
+                    .where(User.id == user_uuid)
+                    .values(profile_data=profile_data)
+                )
+                await session.commit()
+                invalidate_user(user_uuid)
+            logger.info(
+                "Background captioning completed user_id=%s count=%d",
+                user_id,
+                len(photo_jobs),
+            )
+    except Exception as exc:
+        logger.warning("Background captioning failed user_id=%s error=%s", user_id, exc)
+        raise
+
+
+async def set_captioning_status(user_id: str, status: str) -> None:
+    logger = logging.getLogger("uvicorn.error")
+    try:
+        async with AsyncSessionLocal() as session:
+            try:
+                user_uuid = uuid.UUID(user_id)
+            except ValueError:
+                logger.warning("Invalid user_id for captioning status: %s", user_id)
+                return
+            result = await session.execute(
+                select(User.profile_data).where(User.id == user_uuid)
+            )
+            row = result.one_or_none()
+            if not row:
+                logger.warning("Missing user for captioning status: %s", user_id)
+                return
+            profile_data = dict(row[0] or {})
+            profile_data["captioning_status"] = status
+            await session.execute(
+                update(User)
+                .where(User.id == user_uuid)
+                .values(profile_data=profile_data)
+            )
+            await session.commit()
+            invalidate_user(user_uuid)
+    except Exception as exc:
+        logger.warning(
+            "Failed to update captioning status user_id=%s status=%s error=%s",
+            user_id,
+            status,
+            exc,
+        )
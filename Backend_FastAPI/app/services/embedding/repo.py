@@ -1,14 +1,32 @@
 from dataclasses import dataclass
 from datetime import datetime, timezone
+import json
 import logging
+import re
 import uuid
 
-from sqlalchemy import select, update
+from sqlalchemy import event, or_, select, text, update
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
 
+from app.core.config import settings
+from app.groups.membership import list_group_member_embeddings, list_member_group_ids
+from app.groups.queries import is_public_sql
+from app.models.group import Group
 from app.models.image_caption import ImageCaption
 from app.models.photo import UserPhoto
 from app.models.user import User
+from app.services.embedding.group_index import refresh_group_in_index
+
+
+# 여러 API 워커 중 한 프로세스만 reconcile 을 돌리도록 잡는 pg advisory lock 키
+GROUP_EMBEDDING_RECONCILE_LOCK_ID = 7_245_001
+
+# search_similar_groups 가 쓰는 pgvector 확장 버전 (프로세스당 한 번 조회)
+_PGVECTOR_VERSION: tuple[int, ...] | None = None
+
+# 커밋 전에 인메모리 그룹 인덱스를 바꾸면 롤백된 벡터가 남으므로 세션에 모아 뒀다가 커밋 뒤 반영한다.
+_PENDING_INDEX_REFRESH = "pending_group_index_refresh"
 
 
 @dataclass
@@ -17,6 +35,38 @@ class EmbeddingState:
     updated_at: datetime | None
 
 
+def vector_storage_enabled() -> bool:
+    return (settings.EMBEDDING_STORAGE or "").lower() == "pgvector"
+
+
+def _to_vector_literal(embedding: list[float]) -> str:
+    return "[" + ",".join(repr(float(value)) for value in embedding) + "]"
+
+
+async def _write_vector_column(
+    db: AsyncSession,
+    table: str,
+    row_id: uuid.UUID,
+    embedding: list[float] | None,
+) -> None:
+    if not vector_storage_enabled():
+        return
+    if embedding is None:
+        await db.execute(
+            text(f"UPDATE {table} SET embedding_vec = NULL WHERE id = :id"),
+            {"id": row_id},
+        )
+        return
+    await db.execute(
+        text(
+            f"UPDATE {table} "
+            "SET embedding_vec = CAST(CAST(:vec AS TEXT) AS vector) "
+            "WHERE id = :id"
+        ),
+        {"id": row_id, "vec": _to_vector_literal(embedding)},
+    )
+
+
 async def upsert_image_caption(
     db: AsyncSession,
     image_id: uuid.UUID,
@@ -66,6 +116,20 @@ async def get_active_embedding(
     user_id: uuid.UUID,
 ) -> EmbeddingState | None:
     try:
+        if vector_storage_enabled():
+            result = await db.execute(
+                text(
+                    "SELECT CAST(embedding_vec AS REAL[]), embedding_updated_at "
+                    "FROM users WHERE id = :id"
+                ),
+                {"id": user_id},
+            )
+            row = result.one_or_none()
+            if row and row[0] is not None:
+                return EmbeddingState(
+                    embedding=list(row[0]),
+                    updated_at=row[1],
+                )
         result = await db.execute(
             select(User.embedding, User.embedding_updated_at)
             .where(User.id == user_id)
@@ -87,15 +151,34 @@ async def get_active_embedding(
         return None
 
 
-async def deactivate_embeddings(db: AsyncSession, user_id: uuid.UUID) -> None:
+async def _load_user_embedding(db: AsyncSession, user_id: uuid.UUID) -> list[float] | None:
+    result = await db.execute(select(User.embedding).where(User.id == user_id))
+    return _as_vector(result.scalar_one_or_none())
+
+
+async def _store_user_embedding(
+    db: AsyncSession,
+    user_id: uuid.UUID,
+    embedding: list[float] | None,
+    updated_at: datetime | None,
+) -> None:
     await db.execute(
         update(User)
         .where(User.id == user_id)
         .values(
-            embedding=None,
-            embedding_updated_at=None,
+            embedding=embedding,
+            embedding_updated_at=updated_at,
         )
     )
+    await _write_vector_column(db, "users", user_id, embedding)
+
+
+async def deactivate_embeddings(db: AsyncSession, user_id: uuid.UUID) -> None:
+    previous = await _load_user_embedding(db, user_id)
+    # 그룹 합계를 처음부터 다시 세는 경우에도 옛 벡터가 빠지도록 먼저 지운다.
+    await _store_user_embedding(db, user_id, None, None)
+    if previous is not None:
+        await apply_member_embedding_change(db, user_id, removed=previous)
 
 
 async def create_embedding(
@@ -103,16 +186,346 @@ async def create_embedding(
     user_id: uuid.UUID,
     embedding: list[float],
 ) -> EmbeddingState:
+    now = datetime.now(timezone.utc)
+    await _store_user_embedding(db, user_id, embedding, now)
+    await apply_member_embedding_change(db, user_id, added=_as_vector(embedding))
+    return EmbeddingState(
+        embedding=embedding,
+        updated_at=now,
+    )
+
+
+async def set_group_embedding(
+    db: AsyncSession,
+    group_id: uuid.UUID,
+    embedding: list[float] | None,
+    embedding_sum: list[float] | None = None,
+    embedding_count: int = 0,
+) -> EmbeddingState | None:
     now = datetime.now(timezone.utc)
     await db.execute(
-        update(User)
-        .where(User.id == user_id)
+        update(Group)
+        .where(Group.id == group_id)
         .values(
             embedding=embedding,
             embedding_updated_at=now,
+            embedding_sum=embedding_sum,
+            embedding_count=embedding_count,
         )
     )
+    await _write_vector_column(db, "groups", group_id, embedding)
+    if embedding is None:
+        return None
     return EmbeddingState(
         embedding=embedding,
         updated_at=now,
     )
+
+
+def _as_vector(raw: list[float] | None) -> list[float] | None:
+    if not raw:
+        return None
+    try:
+        return [float(value) for value in raw]
+    except (TypeError, ValueError):
+        return None
+
+
+async def _store_group_totals(
+    db: AsyncSession,
+    group: Group,
+    total: list[float] | None,
+    count: int,
+) -> list[float] | None:
+    if total is None or count <= 0:
+        # 빈 리스트는 "집계됨, 임베딩 있는 멤버 없음"을 뜻한다 (NULL은 미집계).
+        total, count, average = [], 0, None
+    else:
+        average = [value / count for value in total]
+    await set_group_embedding(
+        db,
+        group.id,
+        average,
+        embedding_sum=total,
+        embedding_count=count,
+    )
+    db.sync_session.info.setdefault(_PENDING_INDEX_REFRESH, {})[group.id] = (group, average)
+    return average
+
+
+def _discard_index_refresh(db: AsyncSession, group_id: uuid.UUID) -> None:
+    db.sync_session.info.get(_PENDING_INDEX_REFRESH, {}).pop(group_id, None)
+
+
+@event.listens_for(Session, "after_commit")
+def _apply_index_refreshes(session: Session) -> None:
+    for group, embedding in session.info.pop(_PENDING_INDEX_REFRESH, {}).values():
+        refresh_group_in_index(group, embedding)
+
+
+@event.listens_for(Session, "after_transaction_end")
+def _drop_index_refreshes(session: Session, transaction) -> None:
+    # 커밋이면 after_commit 이 이미 비웠고, 바깥 트랜잭션 롤백이면 여기서 버린다.
+    if transaction.parent is None:
+        session.info.pop(_PENDING_INDEX_REFRESH, None)
+
+
+async def _lock_group(db: AsyncSession, group_id: uuid.UUID) -> Group | None:
+    result = await db.execute(
+        select(Group)
+        .where(Group.id == group_id)
+        .with_for_update()
+        .execution_options(populate_existing=True)
+    )
+    return result.scalar_one_or_none()
+
+
+async def recompute_group_embedding(
+    db: AsyncSession,
+    group_id: uuid.UUID,
+) -> list[float] | None:
+    """멤버 임베딩을 전부 다시 읽어 합/개수/평균을 재계산한다. 커밋은 호출자가 한다."""
+    group = await _lock_group(db, group_id)
+    if group is None:
+        return None
+    total: list[float] | None = None
+    count = 0
+    for raw in await list_group_member_embeddings(db, group_id):
+        vector = _as_vector(raw)
+        if vector is None:
+            continue
+        if total is None:
+            total = list(vector)
+        elif len(vector) != len(total):
+            continue
+        else:
+            for i, value in enumerate(vector):
+                total[i] += value
+        count += 1
+    return await _store_group_totals(db, group, total, count)
+
+
+async def apply_group_embedding_delta(
+    db: AsyncSession,
+    group_id: uuid.UUID,
+    added: list[float] | None = None,
+    removed: list[float] | None = None,
+) -> list[float] | None:
+    """멤버 한 명의 가입/탈퇴/재임베딩을 O(dim)으로 그룹 합계에 반영한다. 커밋은 호출자가 한다.
+
+    호출자는 멤버십/사용자 임베딩 변경을 먼저 DB 에 써 둔다.
+    """
+    group = await _lock_group(db, group_id)
+    if group is None:
+        return None
+    if group.embedding_sum is None:
+        # 아직 집계된 적 없는 그룹은 전체 재계산으로 초기화한다.
+        # 재계산 결과에 이번 변경이 이미 들어 있으므로 added/removed 는 더하지 않는다.
+        return await recompute_group_embedding(db, group_id)
+
+    total = _as_vector(group.embedding_sum)
+    count = group.embedding_count or 0
+    added = _as_vector(added)
+    removed = _as_vector(removed)
+    if removed is not None and total is not None and len(removed) == len(total) and count > 0:
+        total = [value - delta for value, delta in zip(total, removed)]
+        count -= 1
+    if added is not None:
+        if total is None or count == 0:
+            total, count = list(added), 1
+        elif len(added) == len(total):
+            total = [value + delta for value, delta in zip(total, added)]
+            count += 1
+    return await _store_group_totals(db, group, total, count)
+
+
+async def update_group_embedding(
+    db: AsyncSession,
+    group_id: uuid.UUID,
+    added: list[float] | None = None,
+    removed: list[float] | None = None,
+    full: bool = False,
+) -> None:
+    """멤버십 변경과 같은 트랜잭션에서 그룹 임베딩을 갱신한다.
+
+    실패해도 멤버십 변경은 살리도록 savepoint 안에서 실행하고 경고만 남긴다.
+    """
+    # 멤버십 변경을 savepoint 밖에서 먼저 flush 한다: 재계산이 새 멤버십을 읽고,
+    # 임베딩 갱신이 실패해 savepoint 가 롤백돼도 멤버십 변경은 남는다.
+    await db.flush()
+    try:
+        async with db.begin_nested():
+            if full:
+                await recompute_group_embedding(db, group_id)
+            else:
+                await apply_group_embedding_delta(db, group_id, added=added, removed=removed)
+    except Exception as exc:
+        # savepoint 가 롤백됐으니 커밋 뒤 인덱스에도 반영하지 않는다.
+        _discard_index_refresh(db, group_id)
+        logging.getLogger("uvicorn.error").warning(
+            "Failed to update embedding for group_id=%s: %s", group_id, exc
+        )
+
+
+async def apply_member_embedding_change(
+    db: AsyncSession,
+    member_id: uuid.UUID,
+    added: list[float] | None = None,
+    removed: list[float] | None = None,
+) -> None:
+    """앱 사용자/Notion 사용자 임베딩이 바뀌었을 때 속한 모든 그룹 합계에 반영한다. 커밋은 호출자가 한다."""
+    # 락 순서를 고정해 동시 갱신끼리 데드락이 나지 않게 한다.
+    for group_id in sorted(await list_member_group_ids(db, member_id)):
+        await apply_group_embedding_delta(db, group_id, added=added, removed=removed)
+
+
+async def backfill_group_embedding_totals(db: AsyncSession) -> int:
+    """embedding_sum 이 NULL 인(0005 이전에 만든) 그룹과 임베딩을 한 번도 계산하지 않은 그룹을
+    집계해, 요청 경로는 증분 갱신만 타게 한다."""
+    result = await db.execute(
+        select(Group.id)
+        .where(or_(Group.embedding_sum.is_(None), Group.embedding_updated_at.is_(None)))
+        .order_by(Group.id)
+    )
+    group_ids = [row[0] for row in result.all()]
+    for group_id in group_ids:
+        await recompute_group_embedding(db, group_id)
+        await db.commit()
+    return len(group_ids)
+
+
+async def reconcile_group_embeddings(db: AsyncSession) -> int:
+    """누적 합의 부동소수 오차/누락을 바로잡기 위한 전체 재계산 작업.
+
+    그룹마다 커밋해 FOR UPDATE 락을 한 그룹씩만 잡는다.
+    """
+    result = await db.execute(select(Group.id).order_by(Group.id))
+    group_ids = [row[0] for row in result.all()]
+    for group_id in group_ids:
+        await recompute_group_embedding(db, group_id)
+        await db.commit()
+    return len(group_ids)
+
+
+async def _pgvector_version(db: AsyncSession) -> tuple[int, ...]:
+    global _PGVECTOR_VERSION
+    if _PGVECTOR_VERSION is None:
+        raw = await db.scalar(text("SELECT extversion FROM pg_extension WHERE extname = 'vector'"))
+        _PGVECTOR_VERSION = tuple(int(part) for part in re.findall(r"\d+", raw or "0"))
+    return _PGVECTOR_VERSION
+
+
+async def _configure_hnsw_scan(db: AsyncSession, limit: int, filtered: bool) -> bool:
+    """HNSW 스캔은 ef_search 개 후보만 보고 끝나므로, 커서/필터가 후보를 거르면 뒤 페이지가 빈다.
+
+    인덱스 스캔을 껐으면 True (검색 뒤 호출자가 다시 켠다).
+    """
+    # hnsw.ef_search(기본 40)보다 limit이 크면 후보가 잘리므로 같이 올린다.
+    ef_search = max(40, int(limit) * 2)
+    await db.execute(text(f"SET LOCAL hnsw.ef_search = {ef_search}"))
+    if await _pgvector_version(db) >= (0, 8):
+        # 조건에 맞는 행이 limit 개 찰 때까지 거리 순서를 지키며 인덱스를 계속 읽는다.
+        await db.execute(text("SET LOCAL hnsw.iterative_scan = strict_order"))
+        return False
+    if not filtered:
+        return False
+    # 0.8 미만은 반복 스캔이 없으므로 인덱스를 끄고 정확한 정렬로 읽는다.
+    await db.execute(text("SET LOCAL enable_indexscan = off"))
+    return True
+
+
+async def search_similar_groups(
+    db: AsyncSession,
+    query: list[float],
+    limit: int,
+    exclude_member_id: uuid.UUID | None = None,
+    after: tuple[float | None, uuid.UUID] | None = None,
+    tags: list[str] | None = None,
+    region: str | None = None,
+) -> list[tuple[uuid.UUID, float | None]]:
+    """pgvector HNSW 인덱스로 공개 그룹을 (코사인 유사도 내림차순, id) 순으로 조회.
+
+    임베딩이 없는 그룹은 기존 동작처럼 점수 순위 뒤에 id 순으로 채우고 점수를 None 으로 돌려준다.
+    after 는 직전 페이지 마지막 항목의 (점수, id) 이다.
+    """
+    params: dict[str, object] = {
+        "query": _to_vector_literal(query),
+        "limit": limit,
+    }
+    filters = (
+        "WHERE g.is_subgroup = false "
+        f"AND {is_public_sql('g.group_profile')} "
+    )
+    if exclude_member_id is not None:
+        filters += (
+            "AND NOT EXISTS ("
+            "SELECT 1 FROM group_members gm "
+            "WHERE gm.group_id = g.id AND gm.user_id = :member_id) "
+        )
+        params["member_id"] = exclude_member_id
+    tags = [tag for tag in tags or [] if tag]
+    if tags:
+        filters += (
+            "AND (g.group_profile @> CAST(:tags_filter AS jsonb) "
+            "OR g.group_profile @> CAST(:interests_filter AS jsonb)) "
+        )
+        params["tags_filter"] = json.dumps({"tags": tags}, ensure_ascii=False)
+        params["interests_filter"] = json.dumps({"interests": tags}, ensure_ascii=False)
+    if region:
+        filters += "AND g.group_profile ->> 'region' = :region "
+        params["region"] = region
+
+    after_score, after_id = after if after is not None else (None, None)
+    ranked: list[tuple[uuid.UUID, float | None]] = []
+    score_sql = "1 - (g.embedding_vec <=> CAST(CAST(:query AS TEXT) AS vector))"
+    if after is None or after_score is not None:
+        keyset = ""
+        if after is not None:
+            keyset = f"AND ({score_sql} < :after_score OR ({score_sql} = :after_score AND g.id > :after_id)) "
+            params["after_score"] = after_score
+            params["after_id"] = after_id
+        index_scan_disabled = await _configure_hnsw_scan(
+            db,
+            limit,
+            filtered=bool(keyset or tags or region or exclude_member_id is not None),
+        )
+        result = await db.execute(
+            text(
+                f"SELECT g.id, {score_sql} AS score "
+                "FROM groups g "
+                f"{filters}"
+                "AND g.embedding_vec IS NOT NULL "
+                f"{keyset}"
+                "ORDER BY g.embedding_vec <=> CAST(CAST(:query AS TEXT) AS vector), g.id "
+                "LIMIT :limit"
+            ),
+            params,
+        )
+        ranked = [(row[0], float(row[1])) for row in result.all()]
+        if index_scan_disabled:
+            await db.execute(text("SET LOCAL enable_indexscan = on"))
+    remaining = limit - len(ranked)
+    if remaining <= 0:
+        return ranked
+
+    params = {key: value for key, value in params.items() if key not in ("query", "after_score")}
+    params["limit"] = remaining
+    keyset = ""
+    if after is not None and after_score is None:
+        keyset = "AND g.id > :after_id "
+        params["after_id"] = after_id
+    else:
+        params.pop("after_id", None)
+    result = await db.execute(
+        text(
+            "SELECT g.id FROM groups g "
+            f"{filters}"
+            "AND g.embedding_vec IS NULL "
+            f"{keyset}"
+            "ORDER BY g.id "
+            "LIMIT :limit"
+        ),
+        params,
+    )
+    ranked.extend((row[0], None) for row in result.all())
+    return ranked
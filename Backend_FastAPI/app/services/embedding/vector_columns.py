@@ -0,0 +1,66 @@
+"""pgvector embedding_vec 컬럼 DDL (EMBEDDING_STORAGE=pgvector 일 때만).
+
+JSONB embedding 옆의 vector 컬럼은 repo._write_vector_column 이 임베딩을 쓸 때 같이 갱신한다.
+- users: id 로 한 건씩만 읽으므로 컬럼만 두고 ANN 인덱스는 두지 않는다.
+- groups: search_similar_groups 가 HNSW 인덱스로 검색한다.
+- notion_users: 앱이 임베딩을 쓰지 않아 컬럼이 갱신되지 않으므로 두지 않는다.
+
+main 의 startup 헬퍼가 쓰는 현재 스키마다. 마이그레이션은 리비전마다 DDL 을 따로 적어 둔다.
+"""
+
+from __future__ import annotations
+
+from app.services.embedding.openai_embed import EMBEDDING_DIM
+
+VECTOR_TABLES = ("users", "groups")
+VECTOR_INDEX_TABLES = ("groups",)
+UNUSED_VECTOR_TABLES = ("notion_users",)
+
+
+def vector_column_sql(table: str) -> list[str]:
+    """컬럼을 만들고 JSONB embedding 에서 비어 있는 vector 를 채운다."""
+    return [
+        f"ALTER TABLE {table} ADD COLUMN IF NOT EXISTS embedding_vec vector({EMBEDDING_DIM})",
+        f"UPDATE {table} "
+        "SET embedding_vec = CAST(embedding::text AS vector) "
+        "WHERE embedding_vec IS NULL "
+        "  AND jsonb_typeof(embedding) = 'array' "
+        f"  AND jsonb_array_length(embedding) = {EMBEDDING_DIM}",
+    ]
+
+
+def vector_index_sql(table: str) -> str:
+    return (
+        f"CREATE INDEX IF NOT EXISTS ix_{table}_embedding_vec_hnsw "
+        f"ON {table} USING hnsw (embedding_vec vector_cosine_ops)"
+    )
+
+
+def drop_vector_index_sql(table: str) -> str:
+    return f"DROP INDEX IF EXISTS ix_{table}_embedding_vec_hnsw"
+
+
+def drop_vector_column_sql(table: str) -> str:
+    return f"ALTER TABLE {table} DROP COLUMN IF EXISTS embedding_vec"
+
+
+def unused_vector_sql() -> list[str]:
+    """쓰이지 않는 HNSW 인덱스/컬럼 정리 (쓰기 비용만 늘린다)."""
+    statements = [
+        drop_vector_index_sql(table)
+        for table in VECTOR_TABLES
+        if table not in VECTOR_INDEX_TABLES
+    ]
+    for table in UNUSED_VECTOR_TABLES:
+        statements.append(drop_vector_index_sql(table))
+        statements.append(drop_vector_column_sql(table))
+    return statements
+
+
+def embedding_vector_schema_sql() -> list[str]:
+    statements = ["CREATE EXTENSION IF NOT EXISTS vector"]
+    for table in VECTOR_TABLES:
+        statements.extend(vector_column_sql(table))
+    statements.extend(vector_index_sql(table) for table in VECTOR_INDEX_TABLES)
+    statements.extend(unused_vector_sql())
+    return statements
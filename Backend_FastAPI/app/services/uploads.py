@@ -0,0 +1,72 @@
+"""업로드 파일 저장.
+
+UploadFile 을 `await file.read()` 로 조금씩 읽으면서 sha256 을 같이 계산하고,
+디스크 쓰기는 to_thread 로 넘겨 큰 업로드 중에도 이벤트 루프를 막지 않는다.
+같은 디렉터리의 임시 파일에 다 쓴 뒤 os.replace 로 옮기므로, 중간에 실패하거나
+끊긴 업로드가 최종 경로에 반쪽 파일로 남지 않는다.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from dataclasses import dataclass
+import hashlib
+import os
+from pathlib import Path
+from typing import BinaryIO
+import uuid
+
+from fastapi import UploadFile
+
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+
+
+@dataclass(frozen=True)
+class SavedUpload:
+    path: Path
+    content_hash: str
+    size: int
+
+
+def _open_temp(dest: Path) -> tuple[Path, BinaryIO]:
+    dest.parent.mkdir(parents=True, exist_ok=True)
+    temp_path = dest.with_name(f".{dest.name}.{uuid.uuid4().hex}.part")
+    return temp_path, temp_path.open("wb")
+
+
+def _write_chunk(handle: BinaryIO, hasher, chunk: bytes) -> None:
+    handle.write(chunk)
+    hasher.update(chunk)
+
+
+def _commit(handle: BinaryIO, temp_path: Path, dest: Path) -> None:
+    handle.close()
+    os.replace(temp_path, dest)
+
+
+def _discard(handle: BinaryIO, temp_path: Path) -> None:
+    handle.close()
+    temp_path.unlink(missing_ok=True)
+
+
+async def save_upload(
+    file: UploadFile,
+    dest: Path,
+    chunk_size: int = UPLOAD_CHUNK_SIZE,
+) -> SavedUpload:
+    """file 을 dest 에 저장하고 (경로, sha256 hex, 바이트 수) 를 돌려준다."""
+    temp_path, handle = await asyncio.to_thread(_open_temp, dest)
+    hasher = hashlib.sha256()
+    size = 0
+    try:
+        while True:
+            chunk = await file.read(chunk_size)
+            if not chunk:
+                break
+            await asyncio.to_thread(_write_chunk, handle, hasher, chunk)
+            size += len(chunk)
+        await asyncio.to_thread(_commit, handle, temp_path, dest)
+    except BaseException:
+        await asyncio.shield(asyncio.to_thread(_discard, handle, temp_path))
+        raise
+    return SavedUpload(path=dest, content_hash=hasher.hexdigest(), size=size)
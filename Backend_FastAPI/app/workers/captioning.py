@@ -0,0 +1,60 @@
+"""캡셔닝 작업 큐 전용 워커.
+
+API 프로세스의 CAPTION_WORKERS=0 으로 두고 별도 프로세스로 띄운다:
+
+    python -m app.workers.captioning
+"""
+
+import asyncio
+import logging
+import signal
+
+import app.models  # noqa: F401  # ensure models are registered for metadata
+from app.core.config import settings
+from app.core.http import http_clients
+from app.services.embedding.caption_executor import (
+    shutdown_caption_executor,
+    warm_up_captioning,
+)
+from app.services.embedding.caption_queue import CaptionWorkerPool, requeue_stale_jobs
+from app.services.embedding.embedding_log import embedding_log_writer
+from app.services.embedding.layout_scheduler import layout_scheduler
+from app.services.embedding.openai_embed import close_embedding_batcher
+
+
+async def main() -> None:
+    logger = logging.getLogger("uvicorn.error")
+    requeued = await requeue_stale_jobs()
+    if requeued:
+        logger.info("Caption jobs requeued count=%d", requeued)
+
+    pool = CaptionWorkerPool(
+        worker_count=max(1, settings.CAPTION_WORKERS),
+        poll_seconds=settings.CAPTION_JOB_POLL_SECONDS,
+    )
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stop.set)
+
+    http_clients.start()
+    if settings.CAPTION_WARMUP_ON_STARTUP:
+        await warm_up_captioning()
+    pool.start()
+    logger.info("Caption worker started workers=%d", max(1, settings.CAPTION_WORKERS))
+    try:
+        await stop.wait()
+    finally:
+        await pool.stop()
+        shutdown_caption_executor()
+        # 캡션 완료 후 재임베딩/레이아웃 재계산이 남긴 작업도 API 프로세스와 같은 순서로 정리한다.
+        await layout_scheduler.shutdown()
+        await close_embedding_batcher()
+        await http_clients.aclose()
+        await embedding_log_writer.aclose()
+        logger.info("Caption worker stopped")
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(main())
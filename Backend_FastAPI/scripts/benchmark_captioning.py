@@ -0,0 +1,131 @@
+"""CAPTION_BACKEND 별 BLIP 캡셔닝 벤치마크.
+
+고정된 로컬 이미지 세트로 백엔드마다 별도 프로세스에서 지연 시간, 최대 RSS,
+fp32(torch) 대비 캡션 일치도를 비교한다.
+
+    cd Backend_FastAPI
+    python scripts/benchmark_captioning.py --images path/to/images --backends torch,torch_int8,onnx
+"""
+
+import argparse
+import multiprocessing
+from pathlib import Path
+import resource
+import statistics
+import sys
+import time
+
+BASE_DIR = Path(__file__).resolve().parents[1]
+if str(BASE_DIR) not in sys.path:
+    sys.path.insert(0, str(BASE_DIR))
+
+IMAGE_SUFFIXES = {".jpg", ".jpeg", ".png", ".webp", ".bmp"}
+
+
+def _run_backend(backend: str, paths: list[str], batch_size: int, repeat: int, threads: int, queue) -> None:
+    from app.services.embedding import captioning
+
+    captioning.configure_torch_threads(threads)
+    captioning.configure_backend(backend)
+    started = time.perf_counter()
+    if not captioning.warm_up_blip():
+        queue.put({"backend": backend, "error": "model not available"})
+        return
+    load_seconds = time.perf_counter() - started
+
+    batch_seconds: list[float] = []
+    captions: list[str] = []
+    for round_index in range(repeat):
+        round_captions: list[str] = []
+        for offset in range(0, len(paths), batch_size):
+            batch = paths[offset : offset + batch_size]
+            batch_started = time.perf_counter()
+            results = captioning.caption_images(batch)
+            batch_seconds.append(time.perf_counter() - batch_started)
+            round_captions.extend(caption for caption, _, _ in results)
+        if round_index == 0:
+            captions = round_captions
+
+    total_seconds = sum(batch_seconds)
+    queue.put(
+        {
+            "backend": captioning.caption_model_name(),
+            "load_seconds": load_seconds,
+            "images_per_second": len(paths) * repeat / total_seconds if total_seconds else 0.0,
+            "p50_batch_ms": statistics.median(batch_seconds) * 1000,
+            "peak_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+            "captions": captions,
+        }
+    )
+
+
+def _token_jaccard(a: str, b: str) -> float:
+    left, right = set(a.lower().split()), set(b.lower().split())
+    if not left and not right:
+        return 1.0
+    return len(left & right) / len(left | right)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--images", required=True, type=Path, help="이미지 디렉터리")
+    parser.add_argument("--backends", default="torch,torch_int8,onnx")
+    parser.add_argument("--batch-size", type=int, default=8)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--threads", type=int, default=2, help="torch intra-op 스레드 수")
+    parser.add_argument("--limit", type=int, default=32)
+    args = parser.parse_args()
+
+    paths = sorted(
+        str(path)
+        for path in args.images.iterdir()
+        if path.suffix.lower() in IMAGE_SUFFIXES
+    )[: args.limit]
+    if not paths:
+        raise SystemExit(f"No images found in {args.images}")
+
+    backends = [name.strip() for name in args.backends.split(",") if name.strip()]
+    if "torch" not in backends:
+        backends.insert(0, "torch")
+
+    # 백엔드마다 새 프로세스: 모델 메모리와 peak RSS 가 서로 섞이지 않게 한다.
+    context = multiprocessing.get_context("spawn")
+    results: dict[str, dict] = {}
+    for backend in backends:
+        queue = context.Queue()
+        process = context.Process(
+            target=_run_backend,
+            args=(backend, paths, args.batch_size, args.repeat, args.threads, queue),
+        )
+        process.start()
+        results[backend] = queue.get()
+        process.join()
+
+    baseline = results["torch"].get("captions") or []
+    print(f"images={len(paths)} batch_size={args.batch_size} repeat={args.repeat} threads={args.threads}")
+    print(f"{'backend':<20}{'load s':>8}{'img/s':>8}{'p50 ms':>9}{'RSS MB':>9}{'exact':>8}{'jaccard':>9}")
+    for backend in backends:
+        result = results[backend]
+        if "error" in result:
+            print(f"{backend:<20}  {result['error']}")
+            continue
+        captions = result["captions"]
+        exact = sum(a == b for a, b in zip(captions, baseline)) / len(paths) if baseline else 0.0
+        jaccard = (
+            statistics.mean(_token_jaccard(a, b) for a, b in zip(captions, baseline))
+            if baseline
+            else 0.0
+        )
+        print(
+            f"{result['backend']:<20}"
+            f"{result['load_seconds']:>8.1f}"
+            f"{result['images_per_second']:>8.2f}"
+            f"{result['p50_batch_ms']:>9.0f}"
+            f"{result['peak_rss_mb']:>9.0f}"
+            f"{exact:>8.2f}"
+            f"{jaccard:>9.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+import asyncio
+import unittest
+
+from app.services.embedding.caption_batcher import CaptionBatcher
+
+
+class CaptionBatcherTests(unittest.TestCase):
+    def test_concurrent_requests_share_one_forward_pass(self):
+        batches: list[list[str]] = []
+
+        async def runner(paths: list[str]) -> list[tuple[str, str, str]]:
+            batches.append(list(paths))
+            return [(f"caption of {path}", "stub", "v1") for path in paths]
+
+        async def run():
+            batcher = CaptionBatcher(runner, max_batch_size=16, max_wait_seconds=0.01)
+            first_user = batcher.caption_many(["a.jpg", "b.jpg", "c.jpg"])
+            second_user = batcher.caption("d.jpg")
+            return await asyncio.gather(first_user, second_user)
+
+        first, second = asyncio.run(run())
+        self.assertEqual(len(batches), 1)
+        self.assertEqual(sorted(batches[0]), ["a.jpg", "b.jpg", "c.jpg", "d.jpg"])
+        self.assertEqual([caption for caption, _, _ in first], [
+            "caption of a.jpg",
+            "caption of b.jpg",
+            "caption of c.jpg",
+        ])
+        self.assertEqual(second[0], "caption of d.jpg")
+
+    def test_batches_are_capped_at_max_size(self):
+        batches: list[list[str]] = []
+
+        async def runner(paths: list[str]) -> list[tuple[str, str, str]]:
+            batches.append(list(paths))
+            return [(path, "stub", "v1") for path in paths]
+
+        async def run():
+            batcher = CaptionBatcher(runner, max_batch_size=2, max_wait_seconds=10.0)
+            await asyncio.wait_for(batcher.caption_many(["1", "2", "3", "4"]), timeout=1.0)
+
+        asyncio.run(run())
+        self.assertEqual(batches, [["1", "2"], ["3", "4"]])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,70 @@
+import asyncio
+import unittest
+from unittest import mock
+
+from app.core.config import settings
+from app.services.embedding import caption_cache, caption_executor
+
+
+class _Result:
+    def one_or_none(self):
+        return None
+
+
+class _RecordingSession:
+    def __init__(self, statements: list) -> None:
+        self._statements = statements
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *_exc) -> None:
+        return None
+
+    async def execute(self, stmt):
+        self._statements.append(stmt)
+        return _Result()
+
+    async def commit(self) -> None:
+        return None
+
+
+def _caption_model_param(stmt) -> str:
+    params = stmt.compile().params
+    return next(value for key, value in params.items() if key.startswith("caption_model"))
+
+
+class CaptionCacheKeyTest(unittest.TestCase):
+    def test_get_and_set_use_backend_that_actually_ran(self) -> None:
+        statements: list = []
+
+        async def run() -> None:
+            with mock.patch.object(settings, "CAPTION_BACKEND", "onnx"), \
+                    mock.patch.object(settings, "CAPTION_EXECUTOR", "thread"), \
+                    mock.patch.object(caption_executor, "_RESOLVED_MODEL", None), \
+                    mock.patch.object(caption_executor, "_configure_thread_mode"), \
+                    mock.patch.object(
+                        caption_executor,
+                        "caption_images",
+                        return_value=[("a dog", "blip-base", "v1")],
+                    ), \
+                    mock.patch.object(
+                        caption_cache,
+                        "AsyncSessionLocal",
+                        lambda: _RecordingSession(statements),
+                    ):
+                self.assertEqual(caption_cache.current_caption_models()[0], "blip-base-onnx")
+                # onnx 준비에 실패해 torch 로 돈 배치
+                await caption_executor.run_caption_batch(["dog.jpg"])
+                cache = caption_cache.CaptionCache()
+                await cache.get("hash")
+                await cache.set(
+                    "hash",
+                    caption_raw_en="a dog",
+                    caption_ko="개",
+                    model_version="v1",
+                    interest_tags=[],
+                )
+
+        asyncio.run(run())
+        self.assertEqual([_caption_model_param(stmt) for stmt in statements], ["blip-base", "blip-base"])
@@ -0,0 +1,30 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+import unittest
+from unittest import mock
+
+from app.core.config import settings
+from app.services.embedding import caption_executor
+
+
+class CaptioningReadyTest(unittest.TestCase):
+    def test_process_mode_is_ready_after_first_loaded_batch_without_warmup(self) -> None:
+        # spawn 프로세스 대신 스레드 풀로 같은 run_in_executor 경로를 탄다.
+        with ThreadPoolExecutor(max_workers=1) as pool, \
+                mock.patch.object(settings, "CAPTION_EXECUTOR", "process"), \
+                mock.patch.object(caption_executor, "_PROCESS_MODEL_LOADED", False), \
+                mock.patch.object(caption_executor, "_RESOLVED_MODEL", None), \
+                mock.patch.dict(caption_executor._WARMUP, {"state": "cold"}), \
+                mock.patch.object(caption_executor, "_get_pool", return_value=pool), \
+                mock.patch.object(
+                    caption_executor,
+                    "caption_images",
+                    return_value=[("a dog", "blip-base", "v1")],
+                ), \
+                mock.patch.object(caption_executor, "is_blip_ready", side_effect=[False, True]):
+            self.assertFalse(caption_executor.captioning_ready())
+            # 첫 배치는 모델 로드 실패로 fallback 캡션
+            asyncio.run(caption_executor.run_caption_batch(["dog.jpg"]))
+            self.assertFalse(caption_executor.captioning_ready())
+            asyncio.run(caption_executor.run_caption_batch(["dog.jpg"]))
+            self.assertTrue(caption_executor.captioning_ready())
@@ -0,0 +1,57 @@
+import asyncio
+from pathlib import Path
+import unittest
+from unittest import mock
+
+from app.services.embedding import pipeline
+from app.services.embedding.enrichment import CaptionEnrichment
+
+
+class _NoCache:
+    def __init__(self) -> None:
+        self.stored: list[str] = []
+
+    async def get(self, content_hash):
+        return None
+
+    async def set(self, content_hash, **_kwargs):
+        self.stored.append(content_hash)
+
+
+class CaptionPipelineTest(unittest.TestCase):
+    def test_results_keep_photo_order_and_stages_overlap(self) -> None:
+        events: list[str] = []
+
+        async def caption_one(disk_path: Path, timeout_caption: int):
+            await asyncio.sleep(0.01 * int(disk_path.stem))
+            events.append(f"caption {disk_path.stem}")
+            return (f"a photo {disk_path.stem}", "blip", "v1", True)
+
+        async def enrich(captions: list[str]):
+            events.append(f"enrich {len(captions)}")
+            return [CaptionEnrichment(caption_ko=f"사진 {c}", tags=["등산"], ok=True) for c in captions]
+
+        stored: list[int] = []
+
+        async def on_result(position: int, data) -> None:
+            stored.append(position)
+
+        cache = _NoCache()
+        photos = [(Path(f"{index}.jpg"), f"hash{index}") for index in (3, 1, 2)]
+        with mock.patch.object(pipeline, "_caption_one", caption_one), mock.patch.object(
+            pipeline, "enrich_captions", enrich
+        ), mock.patch.object(pipeline, "caption_cache", cache), mock.patch.object(
+            pipeline, "captioning_ready", lambda: True
+        ):
+            results = asyncio.run(pipeline.generate_caption_data(photos, on_result=on_result))
+
+        self.assertEqual([raw for raw, *_ in results], ["a photo 3", "a photo 1", "a photo 2"])
+        self.assertEqual(results[0][1], "사진 a photo 3 | 취미 추정: 등산")
+        self.assertEqual(sorted(stored), [0, 1, 2])
+        self.assertEqual(sorted(cache.stored), ["hash1", "hash2", "hash3"])
+        # 먼저 끝난 캡션은 마지막 캡션을 기다리지 않고 번역 단계로 넘어간다.
+        self.assertLess(events.index("enrich 1"), events.index("caption 3"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,38 @@
+import asyncio
+import unittest
+from unittest import mock
+import uuid
+
+from app.models.caption_job import CaptionJob
+from app.services.embedding import caption_queue
+
+
+class CaptionJobLeaseTest(unittest.TestCase):
+    def test_lease_is_renewed_while_job_runs_and_stops_after(self) -> None:
+        job = CaptionJob(
+            id=uuid.uuid4(),
+            user_id=uuid.uuid4(),
+            payload={"photos": []},
+            compute_embedding=False,
+            attempts=1,
+        )
+        updates: list[dict] = []
+
+        async def record(_job, **values) -> None:
+            updates.append(values)
+
+        async def slow_captions(**_kwargs) -> None:
+            await asyncio.sleep(0.05)
+
+        async def run() -> None:
+            with mock.patch.object(caption_queue, "_claim_job", mock.AsyncMock(return_value=job)), \
+                    mock.patch.object(caption_queue, "_lease_renew_seconds", return_value=0.01), \
+                    mock.patch.object(caption_queue, "_update_job", record), \
+                    mock.patch.object(caption_queue, "process_photo_captions", slow_captions):
+                self.assertTrue(await caption_queue.run_next_caption_job())
+                await asyncio.sleep(0.03)
+
+        asyncio.run(run())
+        renewals = [values for values in updates if set(values) == {"locked_at"}]
+        self.assertGreaterEqual(len(renewals), 2)
+        self.assertEqual(updates[-1]["status"], "done")
@@ -0,0 +1,83 @@
+import asyncio
+import json
+import unittest
+
+import httpx
+
+from app.services.embedding.embed_batcher import EmbeddingBatcher
+
+
+def _stub_transport(calls: list[list[str]]) -> httpx.MockTransport:
+    def handler(request: httpx.Request) -> httpx.Response:
+        inputs = json.loads(request.content)["input"]
+        calls.append(inputs)
+        data = [
+            {"index": index, "embedding": [float(len(text)), float(index)]}
+            for index, text in reversed(list(enumerate(inputs)))
+        ]
+        return httpx.Response(200, json={"data": data})
+
+    return httpx.MockTransport(handler)
+
+
+class EmbeddingBatcherTests(unittest.TestCase):
+    def test_concurrent_calls_share_one_request(self):
+        calls: list[list[str]] = []
+
+        async def run():
+            batcher = EmbeddingBatcher(
+                api_key="test",
+                model="stub",
+                max_wait_seconds=0.01,
+                transport=_stub_transport(calls),
+            )
+            texts = ["a", "bb", "ccc", "bb"]
+            results = await asyncio.gather(*(batcher.embed(text) for text in texts))
+            await batcher.aclose()
+            return results
+
+        results = asyncio.run(run())
+        self.assertEqual(calls, [["a", "bb", "ccc"]])
+        self.assertEqual([vector[0] for vector in results], [1.0, 2.0, 3.0, 2.0])
+        self.assertEqual(results[1], results[3])
+
+    def test_flushes_when_batch_is_full(self):
+        calls: list[list[str]] = []
+
+        async def run():
+            batcher = EmbeddingBatcher(
+                api_key="test",
+                model="stub",
+                max_batch_size=2,
+                max_wait_seconds=10.0,
+                transport=_stub_transport(calls),
+            )
+            await asyncio.wait_for(
+                asyncio.gather(*(batcher.embed(text) for text in ["a", "b", "c", "d"])),
+                timeout=1.0,
+            )
+            await batcher.aclose()
+
+        asyncio.run(run())
+        self.assertEqual(calls, [["a", "b"], ["c", "d"]])
+
+    def test_upstream_error_fails_every_waiter(self):
+        async def run():
+            batcher = EmbeddingBatcher(
+                api_key="test",
+                model="stub",
+                max_wait_seconds=0.0,
+                transport=httpx.MockTransport(lambda request: httpx.Response(500)),
+            )
+            results = await asyncio.gather(
+                batcher.embed("a"), batcher.embed("b"), return_exceptions=True
+            )
+            await batcher.aclose()
+            return results
+
+        results = asyncio.run(run())
+        self.assertTrue(all(isinstance(result, httpx.HTTPStatusError) for result in results))
+
+
+if __name__ == "__main__":
+    unittest.main()
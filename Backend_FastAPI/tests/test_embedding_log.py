@@ -0,0 +1,45 @@
+import asyncio
+import json
+from pathlib import Path
+import tempfile
+import unittest
+
+from app.services.embedding.embedding_log import EmbeddingLogWriter, iter_embedding_log
+
+
+def _record(index: int) -> dict:
+    return {"index": index, "embedding": [0.1, 0.2, 0.3]}
+
+
+class EmbeddingLogTest(unittest.TestCase):
+    def test_background_writer_appends_rotates_and_reads_in_order(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            log_dir = Path(tmp)
+            writer = EmbeddingLogWriter(log_dir, max_bytes=200, backup_count=10)
+
+            async def run() -> None:
+                for index in range(12):
+                    writer.submit("alice", _record(index))
+                    await asyncio.sleep(0.01)
+                await writer.aclose()
+
+            asyncio.run(run())
+
+            self.assertEqual(writer.stats()["written"], 12)
+            self.assertTrue((log_dir / "alice_embeddings.1.jsonl").exists())
+            self.assertEqual([record["index"] for record in iter_embedding_log("alice", log_dir)], list(range(12)))
+
+    def test_reader_includes_legacy_file_and_skips_truncated_line(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            log_dir = Path(tmp)
+            (log_dir / "bob_embeddings.json").write_text(json.dumps([_record(0)]), encoding="utf-8")
+            writer = EmbeddingLogWriter(log_dir, max_bytes=0, backup_count=0)
+            writer.submit("bob", _record(1))
+            with (log_dir / "bob_embeddings.jsonl").open("a", encoding="utf-8") as handle:
+                handle.write('{"index": 2, "embed')
+
+            self.assertEqual([record["index"] for record in iter_embedding_log("bob", log_dir)], [0, 1])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,56 @@
+import asyncio
+import json
+import unittest
+
+import httpx
+
+from app.services.embedding.enrichment import enrich_captions
+
+
+def _stub_client(requests: list[list[str]], drop_index: int | None = None) -> httpx.AsyncClient:
+    def handler(request: httpx.Request) -> httpx.Response:
+        body = json.loads(request.content)
+        lines = body["messages"][1]["content"].splitlines()
+        requests.append(lines)
+        items = []
+        for line in lines:
+            index, caption = line.split(": ", 1)
+            if drop_index is not None and int(index) == drop_index:
+                continue
+            items.append({"index": int(index), "caption_ko": f"번역 {caption}", "tags": ["등산", "등산", " "]})
+        content = json.dumps({"items": items}, ensure_ascii=False)
+        return httpx.Response(200, json={"choices": [{"message": {"content": content}}]})
+
+    return httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+
+class EnrichCaptionsTests(unittest.TestCase):
+    def test_batches_captions_into_few_calls(self):
+        requests: list[list[str]] = []
+        captions = [f"a photo {index}" for index in range(10)]
+
+        async def run():
+            async with _stub_client(requests) as client:
+                return await enrich_captions(captions, api_key="test", client=client, batch_size=8)
+
+        results = asyncio.run(run())
+        self.assertEqual([len(lines) for lines in requests], [8, 2])
+        self.assertEqual(results[9].caption_ko, "번역 a photo 9")
+        self.assertEqual(results[0].tags, ["등산"])
+        self.assertTrue(all(result.ok for result in results))
+
+    def test_missing_item_falls_back_to_original_caption(self):
+        requests: list[list[str]] = []
+
+        async def run():
+            async with _stub_client(requests, drop_index=1) as client:
+                return await enrich_captions(["a dog", "a cat"], api_key="test", client=client)
+
+        results = asyncio.run(run())
+        self.assertTrue(results[0].ok)
+        self.assertEqual(results[1].caption_ko, "a cat")
+        self.assertFalse(results[1].ok)
+
+
+if __name__ == "__main__":
+    unittest.main()
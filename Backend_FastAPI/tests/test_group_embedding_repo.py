@@ -0,0 +1,94 @@
+import asyncio
+import contextlib
+import unittest
+from unittest import mock
+import uuid
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.group import Group
+from app.services.embedding import repo
+
+
+def _queue(db: AsyncSession, group: Group) -> None:
+    db.sync_session.info.setdefault(repo._PENDING_INDEX_REFRESH, {})[group.id] = (group, [1.0])
+
+
+class GroupIndexRefreshTests(unittest.TestCase):
+    def test_index_is_refreshed_only_after_commit(self) -> None:
+        group = Group(id=uuid.uuid4(), name="g", is_subgroup=False, group_profile={})
+
+        async def run() -> int:
+            with mock.patch.object(repo, "refresh_group_in_index") as refresh:
+                async with AsyncSession() as db:
+                    await db.begin()
+                    _queue(db, group)
+                    self.assertEqual(refresh.call_count, 0)
+                    await db.rollback()
+
+                    await db.begin()
+                    _queue(db, group)
+                    await db.commit()
+                return refresh.call_count
+
+        self.assertEqual(asyncio.run(run()), 1)
+
+
+class _MemberEmbeddings:
+    """사용자 임베딩/멤버십/그룹 합계를 메모리에 두고 repo 의 DB 헬퍼를 대신한다."""
+
+    def __init__(self, group: Group, embeddings: dict[uuid.UUID, list[float] | None]) -> None:
+        self.group = group
+        self.embeddings = embeddings
+
+    async def load(self, _db, user_id):
+        return self.embeddings[user_id]
+
+    async def store(self, _db, user_id, embedding, _updated_at):
+        self.embeddings[user_id] = embedding
+
+    async def group_ids(self, _db, _member_id):
+        return {self.group.id}
+
+    async def lock(self, _db, _group_id):
+        return self.group
+
+    async def member_embeddings(self, _db, _group_id):
+        return list(self.embeddings.values())
+
+    async def set_group(self, _db, _group_id, embedding, embedding_sum=None, embedding_count=0):
+        self.group.embedding = embedding
+        self.group.embedding_sum = embedding_sum
+        self.group.embedding_count = embedding_count
+
+    def patches(self):
+        return [
+            mock.patch.object(repo, "_load_user_embedding", self.load),
+            mock.patch.object(repo, "_store_user_embedding", self.store),
+            mock.patch.object(repo, "list_member_group_ids", self.group_ids),
+            mock.patch.object(repo, "_lock_group", self.lock),
+            mock.patch.object(repo, "list_group_member_embeddings", self.member_embeddings),
+            mock.patch.object(repo, "set_group_embedding", self.set_group),
+        ]
+
+
+class GroupEmbeddingDeltaTests(unittest.TestCase):
+    def test_reembedding_member_of_unaggregated_group_counts_once(self) -> None:
+        member, other = uuid.uuid4(), uuid.uuid4()
+        # 0005 이전에 만들어져 합계가 한 번도 집계되지 않은 그룹
+        group = Group(id=uuid.uuid4(), name="g", embedding_sum=None, embedding_count=0)
+        state = _MemberEmbeddings(group, {member: [1.0, 0.0], other: [0.0, 1.0]})
+
+        async def run() -> None:
+            async with AsyncSession() as db:
+                await repo.deactivate_embeddings(db, member)
+                await repo.create_embedding(db, member, [2.0, 2.0])
+
+        with contextlib.ExitStack() as stack:
+            for patch in state.patches():
+                stack.enter_context(patch)
+            asyncio.run(run())
+
+        self.assertEqual(group.embedding_count, 2)
+        self.assertEqual(group.embedding_sum, [2.0, 3.0])
+        self.assertEqual(group.embedding, [1.0, 1.5])
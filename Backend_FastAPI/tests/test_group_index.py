@@ -0,0 +1,154 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+import unittest
+from unittest import mock
+import uuid
+
+from app.groups.queries import GroupFilters, is_public_profile, is_public_sql
+from app.services.embedding import group_index as group_index_module
+from app.services.embedding.group_index import GroupEmbeddingIndex
+
+
+def _vector(*head: float, dim: int = 8) -> list[float]:
+    return list(head) + [0.0] * (dim - len(head))
+
+
+class GroupEmbeddingIndexTests(unittest.TestCase):
+    def setUp(self):
+        self.ids = [uuid.uuid4() for _ in range(4)]
+        self.index = GroupEmbeddingIndex(dim=8)
+        self.index.replace_all(
+            [
+                (self.ids[0], _vector(1.0, 0.0), {"tags": ["hiking"], "region": "seoul"}),
+                (self.ids[1], _vector(0.6, 0.8), {"interests": ["hiking", "coffee"]}),
+                (self.ids[2], _vector(0.0, 1.0), {"tags": ["coffee"], "region": "busan"}),
+                (self.ids[3], _vector(1.0, 0.1), {"is_public": False, "tags": ["hiking"]}),
+            ]
+        )
+
+    def test_top_k_orders_by_cosine_and_skips_private(self):
+        ranked = self.index.top_k(_vector(2.0, 0.0), k=3)
+        self.assertEqual([group_id for group_id, _ in ranked], self.ids[:3])
+        self.assertAlmostEqual(ranked[0][1], 1.0, places=5)
+        self.assertAlmostEqual(ranked[1][1], 0.6, places=5)
+
+    def test_top_k_excludes_and_limits(self):
+        ranked = self.index.top_k(_vector(1.0, 0.0), k=1, exclude={self.ids[0]})
+        self.assertEqual([group_id for group_id, _ in ranked], [self.ids[1]])
+
+    def test_upsert_and_remove_update_rows_in_place(self):
+        self.index.upsert(self.ids[2], _vector(1.0, 0.0), {})
+        self.index.remove(self.ids[0])
+        new_id = uuid.uuid4()
+        self.index.upsert(new_id, None, {})
+
+        ranked = self.index.top_k(_vector(1.0, 0.0), k=10)
+        self.assertEqual(ranked[0][0], self.ids[2])
+        self.assertNotIn(self.ids[0], [group_id for group_id, _ in ranked])
+        self.assertIn((new_id, 0.0), ranked)
+        self.assertEqual(len(self.index), 4)
+
+    def test_set_profile_hides_group_from_top_k(self):
+        self.index.set_profile(self.ids[0], {"is_public": False})
+        self.index.set_profile(self.ids[3], {})
+        ranked = self.index.top_k(_vector(1.0, 0.0), k=2)
+        self.assertEqual([group_id for group_id, _ in ranked], [self.ids[3], self.ids[1]])
+
+    def test_top_k_pages_with_after_cursor_through_ties(self):
+        tied = [uuid.uuid4() for _ in range(3)]
+        for group_id in tied:
+            self.index.upsert(group_id, None, {})
+
+        pages: list[uuid.UUID] = []
+        after = None
+        while True:
+            ranked = self.index.top_k(_vector(1.0, 0.0), k=2, after=after)
+            if not ranked:
+                break
+            pages.extend(group_id for group_id, _ in ranked)
+            after = (ranked[-1][1], ranked[-1][0])
+
+        expected_ties = sorted(tied + [self.ids[2]], key=str)
+        self.assertEqual(pages, self.ids[:2] + expected_ties)
+
+    def test_top_k_filters_by_tags_and_region(self):
+        def ranked_ids(**kwargs):
+            filters = GroupFilters(**kwargs)
+            return [group_id for group_id, _ in self.index.top_k(_vector(1.0, 0.0), k=10, filters=filters)]
+
+        self.assertEqual(ranked_ids(tags=["hiking"]), self.ids[:2])
+        self.assertEqual(ranked_ids(tags=["hiking", "coffee"]), [self.ids[1]])
+        self.assertEqual(ranked_ids(region="busan"), [self.ids[2]])
+        self.assertEqual(ranked_ids(tags=["coffee"], region="seoul"), [])
+
+    def test_filter_masks_follow_profile_updates_and_removals(self):
+        self.index.set_profile(self.ids[2], {"tags": ["hiking"]})
+        self.index.remove(self.ids[0])
+        filters = GroupFilters(tags=["hiking"])
+        ranked = self.index.top_k(_vector(1.0, 0.0), k=10, filters=filters)
+        self.assertEqual([group_id for group_id, _ in ranked], [self.ids[1], self.ids[2]])
+
+    def test_top_k_breaks_ties_by_id_without_embedding(self):
+        index = GroupEmbeddingIndex(dim=8)
+        ids = [uuid.uuid4() for _ in range(50)]
+        index.replace_all([(group_id, None, {}) for group_id in ids])
+        ranked = index.top_k(None, k=5, exclude={ids[0]})
+        expected = sorted(ids[1:], key=str)[:5]
+        self.assertEqual([group_id for group_id, _ in ranked], expected)
+
+
+class _ChangedRows:
+    def __init__(self, rows):
+        self.rows = rows
+        self.statements = []
+
+    async def execute(self, stmt):
+        self.statements.append(str(stmt.compile(compile_kwargs={"literal_binds": True})))
+        return self
+
+    def all(self):
+        return self.rows
+
+
+class GroupIndexSyncTests(unittest.TestCase):
+    def test_changes_from_other_workers_are_applied_before_search(self):
+        ids = [uuid.uuid4() for _ in range(3)]
+        loaded_at = datetime(2026, 1, 1, tzinfo=timezone.utc)
+        index = GroupEmbeddingIndex(dim=8)
+        index.replace_all(
+            [(ids[0], _vector(1.0, 0.0), {}), (ids[1], _vector(0.5, 0.5), {})],
+            synced_through=loaded_at,
+        )
+        changed_at = loaded_at + timedelta(seconds=5)
+        db = _ChangedRows(
+            [
+                (ids[0], _vector(1.0, 0.0), {"is_public": False}, False, changed_at),
+                (ids[1], _vector(0.5, 0.5), {}, True, changed_at),
+                (ids[2], _vector(0.0, 1.0), {}, False, changed_at),
+            ]
+        )
+
+        with mock.patch.object(group_index_module, "group_index", index):
+            asyncio.run(group_index_module._sync_changed_groups(db))
+
+        ranked = index.top_k(_vector(1.0, 0.0), k=10)
+        self.assertEqual([group_id for group_id, _ in ranked], [ids[2]])
+        self.assertEqual(index.synced_through, changed_at)
+        self.assertIn("search_updated_at >", db.statements[0])
+
+
+if __name__ == "__main__":
+    unittest.main()
+
+
+class GroupVisibilityTests(unittest.TestCase):
+    def test_only_json_booleans_make_a_group_private(self):
+        self.assertTrue(is_public_profile(None))
+        self.assertTrue(is_public_profile({"is_public": "no!"}))
+        self.assertTrue(is_public_profile({"is_public": None}))
+        self.assertFalse(is_public_profile({"is_public": False}))
+
+    def test_sql_expression_guards_boolean_cast(self):
+        expression = is_public_sql("g.group_profile")
+        self.assertIn("jsonb_typeof(g.group_profile -> 'is_public') = 'boolean'", expression)
+        self.assertNotIn("COALESCE", expression)
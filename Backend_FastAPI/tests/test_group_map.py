@@ -0,0 +1,69 @@
+import random
+import unittest
+
+from app.services.embedding import group_map
+from app.services.embedding.group_map import GroupMapInput, build_group_map_positions
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None
+
+
+def _structured_vectors(count: int, dim: int, seed: int = 7) -> list[list[float]]:
+    rng = random.Random(seed)
+    vectors = []
+    for _ in range(count):
+        a = rng.uniform(-1, 1) * 10
+        b = rng.uniform(-1, 1) * 4
+        vector = [rng.gauss(0, 0.05) for _ in range(dim)]
+        vector[0] += a
+        vector[1] += a * 0.5 + b
+        vector[2] += b
+        vectors.append(vector)
+    return vectors
+
+
+@unittest.skipIf(np is None, "numpy is not installed")
+class GroupMapBackendTests(unittest.TestCase):
+    def assertCoordsClose(self, expected, actual, tolerance=1e-2):
+        self.assertEqual(len(expected), len(actual))
+        for (ex, ey), (ax, ay) in zip(expected, actual):
+            self.assertAlmostEqual(ex, ax, delta=tolerance)
+            self.assertAlmostEqual(ey, ay, delta=tolerance)
+
+    def test_numpy_matches_pure_python_when_members_fewer_than_dim(self):
+        vectors = _structured_vectors(count=24, dim=64)
+        expected = group_map._pca_2d(vectors)
+        actual = group_map._pca_2d_numpy(np.asarray(vectors, dtype=np.float32))
+        self.assertCoordsClose(expected, actual)
+
+    def test_numpy_matches_pure_python_when_members_exceed_dim(self):
+        vectors = _structured_vectors(count=40, dim=8, seed=11)
+        expected = group_map._pca_2d(vectors)
+        actual = group_map._pca_2d_numpy(np.asarray(vectors, dtype=np.float32))
+        self.assertCoordsClose(expected, actual)
+
+    def test_numpy_returns_none_for_identical_vectors(self):
+        vectors = [[0.5] * 16 for _ in range(5)]
+        self.assertIsNone(group_map._pca_2d(vectors))
+        self.assertIsNone(group_map._pca_2d_numpy(np.asarray(vectors, dtype=np.float32)))
+
+
+class GroupMapPositionsTests(unittest.TestCase):
+    def test_positions_cover_every_member(self):
+        vectors = _structured_vectors(count=6, dim=16)
+        members = [
+            GroupMapInput(user_id=f"user-{index}", embedding=vector, updated_at=None)
+            for index, vector in enumerate(vectors)
+        ]
+        members.append(GroupMapInput(user_id="no-embedding", embedding=None, updated_at=None))
+        positions = build_group_map_positions("group-positions", members)
+        self.assertEqual(set(positions), {member.user_id for member in members})
+        for x, y in positions.values():
+            self.assertTrue(0 <= x <= group_map.CANVAS_WIDTH)
+            self.assertTrue(0 <= y <= group_map.CANVAS_HEIGHT)
+
+
+if __name__ == "__main__":
+    unittest.main()
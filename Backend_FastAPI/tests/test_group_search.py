@@ -0,0 +1,124 @@
+import asyncio
+import os
+import random
+import unittest
+from unittest import mock
+import uuid
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from app.services.embedding import repo
+
+# pgvector 가 설치된 Postgres 로 끝까지 페이지를 넘겨 보는 테스트용 (없으면 건너뛴다)
+PGVECTOR_TEST_DATABASE_URL = os.environ.get("PGVECTOR_TEST_DATABASE_URL")
+
+
+class _Rows:
+    def all(self):
+        return []
+
+
+class _RecordingSession:
+    def __init__(self, version: str) -> None:
+        self.version = version
+        self.statements: list[str] = []
+
+    async def scalar(self, _stmt):
+        return self.version
+
+    async def execute(self, stmt, _params=None):
+        self.statements.append(str(stmt))
+        return _Rows()
+
+
+class HnswScanSettingsTest(unittest.TestCase):
+    def _settings_for(self, version: str) -> list[str]:
+        db = _RecordingSession(version)
+        with mock.patch.object(repo, "_PGVECTOR_VERSION", None):
+            asyncio.run(
+                repo.search_similar_groups(
+                    db, [1.0, 0.0], limit=10, after=(0.5, uuid.uuid4())
+                )
+            )
+        return [statement for statement in db.statements if statement.startswith("SET LOCAL")]
+
+    def test_iterative_scan_on_pgvector_0_8(self) -> None:
+        self.assertIn("SET LOCAL hnsw.iterative_scan = strict_order", self._settings_for("0.8.0"))
+
+    def test_exact_scan_for_filtered_pages_on_older_pgvector(self) -> None:
+        statements = self._settings_for("0.7.4")
+        self.assertIn("SET LOCAL enable_indexscan = off", statements)
+        self.assertEqual(statements[-1], "SET LOCAL enable_indexscan = on")
+
+
+@unittest.skipUnless(PGVECTOR_TEST_DATABASE_URL, "PGVECTOR_TEST_DATABASE_URL not set")
+class GroupSearchPaginationTest(unittest.TestCase):
+    def test_pages_reach_every_group(self) -> None:
+        scored = 150
+        unscored = 5
+        member_id = uuid.uuid4()
+        rng = random.Random(7)
+
+        async def run() -> list[tuple[uuid.UUID, float | None]]:
+            engine = create_async_engine(PGVECTOR_TEST_DATABASE_URL)
+            try:
+                async with engine.connect() as conn:
+                    db = AsyncSession(bind=conn)
+                    await db.execute(text("CREATE EXTENSION IF NOT EXISTS vector"))
+                    # temp 테이블이 search_path 에서 먼저 잡혀 실제 groups 를 가린다.
+                    await db.execute(
+                        text(
+                            "CREATE TEMP TABLE groups (id uuid PRIMARY KEY, "
+                            "is_subgroup boolean NOT NULL DEFAULT false, "
+                            "group_profile jsonb, embedding_vec vector(3))"
+                        )
+                    )
+                    await db.execute(
+                        text("CREATE TEMP TABLE group_members (group_id uuid, user_id uuid)")
+                    )
+                    await db.execute(
+                        text(
+                            "CREATE INDEX ON groups USING hnsw (embedding_vec vector_cosine_ops)"
+                        )
+                    )
+                    for index in range(scored + unscored):
+                        vector = None
+                        if index < scored:
+                            vector = repo._to_vector_literal(
+                                [rng.uniform(-1, 1) for _ in range(3)]
+                            )
+                        await db.execute(
+                            text(
+                                "INSERT INTO groups (id, group_profile, embedding_vec) "
+                                "VALUES (:id, '{}'::jsonb, CAST(:vec AS vector))"
+                            ),
+                            {"id": uuid.uuid4(), "vec": vector},
+                        )
+                    await db.execute(text("ANALYZE groups"))
+
+                    seen: list[tuple[uuid.UUID, float | None]] = []
+                    after = None
+                    while True:
+                        page = await repo.search_similar_groups(
+                            db,
+                            [1.0, 0.5, -0.25],
+                            limit=10,
+                            exclude_member_id=member_id,
+                            after=after,
+                        )
+                        if not page:
+                            break
+                        seen.extend(page)
+                        after = page[-1]
+                        after = (after[1], after[0])
+                    await db.rollback()
+                    return seen
+            finally:
+                await engine.dispose()
+
+        seen = asyncio.run(run())
+        self.assertEqual(len({group_id for group_id, _ in seen}), scored + unscored)
+        scores = [score for _, score in seen if score is not None]
+        self.assertEqual(len(scores), scored)
+        self.assertEqual(scores, sorted(scores, reverse=True))
@@ -0,0 +1,49 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+from PIL import Image
+
+from app.services.embedding.image_prep import (
+    DERIVATIVE_MAX_SIDE,
+    derivative_path,
+    derivative_url,
+    ensure_derivative,
+    load_caption_image,
+)
+
+
+class ImagePrepTests(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.upload = Path(self.tmp.name) / "photo_id_IMG_0001.jpg"
+        Image.new("RGB", (3000, 2000), color=(200, 30, 30)).save(self.upload, format="JPEG")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_derivative_is_written_next_to_upload(self):
+        small = ensure_derivative(self.upload)
+        self.assertEqual(small, derivative_path(self.upload))
+        self.assertEqual(small.parent, self.upload.parent)
+        with Image.open(small) as image:
+            self.assertEqual(max(image.size), DERIVATIVE_MAX_SIDE)
+            self.assertEqual(image.size, (512, 341))
+
+    def test_load_caption_image_reuses_derivative(self):
+        image = load_caption_image(self.upload)
+        self.assertEqual(image.mode, "RGB")
+        self.assertLessEqual(max(image.size), DERIVATIVE_MAX_SIDE)
+        mtime = derivative_path(self.upload).stat().st_mtime_ns
+        load_caption_image(self.upload)
+        self.assertEqual(derivative_path(self.upload).stat().st_mtime_ns, mtime)
+
+    def test_derivative_url_matches_path_naming(self):
+        self.assertEqual(
+            derivative_url("/uploads/u1/photo_id_IMG_0001.jpg"),
+            f"/uploads/u1/{derivative_path(self.upload).name}",
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,77 @@
+import asyncio
+import unittest
+from unittest import mock
+import uuid
+
+from sqlalchemy.sql import Delete
+
+from app.services.embedding import layout_cache
+from app.services.embedding.group_map import GroupMapCache
+from app.services.embedding.layout_cache import MemoryLayoutCache, TieredLayoutCache
+
+
+class _Result:
+    rowcount = 1
+
+
+class _RecordingSession:
+    def __init__(self, statements: list) -> None:
+        self._statements = statements
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *_exc) -> None:
+        return None
+
+    async def execute(self, stmt):
+        self._statements.append(stmt)
+        return _Result()
+
+    async def commit(self) -> None:
+        return None
+
+
+class LayoutCacheTests(unittest.TestCase):
+    def test_memory_cache_counts_hits_misses_and_evictions(self):
+        cache = GroupMapCache(max_items=2)
+        cache.set("a", {"u": (1.0, 2.0)})
+        cache.set("b", {"u": (1.0, 2.0)})
+        self.assertIsNotNone(cache.get("a"))
+        cache.set("c", {"u": (1.0, 2.0)})
+        self.assertIsNone(cache.get("b"))
+        stats = cache.stats()
+        self.assertEqual((stats["hits"], stats["misses"], stats["evictions"]), (1, 1, 1))
+
+    def test_tiered_cache_promotes_lower_tier_hits(self):
+        upper = GroupMapCache()
+        lower = GroupMapCache()
+        lower.set("key", {"u": (3.0, 4.0)})
+        tiered = TieredLayoutCache([MemoryLayoutCache(upper), MemoryLayoutCache(lower)])
+
+        positions = asyncio.run(tiered.get("key", "group"))
+
+        self.assertEqual(positions, {"u": (3.0, 4.0)})
+        self.assertEqual(upper.get("key"), {"u": (3.0, 4.0)})
+
+    def test_postgres_cache_evicts_once_every_n_writes(self):
+        statements: list = []
+        cache = layout_cache.PostgresLayoutCache(max_rows=10, evict_every=3)
+
+        async def run() -> None:
+            with mock.patch.object(
+                layout_cache,
+                "AsyncSessionLocal",
+                lambda: _RecordingSession(statements),
+            ):
+                for index in range(7):
+                    await cache.set(f"key-{index}", str(uuid.uuid4()), {"u": (1.0, 2.0)})
+
+        asyncio.run(run())
+        deletes = [stmt for stmt in statements if isinstance(stmt, Delete)]
+        self.assertEqual(len(deletes), 2)
+        self.assertEqual(cache.stats()["evictions"], 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
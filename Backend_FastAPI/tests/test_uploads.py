@@ -0,0 +1,47 @@
+import asyncio
+import hashlib
+import io
+import os
+from pathlib import Path
+import tempfile
+import unittest
+
+from fastapi import UploadFile
+
+from app.services.uploads import save_upload
+
+
+class _BrokenUpload(UploadFile):
+    async def read(self, size: int = -1) -> bytes:
+        chunk = await super().read(size)
+        if not chunk:
+            raise ConnectionError("client disconnected")
+        return chunk
+
+
+class SaveUploadTest(unittest.TestCase):
+    def test_streams_to_destination_with_hash(self) -> None:
+        data = os.urandom(3 * 1024 + 17)
+        with tempfile.TemporaryDirectory() as tmp:
+            dest = Path(tmp) / "user" / "photo.jpg"
+            saved = asyncio.run(
+                save_upload(UploadFile(io.BytesIO(data), filename="photo.jpg"), dest, chunk_size=1024)
+            )
+
+            self.assertEqual(dest.read_bytes(), data)
+            self.assertEqual(saved.content_hash, hashlib.sha256(data).hexdigest())
+            self.assertEqual(saved.size, len(data))
+            self.assertEqual(os.listdir(dest.parent), ["photo.jpg"])
+
+    def test_failed_upload_leaves_no_file(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            dest = Path(tmp) / "photo.jpg"
+            upload = _BrokenUpload(io.BytesIO(b"x" * 4096), filename="photo.jpg")
+            with self.assertRaises(ConnectionError):
+                asyncio.run(save_upload(upload, dest, chunk_size=1024))
+
+            self.assertEqual(os.listdir(tmp), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,75 @@
+import asyncio
+import time
+import unittest
+from unittest import mock
+import uuid
+
+
+from app.core import user_cache
+from app.core.security import create_access_token
+from app.models.user import User
+
+
+class TTLCacheTest(unittest.TestCase):
+    def test_expires_and_evicts_least_recently_used(self) -> None:
+        cache = user_cache.TTLCache(max_entries=2, ttl_seconds=60)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        self.assertEqual(cache.get("a"), 1)
+        cache.set("c", 3)
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(cache.get("a"), 1)
+
+        cache.set("d", 4, expires_at=time.monotonic() - 1)
+        self.assertIsNone(cache.get("d"))
+
+
+class _GetSession:
+    """db.get 만 흉내 낸다: 요청마다 DB 의 현재 행을 돌려준다."""
+
+    def __init__(self, rows: dict) -> None:
+        self.rows = rows
+        self.gets: list[uuid.UUID] = []
+
+    async def get(self, _model, user_id):
+        self.gets.append(user_id)
+        return self.rows.get(user_id)
+
+
+class UserCacheTest(unittest.TestCase):
+    def setUp(self) -> None:
+        user_cache.token_cache.clear()
+        user_cache.user_id_cache.clear()
+
+    def test_decode_token_is_memoized(self) -> None:
+        token = create_access_token("kakao:1")
+        with mock.patch.object(
+            user_cache, "decode_access_token", wraps=user_cache.decode_access_token
+        ) as decode:
+            self.assertEqual(user_cache.decode_token(token)["sub"], "kakao:1")
+            self.assertEqual(user_cache.decode_token(token)["sub"], "kakao:1")
+        self.assertEqual(decode.call_count, 1)
+        with self.assertRaises(ValueError):
+            user_cache.decode_token("not-a-token")
+
+    def test_cached_subject_reads_current_row_by_primary_key(self) -> None:
+        user = User(
+            id=uuid.uuid4(),
+            provider="kakao",
+            provider_user_id="1",
+            nickname="tester",
+            profile_data={"tags": ["hiking"]},
+        )
+        user_cache.remember_user("kakao:1", user)
+        # 다른 프로세스가 캡션 결과를 쓴 뒤의 행
+        current = User(id=user.id, profile_data={"tags": ["hiking"], "photo_interests": ["cafe"]})
+        db = _GetSession({user.id: current})
+
+        self.assertIs(asyncio.run(user_cache.get_cached_user(db, "kakao:1")), current)
+        self.assertEqual(db.gets, [user.id])
+        self.assertIsNone(asyncio.run(user_cache.get_cached_user(db, "kakao:2")))
+
+        # 지워진 사용자는 캐시에서도 빠져 전체 조회로 돌아간다.
+        db.rows.clear()
+        self.assertIsNone(asyncio.run(user_cache.get_cached_user(db, "kakao:1")))
+        self.assertIsNone(user_cache.user_id_cache.get("kakao:1"))
@@ -0,0 +1,65 @@
+"""groups.member_count 와 실제 멤버 수(group_members + notion_group_members) 비교.
+
+    python verify_member_counts.py          # 드리프트만 출력, 있으면 exit 1
+    python verify_member_counts.py --fix    # 실제 멤버 수로 맞춤
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+from pathlib import Path
+
+from sqlalchemy.ext.asyncio import create_async_engine
+
+BASE_DIR = Path(__file__).resolve().parents[0]
+if str(BASE_DIR) not in sys.path:
+    sys.path.insert(0, str(BASE_DIR))
+
+
+def _load_env(env_path: Path) -> None:
+    if not env_path.exists():
+        return
+    for line in env_path.read_text(encoding="utf-8").splitlines():
+        line = line.strip()
+        if not line or line.startswith("#") or "=" not in line:
+            continue
+        key, value = line.split("=", 1)
+        key = key.strip()
+        value = value.strip().strip('"').strip("'")
+        os.environ.setdefault(key, value)
+
+
+_load_env(BASE_DIR / ".env")
+
+
+async def main(fix: bool) -> int:
+    from app.groups.member_count import find_member_count_drift, fix_member_count_drift
+
+    database_url = os.getenv("DATABASE_URL")
+    if not database_url:
+        raise RuntimeError("DATABASE_URL is not configured")
+
+    engine = create_async_engine(database_url, echo=False, pool_pre_ping=True)
+    try:
+        async with engine.begin() as conn:
+            drift = await find_member_count_drift(conn)
+            for group_id, stored, actual in drift:
+                print(f"{group_id} stored={stored} actual={actual}")
+            if drift and fix:
+                fixed = await fix_member_count_drift(conn)
+                print(f"fixed {fixed} groups")
+    finally:
+        await engine.dispose()
+
+    if not drift:
+        print("member_count OK")
+        return 0
+    return 0 if fix else 1
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--fix", action="store_true", help="드리프트가 있는 그룹의 member_count 를 고친다")
+    args = parser.parse_args()
+    raise SystemExit(asyncio.run(main(args.fix)))